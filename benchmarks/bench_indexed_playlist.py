@@ -0,0 +1,80 @@
+"""Benchmark for IndexedPlaylist, the interval playlist's ordered store, on a 100k-path playlist.
+
+IndexedPlaylist only needs the standard library, but live_wallpaper_qt6 imports PyQt6 and the Win32 DLLs at module
+level, so the class is loaded from the source file on its own. That way this runs on any machine with Python 3.
+
+    python benchmarks/bench_indexed_playlist.py [--paths 100000]
+"""
+import argparse
+import ast
+import os
+import random
+import time
+
+SOURCE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "live_wallpaper_qt6.py")
+
+
+def load_indexed_playlist():
+    with open(SOURCE_PATH, encoding="utf-8") as source_file: source = source_file.read()
+    class_node = next(node for node in ast.parse(source).body if isinstance(node, ast.ClassDef) and node.name == "IndexedPlaylist")
+    namespace = {"os": os}
+    exec(compile(ast.Module(body=[class_node], type_ignores=[]), SOURCE_PATH, "exec"), namespace)
+    return namespace["IndexedPlaylist"]
+
+
+def timed(label, action, results):
+    start = time.perf_counter()
+    action()
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    results.append((label, elapsed_ms))
+    return elapsed_ms
+
+
+def list_append_new(playlist, batch):
+    # What add_files did before the store: one O(n) membership scan per added path.
+    for path in batch:
+        if path not in playlist: playlist.append(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--paths", type=int, default=100_000, help="playlist size (default 100000)")
+    parser.add_argument("--operations", type=int, default=10_000, help="lookups/removals/reads per test (default 10000)")
+    parser.add_argument("--list-paths", type=int, default=20_000, help="size of the plain-list baseline (default 20000)")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    IndexedPlaylist = load_indexed_playlist()
+    rng = random.Random(args.seed)
+    paths = [os.path.join("C:\\Wallpapers", f"folder_{i // 1000:03d}", f"wallpaper_{i:06d}.mp4") for i in range(args.paths)]
+    batches = [paths[start:start + 500] for start in range(0, len(paths), 500)]
+    results = []
+
+    playlist = IndexedPlaylist()
+    def add_batches():
+        for batch in batches: playlist.extend(playlist.missing(batch))
+    timed(f"add {args.paths} paths in 500-path batches", add_batches, results)
+    assert len(playlist) == args.paths
+
+    probes = [rng.choice(paths) for _ in range(args.operations)]
+    timed(f"{args.operations} membership checks", lambda: [path in playlist for path in probes], results)
+    timed(f"{args.operations} index() lookups", lambda: [playlist.index(path) for path in probes], results)
+
+    removed = rng.sample(paths, args.operations)
+    timed(f"{args.operations} removals", lambda: [playlist.remove(path) for path in removed], results)
+    rows = [rng.randrange(len(playlist)) for _ in range(args.operations)]
+    timed(f"{args.operations} row reads (with tombstones)", lambda: [playlist[row] for row in rows], results)
+    moves = [rng.randrange(len(playlist) - 1) for _ in range(args.operations // 10)]
+    timed(f"{args.operations // 10} adjacent moves", lambda: [playlist.move(row, row + 1) for row in moves], results)
+    order = list(range(len(playlist))); rng.shuffle(order)
+    timed(f"permute {len(playlist)} rows", lambda: playlist.permute(order), results)
+
+    baseline = []
+    list_batches = [paths[start:start + 500] for start in range(0, args.list_paths, 500)]
+    timed(f"baseline: plain list, add {args.list_paths} paths", lambda: [list_append_new(baseline, batch) for batch in list_batches], results)
+
+    label_width = max(len(label) for label, _ in results)
+    for label, elapsed_ms in results: print(f"{label:<{label_width}}  {elapsed_ms:9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,21 +4,26 @@ import ctypes
 from ctypes import wintypes
 import random
 from datetime import datetime, time as dt_time, timedelta
-from collections import deque
+from collections import deque, OrderedDict
 import json
 import shutil
+import time
+import struct
+import sqlite3
+import hashlib
+import fnmatch
 
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QPushButton, QLabel, QFileDialog, QCheckBox, QFrame, QSlider,
-    QSpinBox, QComboBox, QListWidget, QListWidgetItem, QStackedWidget,
+    QSpinBox, QComboBox, QListWidget, QListWidgetItem, QListView, QStackedWidget,
     QGroupBox, QTimeEdit, QScrollArea, QSystemTrayIcon, QMenu, QTabWidget,
-    QAbstractItemView, QGraphicsOpacityEffect
+    QAbstractItemView, QGraphicsOpacityEffect, QLineEdit
 )
-from PyQt6.QtGui import QMovie, QPixmap, QColor, QFont, QIcon, QScreen, QAction, QImage, QPainter, QPalette
-from PyQt6.QtCore import Qt, QUrl, QSize, QTimer, QTime, QStandardPaths, QPropertyAnimation, QParallelAnimationGroup, QEasingCurve, QEventLoop
+from PyQt6.QtGui import QMovie, QPixmap, QColor, QFont, QIcon, QScreen, QAction, QImage, QPainter, QPalette, QImageWriter
+from PyQt6.QtCore import Qt, QUrl, QSize, QRect, QPoint, QAbstractListModel, QModelIndex, QFileSystemWatcher, QTimer, QTime, QStandardPaths, QPropertyAnimation, QParallelAnimationGroup, QEasingCurve, QBuffer, QFile, QIODevice, QObject, QThread, QThreadPool, QRunnable, pyqtSignal, QMutex, QWaitCondition
 
-from PyQt6.QtMultimedia import QMediaPlayer, QAudioOutput, QVideoSink, QVideoFrame, QMediaMetaData
+from PyQt6.QtMultimedia import QMediaPlayer, QAudioOutput, QVideoSink, QVideoFrame, QMediaMetaData, QMediaFormat
 from PyQt6.QtMultimediaWidgets import QVideoWidget
 
 
@@ -26,6 +31,24 @@ from PyQt6.QtMultimediaWidgets import QVideoWidget
 
 APP_NAME = "StellarWall" 
 SETTINGS_FILE_NAME = "settings.json"
+MEDIA_INDEX_FILE_NAME = "media_index.sqlite3"
+THUMBNAIL_CACHE_MAX_MB = 64
+
+LOOP_MODE_SINGLE = "single"
+LOOP_MODE_DUAL = "dual"
+LOOP_MODE_LABELS = {LOOP_MODE_SINGLE: "Single Decoder (Seamless Loop)", LOOP_MODE_DUAL: "Dual Player (A/B Swap)"}
+DEFAULT_IN_MEMORY_LOOP_MAX_MB = 64
+DEFAULT_GIF_FRAME_CACHE_MAX_MB = 256
+DEFAULT_GIF_STREAM_MAX_FRAMES = 24
+DEFAULT_GIF_STREAM_MAX_MB = 128
+FRAME_RATE_CAP_LABELS = {0: "Native", 30: "30 FPS", 24: "24 FPS", 15: "15 FPS"}
+RENDER_SCALE_LABELS = {0: "Native (Full-Resolution Video Widget)", 100: "Screen Resolution", 75: "75% of Screen", 50: "50% of Screen"}
+RENDER_FILTER_SMOOTH = "smooth"
+RENDER_FILTER_FAST = "fast"
+RENDER_FILTER_LABELS = {RENDER_FILTER_SMOOTH: "Smooth (Bilinear)", RENDER_FILTER_FAST: "Fast (Nearest)"}
+RENDER_FILTER_MODES = {RENDER_FILTER_SMOOTH: Qt.TransformationMode.SmoothTransformation, RENDER_FILTER_FAST: Qt.TransformationMode.FastTransformation}
+GIF_ENGINE_CACHE = "cache"
+GIF_ENGINE_STREAM = "stream"
 
 try:
     import win32gui, win32con, win32com.client
@@ -34,11 +57,13 @@ except ImportError: PYWIN32_AVAILABLE = False; print("-" * 68); print("Warning:
 try:
     from PIL import Image, ImageSequence
     PILLOW_AVAILABLE = True
+    GIF_FRAME_RESAMPLE = getattr(Image, 'Resampling', Image).BILINEAR
 except ImportError: PILLOW_AVAILABLE = False; print("-" * 68); print("Warning: Pillow library not found. GIF previews disabled."); print("pip install Pillow"); print("-" * 68)
 
 user32 = ctypes.WinDLL('user32', use_last_error=True)
 shell32 = ctypes.WinDLL('shell32', use_last_error=True)
 SMTO_NORMAL = 0x0000; CSIDL_STARTUP = 0x0007
+WM_TIMECHANGE = 0x001E; WM_POWERBROADCAST = 0x0218; PBT_APMRESUMESUSPEND = 0x0007; PBT_APMRESUMEAUTOMATIC = 0x0012
 
 
 def get_resource_path(relative_path):
@@ -83,80 +108,1707 @@ def set_wallpaper_parent(player_hwnd, workerw_hwnd):
     if res == 0 and ctypes.get_last_error() != 0: print(f"Error setting parent: {ctypes.get_last_error()}"); return False
     return True
 
+class GifFrameDecoder(QThread):
+    """Decodes every GIF frame once, pre-scaled to the target size, off the GUI thread."""
+    frame_decoded = pyqtSignal(int, QImage, int)
+    decode_finished = pyqtSignal(int)
+    budget_exceeded = pyqtSignal(int)
+    decode_failed = pyqtSignal(str)
+
+    def __init__(self, file_path, target_size, max_bytes, parent=None):
+        super().__init__(parent)
+        self.file_path = file_path; self.target_size = QSize(target_size); self.max_bytes = max_bytes
+
+    def run(self):
+        width, height = self.target_size.width(), self.target_size.height()
+        try:
+            with Image.open(self.file_path) as gif:
+                needed_bytes = getattr(gif, 'n_frames', 1) * width * height * 4
+                if needed_bytes > self.max_bytes:
+                    self.budget_exceeded.emit(needed_bytes); return
+                frame_count = 0
+                for frame in ImageSequence.Iterator(gif):
+                    if self.isInterruptionRequested(): return
+                    duration_ms = frame.info.get('duration') or 0
+                    if duration_ms <= 10: duration_ms = 100 # Same fallback browsers use for 0/10 ms GIF delays.
+                    rgba_frame = frame.convert("RGBA").resize((width, height), GIF_FRAME_RESAMPLE)
+                    image = QImage(rgba_frame.tobytes("raw", "RGBA"), width, height, width * 4, QImage.Format.Format_RGBA8888)
+                    self.frame_decoded.emit(frame_count, image.convertToFormat(QImage.Format.Format_ARGB32_Premultiplied), int(duration_ms))
+                    frame_count += 1
+                if frame_count == 0: self.decode_failed.emit("GIF contains no frames"); return
+                self.decode_finished.emit(frame_count)
+        except Exception as e:
+            self.decode_failed.emit(str(e))
+
+class GifStreamDecoder(QThread):
+    """Decodes a bounded window of pre-scaled frames ahead of the playhead, re-decoding from frame 0 on each pass."""
+    frame_decoded = pyqtSignal(QImage, int)
+    loop_finished = pyqtSignal(int)
+    decode_failed = pyqtSignal(str)
+
+    def __init__(self, file_path, target_size, max_frames, max_bytes, parent=None):
+        super().__init__(parent)
+        self.file_path = file_path; self.target_size = QSize(target_size)
+        self.max_frames = max(1, max_frames); self.max_bytes = max_bytes
+        self._window_mutex = QMutex(); self._window_space = QWaitCondition()
+        self._frames_in_window = 0; self._bytes_in_window = 0
+
+    def release_frame(self, frame_bytes):
+        self._window_mutex.lock()
+        self._frames_in_window -= 1; self._bytes_in_window -= frame_bytes
+        self._window_space.wakeAll()
+        self._window_mutex.unlock()
+
+    def _reserve_window_space(self, frame_bytes):
+        self._window_mutex.lock()
+        try:
+            # An empty window always admits one frame, so a single frame larger than the byte budget still plays.
+            while not self.isInterruptionRequested() and self._frames_in_window > 0 and \
+                  (self._frames_in_window >= self.max_frames or self._bytes_in_window + frame_bytes > self.max_bytes):
+                self._window_space.wait(self._window_mutex, 200)
+            if self.isInterruptionRequested(): return False
+            self._frames_in_window += 1; self._bytes_in_window += frame_bytes
+            return True
+        finally:
+            self._window_mutex.unlock()
+
+    def run(self):
+        width, height = self.target_size.width(), self.target_size.height()
+        try:
+            with Image.open(self.file_path) as gif:
+                while not self.isInterruptionRequested():
+                    frame_count = 0
+                    for frame in ImageSequence.Iterator(gif):
+                        if not self._reserve_window_space(width * height * 4): return
+                        duration_ms = frame.info.get('duration') or 0
+                        if duration_ms <= 10: duration_ms = 100
+                        rgba_frame = frame.convert("RGBA").resize((width, height), GIF_FRAME_RESAMPLE)
+                        image = QImage(rgba_frame.tobytes("raw", "RGBA"), width, height, width * 4, QImage.Format.Format_RGBA8888)
+                        self.frame_decoded.emit(image.convertToFormat(QImage.Format.Format_ARGB32_Premultiplied), int(duration_ms))
+                        frame_count += 1
+                    if frame_count == 0: self.decode_failed.emit("GIF contains no frames"); return
+                    self.loop_finished.emit(frame_count)
+        except Exception as e:
+            self.decode_failed.emit(str(e))
+
+class _VideoFrameConvertTask(QRunnable):
+    """Reads a QVideoFrame back into a QImage and downscales it to target_size, off the GUI thread."""
+
+    def __init__(self, frame, target_size, transform_mode, generation, result_signal):
+        super().__init__()
+        self.frame = frame; self.target_size = target_size; self.transform_mode = transform_mode
+        self.generation = generation; self.result_signal = result_signal
+
+    def run(self):
+        start_time = time.perf_counter()
+        frame_image = self.frame.toImage()
+        if not frame_image.isNull():
+            scaled_size = frame_image.size().scaled(self.target_size, Qt.AspectRatioMode.KeepAspectRatio)
+            if scaled_size.width() < frame_image.width():
+                frame_image = frame_image.scaled(scaled_size, Qt.AspectRatioMode.IgnoreAspectRatio, self.transform_mode)
+        self.frame = None
+        try: self.result_signal.emit(frame_image, (time.perf_counter() - start_time) * 1000, self.generation)
+        except RuntimeError: pass # The renderer was deleted while this frame was converting.
+
+class VideoFrameRenderer(QWidget):
+    """Paints frames from its own QVideoSink, dropping any that arrive faster than max_fps.
+
+    Each presented frame is downscaled once to the widget's device-pixel size (the screen, for a wallpaper window),
+    or to render_scale percent of it, and then blitted as is, so paints never resample a full-resolution frame.
+    The readback and downscale run on a one-thread pool; while one is in flight only the newest frame waits, so a
+    slow conversion drops frames instead of stalling the GUI thread.
+    """
+    frame_presented = pyqtSignal()
+    _frame_converted = pyqtSignal(QImage, float, int)
+
+    def __init__(self, parent=None, max_fps=0, render_scale=0, render_filter=RENDER_FILTER_SMOOTH):
+        super().__init__(parent)
+        self.setAttribute(Qt.WidgetAttribute.WA_OpaquePaintEvent)
+        self._video_sink = QVideoSink(self)
+        self._video_sink.videoFrameChanged.connect(self._on_frame)
+        self._frame_image = QImage()
+        self._next_present_time = 0.0
+        self.frame_convert_ms = None # Moving average of readback + scale per presented frame, to compare with QVideoWidget.
+        self._convert_pool = QThreadPool(self); self._convert_pool.setMaxThreadCount(1)
+        self._converting = False; self._waiting_frame = None; self._frame_generation = 0
+        self._frame_converted.connect(self._on_frame_converted)
+        self.set_max_fps(max_fps)
+        self.set_render_options(render_scale, render_filter)
+
+    def videoSink(self):
+        return self._video_sink
+
+    def set_max_fps(self, max_fps):
+        self.max_fps = max_fps
+        self._min_frame_interval = 1.0 / max_fps if max_fps else 0.0
+        self._next_present_time = 0.0
+
+    def set_render_options(self, render_scale, render_filter):
+        self.render_scale = render_scale
+        self.render_filter = render_filter if render_filter in RENDER_FILTER_MODES else RENDER_FILTER_SMOOTH
+
+    def clear_frame(self):
+        # A conversion still in flight belongs to the old content; its result is dropped by generation.
+        self._frame_generation += 1; self._waiting_frame = None
+        self._frame_image = QImage(); self.update()
+
+    def _render_size(self):
+        device_scale = self.devicePixelRatioF() * (self.render_scale or 100) / 100.0
+        return QSize(max(1, round(self.width() * device_scale)), max(1, round(self.height() * device_scale)))
+
+    def _on_frame(self, frame: QVideoFrame):
+        if not frame.isValid(): return
+        now = time.perf_counter()
+        if self._min_frame_interval:
+            # Dropped frames are never mapped or converted; 2 ms slack absorbs decoder timestamp jitter.
+            if now + 0.002 < self._next_present_time: return
+            if now - self._next_present_time < self._min_frame_interval: self._next_present_time += self._min_frame_interval
+            else: self._next_present_time = now + self._min_frame_interval
+        if self._converting: self._waiting_frame = frame; return
+        self._start_conversion(frame)
+
+    def _start_conversion(self, frame):
+        self._converting = True
+        self._convert_pool.start(_VideoFrameConvertTask(frame, self._render_size(), RENDER_FILTER_MODES[self.render_filter],
+                                                        self._frame_generation, self._frame_converted))
+
+    def _on_frame_converted(self, frame_image, convert_ms, generation):
+        self._converting = False
+        if self._waiting_frame is not None:
+            waiting_frame = self._waiting_frame; self._waiting_frame = None
+            self._start_conversion(waiting_frame)
+        if generation != self._frame_generation: return
+        self.frame_convert_ms = convert_ms if self.frame_convert_ms is None else self.frame_convert_ms * 0.9 + convert_ms * 0.1
+        self._frame_image = frame_image
+        self.update()
+        self.frame_presented.emit()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), Qt.GlobalColor.black)
+        if self._frame_image.isNull(): return
+        target_size = self._frame_image.size().scaled(self.size(), Qt.AspectRatioMode.KeepAspectRatio)
+        # Only a frame kept below device size (a render scale, or a source smaller than the screen) is stretched here.
+        if self.render_filter == RENDER_FILTER_SMOOTH and self._frame_image.width() < round(target_size.width() * self.devicePixelRatioF()):
+            painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
+        target_x = (self.width() - target_size.width()) // 2; target_y = (self.height() - target_size.height()) // 2
+        painter.drawImage(QRect(target_x, target_y, target_size.width(), target_size.height()), self._frame_image)
+
+MP4_MAX_MOOV_BYTES = 64 * 1024 * 1024
+
+def _iter_mp4_boxes(data, start=0, end=None):
+    end = len(data) if end is None else end
+    offset = start
+    while offset + 8 <= end:
+        box_size, box_type = struct.unpack_from(">I4s", data, offset)
+        header_size = 8
+        if box_size == 1:
+            if offset + 16 > end: return
+            box_size = struct.unpack_from(">Q", data, offset + 8)[0]; header_size = 16
+        elif box_size == 0: box_size = end - offset
+        if box_size < header_size or offset + box_size > end: return
+        yield box_type, offset + header_size, offset + box_size
+        offset += box_size
+
+def _read_mp4_moov(mp4_file):
+    file_size = os.fstat(mp4_file.fileno()).st_size
+    offset = 0
+    while offset + 8 <= file_size:
+        mp4_file.seek(offset)
+        header = mp4_file.read(16)
+        if len(header) < 8: return None
+        box_size, box_type = struct.unpack_from(">I4s", header)
+        header_size = 8
+        if box_size == 1:
+            if len(header) < 16: return None
+            box_size = struct.unpack_from(">Q", header, 8)[0]; header_size = 16
+        elif box_size == 0: box_size = file_size - offset
+        if box_size < header_size: return None
+        if box_type == b"moov":
+            payload_size = box_size - header_size
+            if payload_size > MP4_MAX_MOOV_BYTES: return None
+            mp4_file.seek(offset + header_size)
+            payload = mp4_file.read(payload_size)
+            return payload if len(payload) == payload_size else None
+        # mdat (and every other top-level box) is stepped over with a seek, never read.
+        offset += box_size
+    return None
+
+def _read_mp4_timescale_duration(data, start):
+    if data[start] == 1: return struct.unpack_from(">IQ", data, start + 20)
+    return struct.unpack_from(">II", data, start + 12)
+
+def _read_mp4_track(data, start, end):
+    track = {"handler": None}
+
+    def walk_boxes(box_start, box_end):
+        for box_type, payload_start, payload_end in _iter_mp4_boxes(data, box_start, box_end):
+            payload_size = payload_end - payload_start
+            if box_type in (b"mdia", b"minf", b"stbl"):
+                walk_boxes(payload_start, payload_end)
+            elif box_type == b"tkhd" and payload_size >= 84:
+                # Width and height are the last two 16.16 fixed-point fields of tkhd in both versions.
+                track_width, track_height = struct.unpack_from(">II", data, payload_end - 8)
+                track["width"] = track_width >> 16; track["height"] = track_height >> 16
+            elif box_type == b"mdhd" and payload_size >= 24:
+                track["timescale"], track["duration"] = _read_mp4_timescale_duration(data, payload_start)
+            elif box_type == b"hdlr" and payload_size >= 12:
+                track["handler"] = data[payload_start + 8:payload_start + 12]
+            elif box_type == b"stsd" and payload_size >= 16:
+                entry_start = payload_start + 8
+                track["codec"] = data[entry_start + 4:entry_start + 8].decode("latin-1")
+                if payload_end - entry_start >= 36:
+                    track["coded_width"], track["coded_height"] = struct.unpack_from(">HH", data, entry_start + 32)
+            elif box_type in (b"stsz", b"stz2") and payload_size >= 12:
+                track["sample_count"] = struct.unpack_from(">I", data, payload_start + 8)[0]
+            elif box_type == b"stts" and payload_size >= 8 and "sample_count" not in track:
+                entry_count = struct.unpack_from(">I", data, payload_start + 4)[0]
+                entry_count = min(entry_count, (payload_size - 8) // 8)
+                track["sample_count"] = sum(struct.unpack_from(">I", data, payload_start + 8 + i * 8)[0] for i in range(entry_count))
+
+    walk_boxes(start, end)
+    return track
+
+def read_mp4_header_info(file_path):
+    """Reads MP4 metadata from the moov box alone (no decoder). Returns None when no usable video track is found."""
+    with open(file_path, "rb") as mp4_file:
+        moov = _read_mp4_moov(mp4_file)
+    if moov is None: return None
+    has_audio = False; video_track = None; movie_timescale = movie_duration = 0
+    for box_type, payload_start, payload_end in _iter_mp4_boxes(moov):
+        if box_type == b"mvhd" and payload_end - payload_start >= 24:
+            movie_timescale, movie_duration = _read_mp4_timescale_duration(moov, payload_start)
+        elif box_type == b"trak":
+            track = _read_mp4_track(moov, payload_start, payload_end)
+            if track["handler"] == b"soun": has_audio = True
+            elif track["handler"] == b"vide" and video_track is None: video_track = track
+    if video_track is None: return None
+
+    width = video_track.get("width") or video_track.get("coded_width", 0)
+    height = video_track.get("height") or video_track.get("coded_height", 0)
+    timescale, duration = video_track.get("timescale", 0), video_track.get("duration", 0)
+    if not (timescale and duration): timescale, duration = movie_timescale, movie_duration
+    duration_us = duration * 1000000 // timescale if timescale else 0
+    media_info = {"width": width, "height": height, "duration_us": duration_us, "duration_ms": duration_us // 1000,
+                  "timescale": timescale, "sample_count": video_track.get("sample_count", 0),
+                  "video_codec": video_track.get("codec", ""), "has_audio": has_audio}
+    if duration_us and media_info["sample_count"]: media_info["frame_rate"] = media_info["sample_count"] * 1000000 / duration_us
+    return media_info
+
+def read_gif_header_info(file_path):
+    with Image.open(file_path) as gif:
+        width, height = gif.size
+        frame_count = getattr(gif, 'n_frames', 1); duration_ms = 0
+        for frame_index in range(frame_count):
+            gif.seek(frame_index)
+            duration_ms += gif.info.get('duration') or 0
+    media_info = {"width": width, "height": height, "frame_count": frame_count, "duration_ms": duration_ms,
+                  "duration_us": duration_ms * 1000, "video_codec": "gif", "has_audio": False}
+    if duration_ms: media_info["frame_rate"] = frame_count * 1000 / duration_ms
+    return media_info
+
+def media_file_signature(file_path):
+    try: stat_result = os.stat(file_path)
+    except OSError: return None
+    return (stat_result.st_size, stat_result.st_mtime_ns)
+
+class MediaMetadataIndex:
+    """Wallpaper metadata persisted in SQLite, keyed by path and invalidated by (size, mtime_ns).
+
+    The whole table is mirrored in a dict at startup, so lookups never touch the database; writes are
+    buffered and committed in batches by flush().
+    """
+    COLUMNS = ("width", "height", "duration_us", "frame_rate", "frame_count", "video_codec", "has_audio", "thumbnail_key")
+
+    def __init__(self, database_path=None):
+        self._entries = {}; self._pending_paths = set(); self._connection = None
+        if not database_path: return
+        try:
+            self._connection = sqlite3.connect(database_path)
+            self._connection.execute("CREATE TABLE IF NOT EXISTS media (path TEXT PRIMARY KEY, size INTEGER NOT NULL, mtime_ns INTEGER NOT NULL, "
+                                     "width INTEGER, height INTEGER, duration_us INTEGER, frame_rate REAL, frame_count INTEGER, "
+                                     "video_codec TEXT, has_audio INTEGER, thumbnail_key TEXT)")
+            for row in self._connection.execute(f"SELECT path, size, mtime_ns, {', '.join(self.COLUMNS)} FROM media"):
+                self._entries[row[0]] = ((row[1], row[2]), self._row_to_info(row[3:]))
+        except sqlite3.Error as e:
+            print(f"Media index unavailable ({database_path}): {e}")
+            self._connection = None
+
+    def _row_to_info(self, values):
+        media_info = {column: value for column, value in zip(self.COLUMNS, values) if value is not None}
+        if "has_audio" in media_info: media_info["has_audio"] = bool(media_info["has_audio"])
+        if "duration_us" in media_info: media_info["duration_ms"] = media_info["duration_us"] // 1000
+        return media_info
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, normalized_path, file_signature):
+        entry = self._entries.get(normalized_path)
+        # Rows holding nothing but a thumbnail key are failed probes stored by older builds; report them as unknown.
+        if entry and file_signature and entry[0] == file_signature and any(column != "thumbnail_key" for column in entry[1]): return entry[1]
+        return None
+
+    def put(self, normalized_path, file_signature, media_info):
+        media_info = dict(media_info)
+        if "frame_count" not in media_info and media_info.get("sample_count"): media_info["frame_count"] = media_info["sample_count"]
+        old_entry = self._entries.get(normalized_path)
+        if old_entry and old_entry[0] == file_signature and "thumbnail_key" in old_entry[1]:
+            media_info.setdefault("thumbnail_key", old_entry[1]["thumbnail_key"])
+        self._entries[normalized_path] = (file_signature, media_info)
+        self._pending_paths.add(normalized_path)
+
+    def flush(self):
+        if not self._connection or not self._pending_paths: self._pending_paths.clear(); return
+        rows = []
+        for normalized_path in self._pending_paths:
+            entry = self._entries.get(normalized_path)
+            if not entry: continue
+            (size, mtime_ns), media_info = entry
+            rows.append((normalized_path, size, mtime_ns) + tuple(media_info.get(column) for column in self.COLUMNS))
+        self._pending_paths.clear()
+        try:
+            with self._connection:
+                self._connection.executemany(f"INSERT OR REPLACE INTO media VALUES ({', '.join('?' * (3 + len(self.COLUMNS)))})", rows)
+        except sqlite3.Error as e:
+            print(f"Media index write failed: {e}")
+
+    def set_thumbnail_key(self, normalized_path, file_signature, thumbnail_key):
+        entry = self._entries.get(normalized_path)
+        if not entry or entry[0] != file_signature or entry[1].get("thumbnail_key") == thumbnail_key: return
+        entry[1]["thumbnail_key"] = thumbnail_key
+        self._pending_paths.add(normalized_path)
+
+    def close(self):
+        self.flush()
+        if self._connection: self._connection.close(); self._connection = None
+
+class ThumbnailCache:
+    """Small preview images on disk, keyed by source file version, preview size and quality; LRU-evicted by size.
+
+    Recency is the file mtime (bumped on every hit), so the LRU order survives restarts without a separate journal.
+    """
+
+    def __init__(self, cache_dir, max_bytes):
+        self.cache_dir = cache_dir; self.max_bytes = max_bytes
+        self.image_format = "webp" if b"webp" in QImageWriter.supportedImageFormats() else "png"
+        self._entries = {}; self._total_bytes = 0
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            with os.scandir(cache_dir) as dir_entries:
+                for dir_entry in dir_entries:
+                    if not dir_entry.is_file(): continue
+                    stat_result = dir_entry.stat()
+                    self._entries[dir_entry.name] = (stat_result.st_mtime, stat_result.st_size)
+                    self._total_bytes += stat_result.st_size
+        except OSError as e:
+            print(f"Thumbnail cache unavailable ({cache_dir}): {e}")
+            self.cache_dir = None
+
+    @staticmethod
+    def make_key(normalized_path, file_signature, width, height, quality):
+        key_source = f"{normalized_path}|{file_signature[0]}|{file_signature[1]}|{width}x{height}|{quality}"
+        return hashlib.sha1(key_source.encode("utf-8")).hexdigest()
+
+    def _file_name(self, key):
+        return f"{key}.{self.image_format}"
+
+    def load(self, key):
+        file_name = self._file_name(key)
+        if not self.cache_dir or file_name not in self._entries: return None
+        file_path = os.path.join(self.cache_dir, file_name)
+        pixmap = QPixmap(file_path)
+        if pixmap.isNull():
+            self._remove(file_name)
+            return None
+        now = time.time()
+        try: os.utime(file_path, (now, now))
+        except OSError: pass
+        self._entries[file_name] = (now, self._entries[file_name][1])
+        return pixmap
+
+    def store(self, key, image):
+        if not self.cache_dir or image.isNull(): return
+        file_name = self._file_name(key)
+        file_path = os.path.join(self.cache_dir, file_name)
+        if not image.save(file_path, self.image_format.upper()): return
+        try: file_size = os.path.getsize(file_path)
+        except OSError: return
+        if file_name in self._entries: self._total_bytes -= self._entries[file_name][1]
+        self._entries[file_name] = (time.time(), file_size)
+        self._total_bytes += file_size
+        if self._total_bytes > self.max_bytes: self._evict()
+
+    def _remove(self, file_name):
+        entry = self._entries.pop(file_name, None)
+        if entry: self._total_bytes -= entry[1]
+        try: os.remove(os.path.join(self.cache_dir, file_name))
+        except OSError: pass
+
+    def _evict(self):
+        # Trim to 90% so a full cache is not re-scanned on every store.
+        target_bytes = self.max_bytes * 9 // 10
+        for file_name, _ in sorted(self._entries.items(), key=lambda item: item[1][0]):
+            if self._total_bytes <= target_bytes: break
+            self._remove(file_name)
+
+class _MediaHeaderProbeTask(QRunnable):
+    def __init__(self, normalized_path, result_signal):
+        super().__init__()
+        self.normalized_path = normalized_path; self.result_signal = result_signal
+
+    def run(self):
+        try:
+            if self.normalized_path.lower().endswith(".gif"):
+                media_info = read_gif_header_info(self.normalized_path) if PILLOW_AVAILABLE else None
+            else:
+                media_info = read_mp4_header_info(self.normalized_path)
+        except Exception: media_info = None
+        self.result_signal.emit(self.normalized_path, media_info)
+
+class MediaProbeService(QObject):
+    """Reads wallpaper metadata without blocking, results kept in a MediaMetadataIndex per file version.
+
+    Header parsers (moov for MP4, Pillow for GIF) run first on a thread pool. MP4s they cannot read fall back to a
+    bounded number of concurrent QMediaPlayer probes; QMediaPlayer needs a thread with a running event loop, so
+    those are asynchronous on the GUI thread's loop. Callbacks receive (normalized_path, info); info is {} on failure,
+    and failures are not indexed, so a later probe() retries them.
+    """
+    probe_finished = pyqtSignal(str, dict)
+    _header_probe_done = pyqtSignal(str, object)
+    MAX_CONCURRENT_PROBES = 4
+    PROBE_TIMEOUT_MS = 3000
+
+    def __init__(self, metadata_index=None, parent=None):
+        super().__init__(parent)
+        self.metadata_index = metadata_index if metadata_index is not None else MediaMetadataIndex()
+        self._index_flush_timer = QTimer(self); self._index_flush_timer.setSingleShot(True)
+        self._index_flush_timer.timeout.connect(self.metadata_index.flush)
+        self._callbacks = {}
+        self._queue = deque()
+        self._active_probes = {}
+        self._header_thread_pool = QThreadPool(self)
+        self._header_thread_pool.setMaxThreadCount(max(1, min(4, QThread.idealThreadCount())))
+        self._header_probe_done.connect(self._on_header_probe_done)
+
+    def cached_info(self, file_path, file_signature=None):
+        normalized_path = os.path.normpath(file_path)
+        return self.metadata_index.get(normalized_path, file_signature or media_file_signature(normalized_path))
+
+    def probe(self, file_path, callback=None, file_signature=None):
+        normalized_path = os.path.normpath(file_path)
+        media_info = self.cached_info(normalized_path, file_signature)
+        if media_info is not None:
+            if callback: QTimer.singleShot(0, lambda: callback(normalized_path, media_info))
+            return
+        if normalized_path in self._callbacks:
+            if callback: self._callbacks[normalized_path].append(callback)
+            return
+        self._callbacks[normalized_path] = [callback] if callback else []
+        self._header_thread_pool.start(_MediaHeaderProbeTask(normalized_path, self._header_probe_done))
+
+    def _on_header_probe_done(self, normalized_path, media_info):
+        if (media_info and media_info.get("height")) or normalized_path.lower().endswith(".gif"):
+            self._store_result(normalized_path, media_info or {})
+            return
+        self._queue.append(normalized_path)
+        self._start_queued_probes()
+
+    def probe_many(self, file_paths):
+        """Queues the paths that are neither in the metadata index (at their current version) nor already probing.
+
+        Returns how many were queued.
+        """
+        queued_count = 0
+        for file_path in file_paths:
+            normalized_path = os.path.normpath(file_path)
+            if normalized_path in self._callbacks: continue
+            file_signature = media_file_signature(normalized_path)
+            if not file_signature or self.metadata_index.get(normalized_path, file_signature) is not None: continue
+            self.probe(normalized_path, file_signature=file_signature); queued_count += 1
+        return queued_count
+
+    def _start_queued_probes(self):
+        while self._queue and len(self._active_probes) < self.MAX_CONCURRENT_PROBES:
+            self._start_probe(self._queue.popleft())
+
+    def _start_probe(self, normalized_path):
+        probe_player = QMediaPlayer(self)
+        probe_player.setVideoSink(QVideoSink(probe_player))
+        timeout_timer = QTimer(self); timeout_timer.setSingleShot(True)
+        timeout_timer.timeout.connect(lambda p=normalized_path: self._finish_probe(p, None))
+        probe_player.mediaStatusChanged.connect(lambda status, p=normalized_path: self._on_probe_status(p, status))
+        probe_player.errorOccurred.connect(lambda error, error_string, p=normalized_path: self._finish_probe(p, None))
+        self._active_probes[normalized_path] = (probe_player, timeout_timer)
+        probe_player.setSource(QUrl.fromLocalFile(normalized_path))
+        timeout_timer.start(self.PROBE_TIMEOUT_MS)
+
+    def _on_probe_status(self, normalized_path, status):
+        probe = self._active_probes.get(normalized_path)
+        if not probe: return
+        if status == QMediaPlayer.MediaStatus.LoadedMedia:
+            self._finish_probe(normalized_path, self._read_media_info(probe[0]))
+        elif status in [QMediaPlayer.MediaStatus.InvalidMedia, QMediaPlayer.MediaStatus.StalledMedia]:
+            self._finish_probe(normalized_path, None)
+
+    @staticmethod
+    def _read_media_info(probe_player):
+        meta_data = probe_player.metaData()
+        resolution = meta_data.value(QMediaMetaData.Key.Resolution)
+        if not (isinstance(resolution, QSize) and resolution.isValid()):
+            video_tracks = probe_player.videoTracks()
+            resolution = video_tracks[0].value(QMediaMetaData.Key.Resolution) if video_tracks else None
+        media_info = {"duration_ms": probe_player.duration(), "has_audio": probe_player.hasAudio()}
+        if isinstance(resolution, QSize) and resolution.isValid():
+            media_info["width"] = resolution.width(); media_info["height"] = resolution.height()
+        frame_rate = meta_data.value(QMediaMetaData.Key.VideoFrameRate)
+        if isinstance(frame_rate, (int, float)) and frame_rate > 0: media_info["frame_rate"] = float(frame_rate)
+        video_codec = meta_data.value(QMediaMetaData.Key.VideoCodec)
+        if isinstance(video_codec, QMediaFormat.VideoCodec) and video_codec != QMediaFormat.VideoCodec.Unspecified:
+            media_info["video_codec"] = QMediaFormat.videoCodecName(video_codec)
+        return media_info
+
+    def _finish_probe(self, normalized_path, media_info):
+        probe = self._active_probes.pop(normalized_path, None)
+        if not probe: return
+        probe_player, timeout_timer = probe
+        timeout_timer.stop(); timeout_timer.deleteLater()
+        probe_player.stop(); probe_player.deleteLater()
+        self._store_result(normalized_path, media_info or {})
+        self._start_queued_probes()
+
+    def _store_result(self, normalized_path, media_info):
+        # Failures ({}) are often a timeout or a file still being written: report them, but leave them out of the
+        # index so cached_info stays None and the next probe() of the file tries again.
+        file_signature = media_file_signature(normalized_path) if media_info else None
+        if file_signature:
+            self.metadata_index.put(normalized_path, file_signature, media_info)
+            if not self._index_flush_timer.isActive(): self._index_flush_timer.start(2000)
+        callbacks = self._callbacks.pop(normalized_path, [])
+        self.probe_finished.emit(normalized_path, media_info)
+        for callback in callbacks: callback(normalized_path, media_info)
+
+class FrameGrabQueue(QObject):
+    """The one MP4 frame-grab pipeline: a few reusable QMediaPlayers fed from a queue, shared by every preview consumer.
+
+    Requests for the same file are merged and the frame goes to every callback as callback(normalized_path, image);
+    image is null on failure or timeout. A latest_only request first cancels whatever its owner still has queued or
+    loading and jumps the queue, so rapid selections coalesce to the last one. latency_stats() reports
+    request-to-frame latency and the one-time cost of creating each player.
+    """
+    grab_finished = pyqtSignal(str, float)
+    LOAD_TIMEOUT_MS = 5000
+    LATENCY_SAMPLES = 50
+
+    def __init__(self, max_players=2, parent=None):
+        super().__init__(parent)
+        self.max_players = max_players
+        self._requests = {}
+        self._queue = deque()
+        self._idle_players = []; self._active_grabs = {}; self._timeout_timers = {}
+        self._player_init_ms = []
+        self._latency_ms = deque(maxlen=self.LATENCY_SAMPLES)
+
+    def request(self, file_path, callback, owner=None, latest_only=False):
+        normalized_path = os.path.normpath(file_path)
+        if latest_only: self._drop_callbacks(owner, keep_path=normalized_path)
+        pending = self._requests.get(normalized_path)
+        if pending:
+            if latest_only: pending["callbacks"] = [entry for entry in pending["callbacks"] if entry[0] != owner]
+            pending["callbacks"].append((owner, callback))
+        else: self._requests[normalized_path] = {"callbacks": [(owner, callback)], "queued_at": time.perf_counter()}
+        if normalized_path in self._active_grabs.values(): return
+        if latest_only:
+            if normalized_path in self._queue: self._queue.remove(normalized_path)
+            self._queue.appendleft(normalized_path)
+        elif not pending: self._queue.append(normalized_path)
+        self._start_grabs()
+
+    def cancel(self, owner):
+        self._drop_callbacks(owner)
+        self._start_grabs()
+
+    def _drop_callbacks(self, owner, keep_path=None):
+        for normalized_path in list(self._requests):
+            if normalized_path == keep_path: continue
+            callbacks = [entry for entry in self._requests[normalized_path]["callbacks"] if entry[0] != owner]
+            if callbacks:
+                self._requests[normalized_path]["callbacks"] = callbacks
+                continue
+            del self._requests[normalized_path]
+            for grab_player, active_path in list(self._active_grabs.items()):
+                if active_path == normalized_path: self._release_player(grab_player)
+        self._queue = deque(normalized_path for normalized_path in self._queue if normalized_path in self._requests)
+
+    def latency_stats(self):
+        samples = list(self._latency_ms)
+        return {"samples": len(samples), "last_ms": samples[-1] if samples else None,
+                "avg_ms": sum(samples) / len(samples) if samples else None, "max_ms": max(samples) if samples else None,
+                "players_created": len(self._player_init_ms),
+                "player_init_ms": sum(self._player_init_ms) / len(self._player_init_ms) if self._player_init_ms else None}
+
+    def _start_grabs(self):
+        while self._queue and len(self._active_grabs) < self.max_players:
+            normalized_path = self._queue.popleft()
+            if normalized_path not in self._requests: continue
+            grab_player = self._idle_players.pop() if self._idle_players else self._create_player()
+            self._active_grabs[grab_player] = normalized_path
+            grab_player.setSource(QUrl.fromLocalFile(normalized_path))
+            self._timeout_timers[grab_player].start(self.LOAD_TIMEOUT_MS)
+
+    def _create_player(self):
+        init_started = time.perf_counter()
+        grab_player = QMediaPlayer(self)
+        grab_sink = QVideoSink(grab_player)
+        grab_player.setVideoSink(grab_sink)
+        grab_player.mediaStatusChanged.connect(lambda status, p=grab_player: self._on_grab_status(p, status))
+        grab_player.errorOccurred.connect(lambda error, error_string, p=grab_player: self._finish_grab(p, QImage()))
+        grab_sink.videoFrameChanged.connect(lambda frame, p=grab_player: self._on_grab_frame(p, frame))
+        timeout_timer = QTimer(self); timeout_timer.setSingleShot(True)
+        timeout_timer.timeout.connect(lambda p=grab_player: self._finish_grab(p, QImage()))
+        self._timeout_timers[grab_player] = timeout_timer
+        self._player_init_ms.append((time.perf_counter() - init_started) * 1000)
+        return grab_player
+
+    def _on_grab_status(self, grab_player, status):
+        if grab_player not in self._active_grabs: return
+        if status == QMediaPlayer.MediaStatus.LoadedMedia:
+            # Position 0 is the first sync sample, so the decoder hands over a keyframe without decoding forward.
+            grab_player.setPosition(0)
+            grab_player.pause()
+        elif status in [QMediaPlayer.MediaStatus.InvalidMedia, QMediaPlayer.MediaStatus.StalledMedia, QMediaPlayer.MediaStatus.EndOfMedia]:
+            self._finish_grab(grab_player, QImage())
+
+    def _on_grab_frame(self, grab_player, frame):
+        active_path = self._active_grabs.get(grab_player)
+        if active_path is None or not frame.isValid(): return
+        # A frame from the player's previous source can still be in flight after it was reused.
+        if os.path.normpath(grab_player.source().toLocalFile()) != active_path: return
+        self._finish_grab(grab_player, frame.toImage())
+
+    def _release_player(self, grab_player):
+        self._active_grabs.pop(grab_player, None)
+        self._timeout_timers[grab_player].stop()
+        grab_player.stop(); grab_player.setSource(QUrl())
+        self._idle_players.append(grab_player)
+
+    def _finish_grab(self, grab_player, image):
+        normalized_path = self._active_grabs.get(grab_player)
+        if normalized_path is None: return
+        self._release_player(grab_player)
+        request = self._requests.pop(normalized_path, None)
+        if request:
+            if not image.isNull():
+                latency_ms = (time.perf_counter() - request["queued_at"]) * 1000
+                self._latency_ms.append(latency_ms)
+                self.grab_finished.emit(normalized_path, latency_ms)
+            for owner, callback in request["callbacks"]: callback(normalized_path, image)
+        self._start_grabs()
+
+    def shutdown(self):
+        self._requests.clear(); self._queue.clear()
+        for grab_player in list(self._active_grabs): self._release_player(grab_player)
+        for grab_player in self._idle_players: grab_player.deleteLater()
+        self._idle_players = []
+
+class _GifThumbnailTask(QRunnable):
+    def __init__(self, thumbnail_key, normalized_path, target_size, is_wanted, result_signal, resample=None):
+        super().__init__()
+        self.thumbnail_key = thumbnail_key; self.normalized_path = normalized_path; self.target_size = QSize(target_size)
+        self.is_wanted = is_wanted; self.result_signal = result_signal; self.resample = resample
+
+    def run(self):
+        # Requests cancelled while this task sat in the pool's queue are skipped without touching the file.
+        if not self.is_wanted(self.thumbnail_key): return
+        image = QImage()
+        try:
+            with Image.open(self.normalized_path) as gif:
+                # GIF frames always decode at full size. Shrinking the palette image first (nearest, down to twice the
+                # target) keeps the RGBA conversion small; the requested filter then does the final reduction.
+                target_width, target_height = self.target_size.width(), self.target_size.height()
+                if gif.mode == "P": gif.thumbnail((target_width * 2, target_height * 2), getattr(Image, 'Resampling', Image).NEAREST)
+                first_frame = gif.convert("RGBA")
+                first_frame.thumbnail((target_width, target_height), self.resample or GIF_FRAME_RESAMPLE)
+                width, height = first_frame.size
+                image = QImage(first_frame.tobytes("raw", "RGBA"), width, height, width * 4, QImage.Format.Format_RGBA8888).copy()
+        except Exception: pass
+        self.result_signal.emit(self.thumbnail_key, image)
+
+class ThumbnailService(QObject):
+    """Generates small list thumbnails in the background and keeps them in a ThumbnailCache.
+
+    GIF first frames are decoded by Pillow on a bounded thread pool; MP4 frames come from the shared FrameGrabQueue.
+    Requests are grouped by owner so a list can drop everything it asked for with cancel(owner) when its contents change.
+    """
+    _gif_thumbnail_done = pyqtSignal(str, QImage)
+    MEMORY_CACHE_ENTRIES = 4000
+
+    def __init__(self, thumbnail_cache, frame_grabber, parent=None):
+        super().__init__(parent)
+        self.thumbnail_cache = thumbnail_cache; self.frame_grabber = frame_grabber
+        self._memory_cache = OrderedDict()
+        self._failed_keys = set()
+        self._pending = {}
+        self._gif_thread_pool = QThreadPool(self)
+        self._gif_thread_pool.setMaxThreadCount(max(1, min(2, QThread.idealThreadCount() - 1)))
+        self._gif_thumbnail_done.connect(self._finish_thumbnail)
+
+    @staticmethod
+    def thumbnail_key(normalized_path, size):
+        file_signature = media_file_signature(normalized_path)
+        if not file_signature: return None
+        return ThumbnailCache.make_key(normalized_path, file_signature, size.width(), size.height(), "icon")
+
+    def _is_pending(self, thumbnail_key):
+        return thumbnail_key in self._pending
+
+    def _remember(self, thumbnail_key, pixmap):
+        self._memory_cache[thumbnail_key] = pixmap
+        self._memory_cache.move_to_end(thumbnail_key)
+        while len(self._memory_cache) > self.MEMORY_CACHE_ENTRIES: self._memory_cache.popitem(last=False)
+
+    def request(self, file_path, size, owner, callback):
+        """Returns the pixmap at once when cached; otherwise queues it and later calls callback(normalized_path, pixmap)."""
+        normalized_path = os.path.normpath(file_path)
+        thumbnail_key = self.thumbnail_key(normalized_path, size)
+        if not thumbnail_key or thumbnail_key in self._failed_keys: return None
+        pixmap = self._memory_cache.get(thumbnail_key)
+        if pixmap is None:
+            pixmap = self.thumbnail_cache.load(thumbnail_key)
+            if pixmap is not None: self._remember(thumbnail_key, pixmap)
+        else: self._memory_cache.move_to_end(thumbnail_key)
+        if pixmap is not None: return pixmap
+        pending = self._pending.get(thumbnail_key)
+        if pending:
+            # Repaints ask again while the thumbnail is on its way; one callback per owner is enough.
+            if not any(entry[0] is owner for entry in pending["callbacks"]): pending["callbacks"].append((owner, callback))
+            return None
+        self._pending[thumbnail_key] = {"path": normalized_path, "size": QSize(size), "callbacks": [(owner, callback)]}
+        if normalized_path.lower().endswith(".gif"):
+            if not PILLOW_AVAILABLE: self._pending.pop(thumbnail_key); return None
+            self._gif_thread_pool.start(_GifThumbnailTask(thumbnail_key, normalized_path, size, self._is_pending, self._gif_thumbnail_done))
+        else:
+            # The grab queue merges requests per file, so icons of several sizes share one decoded frame.
+            self.frame_grabber.request(normalized_path, lambda path, image, k=thumbnail_key: self._on_frame_grabbed(k, image), owner=thumbnail_key)
+        return None
+
+    def cancel(self, owner):
+        for thumbnail_key in list(self._pending):
+            callbacks = [entry for entry in self._pending[thumbnail_key]["callbacks"] if entry[0] is not owner]
+            if callbacks:
+                self._pending[thumbnail_key]["callbacks"] = callbacks
+                continue
+            del self._pending[thumbnail_key]
+            self.frame_grabber.cancel(thumbnail_key)
+
+    def _on_frame_grabbed(self, thumbnail_key, image):
+        pending = self._pending.get(thumbnail_key)
+        if pending and not image.isNull():
+            image = image.scaled(pending["size"], Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
+        self._finish_thumbnail(thumbnail_key, image)
+
+    def _finish_thumbnail(self, thumbnail_key, image):
+        pending = self._pending.pop(thumbnail_key, None)
+        if image.isNull():
+            self._failed_keys.add(thumbnail_key)
+            return
+        self.thumbnail_cache.store(thumbnail_key, image)
+        pixmap = QPixmap.fromImage(image)
+        self._remember(thumbnail_key, pixmap)
+        if not pending: return
+        for owner, callback in pending["callbacks"]: callback(pending["path"], pixmap)
+
+    def shutdown(self):
+        self._pending.clear()
+        self._gif_thread_pool.clear()
+        self._gif_thread_pool.waitForDone(2000)
+
+class FolderScanner:
+    """The rules a folder import applies: wallpaper extensions, recursion depth and include/exclude globs.
+
+    max_depth counts folder levels below the root (0 = unlimited). Globs are matched case-insensitively against the
+    entry name and its '/'-separated path relative to the root; excluded folders are not descended into.
+    """
+
+    def __init__(self, root_path, extensions, recursive=False, max_depth=0, include_globs=(), exclude_globs=()):
+        self.root_path = os.path.normpath(root_path); self.extensions = tuple(extensions)
+        self.recursive = recursive; self.max_depth = max_depth
+        self.include_globs = [glob.lower() for glob in include_globs]; self.exclude_globs = [glob.lower() for glob in exclude_globs]
+
+    @staticmethod
+    def _matches_any(globs, name, relative_path):
+        name = name.lower(); relative_path = relative_path.lower()
+        return any(fnmatch.fnmatchcase(name, glob) or fnmatch.fnmatchcase(relative_path, glob) for glob in globs)
+
+    def relative_prefix(self, folder_path):
+        relative_path = os.path.relpath(folder_path, self.root_path)
+        return "" if relative_path == os.curdir else relative_path.replace(os.sep, "/") + "/"
+
+    def iter_folder(self, folder_path, should_stop=None):
+        """Yields (path, (size, mtime_ns)) for matching files and (path, None) for subfolders to descend into, by name.
+
+        Raises OSError when the folder itself cannot be read.
+        """
+        relative_prefix = self.relative_prefix(folder_path)
+        descend = self.recursive and (not self.max_depth or relative_prefix.count("/") < self.max_depth)
+        with os.scandir(folder_path) as folder_entries: entries = sorted(folder_entries, key=lambda entry: entry.name)
+        for entry in entries:
+            if should_stop and should_stop(): return
+            relative_path = relative_prefix + entry.name
+            if self.exclude_globs and self._matches_any(self.exclude_globs, entry.name, relative_path): continue
+            try:
+                # d_type answers is_dir/is_file without a stat; entry.stat() is served from the listing on Windows.
+                if entry.is_dir(follow_symlinks=False):
+                    if descend: yield entry.path, None
+                    continue
+                if not entry.name.lower().endswith(self.extensions) or not entry.is_file(): continue
+                if self.include_globs and not self._matches_any(self.include_globs, entry.name, relative_path): continue
+                stat_result = entry.stat()
+            except OSError: continue
+            yield entry.path, (stat_result.st_size, stat_result.st_mtime_ns)
+
+class FolderImportWorker(QThread):
+    """Walks a folder with a FolderScanner off the GUI thread and streams matching wallpapers back in batches.
+
+    Batches are lists of (path, (size, mtime_ns)) taken from the DirEntry, so receivers need no stat calls of their own.
+    scanned_folders lists every folder read, in case the caller goes on to watch them.
+    """
+    batch_found = pyqtSignal(list)
+    progress = pyqtSignal(int, int)
+    import_finished = pyqtSignal(int, bool)
+    BATCH_SIZE = 500
+    BATCH_INTERVAL_S = 0.1
+
+    def __init__(self, scanner, parent=None):
+        super().__init__(parent)
+        self.scanner = scanner
+        self.scanned_folders = []
+
+    def run(self):
+        batch = []; matched_count = 0
+        last_emit_time = time.monotonic()
+        pending_folders = [self.scanner.root_path]
+        while pending_folders and not self.isInterruptionRequested():
+            folder_path = pending_folders.pop()
+            sub_folders = []
+            try:
+                for entry_path, file_signature in self.scanner.iter_folder(folder_path, self.isInterruptionRequested):
+                    if file_signature is None: sub_folders.append(entry_path); continue
+                    batch.append((entry_path, file_signature))
+                    matched_count += 1
+                    if len(batch) >= self.BATCH_SIZE or time.monotonic() - last_emit_time >= self.BATCH_INTERVAL_S:
+                        self.batch_found.emit(batch); batch = []
+                        self.progress.emit(len(self.scanned_folders) + 1, matched_count)
+                        last_emit_time = time.monotonic()
+            except OSError as e:
+                print(f"Folder import: cannot read '{folder_path}': {e}")
+                continue
+            self.scanned_folders.append(folder_path)
+            # Pushed in reverse so subfolders pop in name order: files come out depth-first, sorted per folder.
+            pending_folders.extend(reversed(sub_folders))
+        if batch: self.batch_found.emit(batch)
+        self.progress.emit(len(self.scanned_folders), matched_count)
+        self.import_finished.emit(matched_count, self.isInterruptionRequested())
+
+class LinkedFolderLister(QThread):
+    """Re-lists changed linked folders with a FolderScanner off the GUI thread; the receiver diffs and applies.
+
+    folder_listed carries (folder, {path: (size, mtime_ns)}, [subfolders]) with normalized paths; folder_unreadable
+    reports a folder that could not be read (usually because it was deleted).
+    """
+    folder_listed = pyqtSignal(str, dict, list)
+    folder_unreadable = pyqtSignal(str)
+
+    def __init__(self, scanner, folder_paths, parent=None):
+        super().__init__(parent)
+        self.scanner = scanner; self.folder_paths = list(folder_paths)
+
+    def run(self):
+        for folder_path in self.folder_paths:
+            if self.isInterruptionRequested(): return
+            try: folder_entries = list(self.scanner.iter_folder(folder_path, self.isInterruptionRequested))
+            except OSError: self.folder_unreadable.emit(folder_path); continue
+            current_files = {os.path.normpath(path): file_signature for path, file_signature in folder_entries if file_signature is not None}
+            current_subfolders = [os.path.normpath(path) for path, file_signature in folder_entries if file_signature is None]
+            self.folder_listed.emit(folder_path, current_files, current_subfolders)
+
+class IndexedPlaylist:
+    """Ordered, duplicate-free wallpaper paths with O(1) membership and O(log n) removal.
+
+    Paths live in a slot array with a dict from normalized path to slot. Removal leaves a tombstone (None) in the
+    slot; while any exist, a Fenwick tree over live slots maps rows to slots and back in O(log n). It is built lazily
+    and the array is compacted once tombstones outnumber live paths. Reads behave like a list (len, [row], iteration,
+    `in`, index), so callers that only read need not know the difference.
+    """
+    COMPACT_MIN_TOMBSTONES = 1024
+
+    def __init__(self, paths=()):
+        self._slots = []; self._keys = []; self._slot_of = {}
+        self._tombstones = 0; self._tree = None
+        self.extend(paths)
+
+    @staticmethod
+    def key(path):
+        return os.path.normpath(path)
+
+    def __len__(self):
+        return len(self._slots) - self._tombstones
+
+    def __bool__(self):
+        return len(self) > 0
+
+    def __contains__(self, path):
+        return isinstance(path, str) and self.key(path) in self._slot_of
+
+    def __iter__(self):
+        return (path for path in self._slots if path is not None)
+
+    def __getitem__(self, row):
+        if isinstance(row, slice): return list(self)[row]
+        if row < 0: row += len(self)
+        if not 0 <= row < len(self): raise IndexError("playlist index out of range")
+        return self._slots[self._slot_of_row(row)]
+
+    def index(self, path):
+        slot = self._slot_of.get(self.key(path))
+        if slot is None: raise ValueError(f"{path!r} is not in the playlist")
+        return self._row_of_slot(slot)
+
+    def _missing_keyed(self, paths):
+        seen_keys = set(); missing_entries = []
+        for path in paths:
+            path_key = self.key(path)
+            if path_key in self._slot_of or path_key in seen_keys: continue
+            seen_keys.add(path_key); missing_entries.append((path, path_key))
+        return missing_entries
+
+    def missing(self, paths):
+        """The paths not yet present, in order and without duplicates among themselves."""
+        return [path for path, _ in self._missing_keyed(paths)]
+
+    def extend(self, paths):
+        added_paths = []
+        for path, path_key in self._missing_keyed(paths):
+            self._slot_of[path_key] = len(self._slots)
+            self._slots.append(path); self._keys.append(path_key)
+            if self._tree is not None: self._tree_append(1)
+            added_paths.append(path)
+        return added_paths
+
+    def reset(self, paths=()):
+        self._slots = []; self._keys = []; self._slot_of = {}
+        self._tombstones = 0; self._tree = None
+        self.extend(paths)
+
+    def remove(self, path):
+        slot = self._slot_of.pop(self.key(path), None)
+        if slot is None: raise ValueError(f"{path!r} is not in the playlist")
+        self._bury(slot)
+        self._compact_if_sparse()
+
+    def remove_rows(self, first_row, last_row):
+        """Removes the contiguous rows first_row..last_row."""
+        slot = self._slot_of_row(first_row); remaining = last_row - first_row + 1
+        while remaining:
+            if self._slots[slot] is not None:
+                del self._slot_of[self._keys[slot]]
+                self._bury(slot); remaining -= 1
+            slot += 1
+        self._compact_if_sparse()
+
+    def move(self, source_row, target_row):
+        """Moves one path so it ends up at target_row: O(log n) for neighbours, O(distance) in general."""
+        if source_row == target_row: return
+        step = 1 if target_row > source_row else -1
+        slot = self._slot_of_row(source_row)
+        for _ in range(abs(target_row - source_row)):
+            next_slot = slot + step
+            while self._slots[next_slot] is None: next_slot += step
+            self._swap_slots(slot, next_slot)
+            slot = next_slot
+
+    def permute(self, new_order):
+        """Reorders so that row i holds the path previously at row new_order[i]."""
+        live_slots = [slot for slot, path in enumerate(self._slots) if path is not None]
+        ordered_slots = [live_slots[old_row] for old_row in new_order]
+        self._slots = [self._slots[slot] for slot in ordered_slots]; self._keys = [self._keys[slot] for slot in ordered_slots]
+        self._slot_of = {path_key: slot for slot, path_key in enumerate(self._keys)}
+        self._tombstones = 0; self._tree = None
+
+    def _swap_slots(self, slot_a, slot_b):
+        self._slots[slot_a], self._slots[slot_b] = self._slots[slot_b], self._slots[slot_a]
+        self._keys[slot_a], self._keys[slot_b] = self._keys[slot_b], self._keys[slot_a]
+        self._slot_of[self._keys[slot_a]] = slot_a; self._slot_of[self._keys[slot_b]] = slot_b
+
+    def _bury(self, slot):
+        self._slots[slot] = None; self._keys[slot] = None
+        self._tombstones += 1
+        if self._tree is not None: self._tree_add(slot, -1)
+
+    def _compact_if_sparse(self):
+        if self._tombstones < max(self.COMPACT_MIN_TOMBSTONES, len(self)): return
+        self.permute(range(len(self)))
+
+    # Fenwick tree over slot liveness (1 = live), 1-based; only consulted while tombstones exist.
+    def _ensure_tree(self):
+        if self._tree is not None: return
+        slot_count = len(self._slots)
+        tree = [0] + [0 if path is None else 1 for path in self._slots]
+        for position in range(1, slot_count + 1):
+            parent_position = position + (position & -position)
+            if parent_position <= slot_count: tree[parent_position] += tree[position]
+        self._tree = tree
+
+    def _tree_add(self, slot, delta):
+        position = slot + 1
+        while position < len(self._tree):
+            self._tree[position] += delta
+            position += position & -position
+
+    def _tree_prefix(self, position):
+        total = 0
+        while position > 0:
+            total += self._tree[position]
+            position -= position & -position
+        return total
+
+    def _tree_append(self, value):
+        position = len(self._tree)
+        self._tree.append(value + self._tree_prefix(position - 1) - self._tree_prefix(position - (position & -position)))
+
+    def _row_of_slot(self, slot):
+        if not self._tombstones: return slot
+        self._ensure_tree()
+        return self._tree_prefix(slot + 1) - 1
+
+    def _slot_of_row(self, row):
+        if not self._tombstones: return row
+        self._ensure_tree()
+        # Binary lifting: the largest position whose prefix holds at most `row` live slots; the next slot is the row.
+        position = 0; remaining = row
+        step = 1 << (len(self._tree) - 1).bit_length()
+        while step:
+            next_position = position + step
+            if next_position < len(self._tree) and self._tree[next_position] <= remaining:
+                position = next_position; remaining -= self._tree[next_position]
+            step >>= 1
+        return position
+
+class ShuffleOrder:
+    """Shuffled play order over playlist rows, drawn one step at a time with an incremental Fisher-Yates.
+
+    The playlist itself is never reordered. Only the rows displaced by earlier swaps are stored, so each step costs
+    O(1) no matter how long the playlist is. A cycle is fully determined by (seed, cycle_size): persisting those plus
+    `position` is enough to resume it exactly, and replaying the same seed repeats the same permutation.
+    Rows appended mid-cycle are played in order after the shuffled ones; rows removed or moved mid-cycle may make
+    the rest of that cycle skip or repeat an item, and the next cycle is exact again.
+    """
+
+    def __init__(self, cycle_size=0, seed=None):
+        self.seed = seed if seed is not None else random.getrandbits(64)
+        self.cycle_size = self.size = cycle_size
+        self._rng = random.Random(self.seed)
+        self._displaced = {}; self._drawn = 0
+        self._lookahead = deque()
+
+    @property
+    def position(self):
+        """Number of steps already taken in this cycle."""
+        return self._drawn - len(self._lookahead)
+
+    def resize(self, size):
+        self.size = size
+
+    def seek(self, position):
+        """Replays the first `position` steps; used once when restoring a saved cycle."""
+        while self.position < position and self._draw() >= 0: self._lookahead.clear()
+
+    def peek(self):
+        """Row of the next step without taking it, or -1 once the cycle is exhausted."""
+        while True:
+            if not self._lookahead and self._draw() < 0: return -1
+            if self._lookahead[0] < self.size: return self._lookahead[0]
+            self._lookahead.popleft()
+
+    def advance(self):
+        """Takes the next step and returns its row, or -1 once the cycle is exhausted."""
+        row = self.peek()
+        if row >= 0: self._lookahead.popleft()
+        return row
+
+    def _draw(self):
+        step = self._drawn
+        if step < self.cycle_size:
+            swap_step = self._rng.randrange(step, self.cycle_size)
+            row = self._displaced.pop(swap_step, swap_step)
+            if swap_step != step: self._displaced[swap_step] = self._displaced.pop(step, step)
+            else: self._displaced.pop(step, None)
+        elif step < self.size: row = step
+        else: return -1
+        self._drawn += 1
+        self._lookahead.append(row)
+        return row
+
+class WeightedPicker:
+    """Weighted random rows of an IndexedPlaylist that skip the last `window` picks, sampled from a Fenwick tree.
+
+    Each row's weight comes from `weight_of(path)`; rows in the no-repeat window weigh 0 until they leave it. A pick,
+    a weight change and a pick leaving the window are O(log n). Appended rows are added in place; removing or moving
+    rows only marks the tree stale, and it is rebuilt in O(n) on the next pick. The window never grows past
+    len(playlist) - 1, so there is always something left to pick.
+    """
+
+    def __init__(self, playlist, weight_of, window=1):
+        self.playlist = playlist; self.weight_of = weight_of; self.window = max(1, window)
+        self.recent = deque()
+        self._weights = []; self._tree = []; self._total = 0.0
+        self._stale = True
+
+    def invalidate(self, *args):
+        self._stale = True
+
+    def rows_inserted(self, parent, first_row, last_row):
+        if self._stale or first_row != len(self._weights): self._stale = True; return
+        for row in range(first_row, last_row + 1): self._append(self._row_weight(row))
+
+    def set_window(self, window):
+        self.window = max(1, window) # The current wallpaper is never picked again.
+        self._trim_recent()
+
+    def refresh(self, path):
+        """Re-reads the weight of `path` after it changed, e.g. when it is (un)marked as a favourite."""
+        if self._stale: return
+        row = self._row_of(path)
+        if row >= 0: self._set(row, self._row_weight(row))
+
+    def pick(self, rng=random):
+        """Returns a weighted random row outside the no-repeat window, or -1 when the playlist is empty."""
+        self._ensure_built()
+        if self._total <= 0: return -1
+        target = rng.random() * self._total
+        row = 0; step = 1 << len(self._tree).bit_length()
+        while step:
+            if row + step <= len(self._tree) and self._tree[row + step - 1] <= target:
+                row += step; target -= self._tree[row - 1]
+            step >>= 1
+        return min(row, len(self._weights) - 1)
+
+    def record(self, path):
+        """Marks `path` as just played: it weighs 0 until `window` newer picks have pushed it out."""
+        key = IndexedPlaylist.key(path)
+        if key in self.recent: self.recent.remove(key)
+        self.recent.append(key)
+        if not self._stale:
+            row = self._row_of(key)
+            if row >= 0: self._set(row, 0.0)
+        self._trim_recent()
+
+    def _trim_recent(self):
+        limit = min(self.window, max(0, len(self.playlist) - 1))
+        while len(self.recent) > limit:
+            key = self.recent.popleft()
+            if self._stale: continue
+            row = self._row_of(key)
+            if row >= 0: self._set(row, self._row_weight(row))
+
+    def _row_of(self, path):
+        try: return self.playlist.index(path)
+        except ValueError: return -1
+
+    def _row_weight(self, row):
+        path = self.playlist[row]
+        return 0.0 if IndexedPlaylist.key(path) in self.recent else float(self.weight_of(path))
+
+    def _ensure_built(self):
+        if not self._stale and len(self._weights) == len(self.playlist): return
+        self._trim_recent()
+        recent_keys = set(self.recent)
+        self._weights = [0.0 if IndexedPlaylist.key(path) in recent_keys else float(self.weight_of(path)) for path in self.playlist]
+        self._tree = self._weights[:]
+        for index in range(1, len(self._tree) + 1):
+            parent = index + (index & -index)
+            if parent <= len(self._tree): self._tree[parent - 1] += self._tree[index - 1]
+        self._total = sum(self._weights)
+        self._stale = False
+
+    def _set(self, row, weight):
+        delta = weight - self._weights[row]
+        if not delta: return
+        self._weights[row] = weight; self._total += delta
+        index = row + 1
+        while index <= len(self._tree):
+            self._tree[index - 1] += delta
+            index += index & -index
+
+    def _append(self, weight):
+        index = len(self._tree) + 1
+        node = weight; child = index - 1; lowest = index - (index & -index)
+        while child > lowest:
+            node += self._tree[child - 1]
+            child -= child & -child
+        self._weights.append(weight); self._tree.append(node); self._total += weight
+
+class PlaylistModel(QAbstractListModel):
+    """Playlist rows over an IndexedPlaylist, for a QListView that only asks for the rows it paints.
+
+    Icons, tooltips and the favourite mark come from provider callables, so nothing is stored per row beyond the path. Changes go through
+    the methods below so views get minimal signals (row ranges inserted/removed/moved, one reset per reload)
+    instead of a rebuild. `paths` is mutated in place and never rebound, so callers may keep a reference to it.
+    """
+
+    def __init__(self, icon_provider=None, tooltip_provider=None, favourite_provider=None, parent=None):
+        super().__init__(parent)
+        self.paths = IndexedPlaylist()
+        self.icon_provider = icon_provider; self.tooltip_provider = tooltip_provider; self.favourite_provider = favourite_provider
+        self._favourite_font = QFont(); self._favourite_font.setBold(True)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.paths)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or not 0 <= index.row() < len(self.paths): return None
+        path = self.paths[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole: return os.path.basename(path)
+        if role == Qt.ItemDataRole.UserRole: return path
+        if role == Qt.ItemDataRole.ToolTipRole and self.tooltip_provider: return self.tooltip_provider(path)
+        if role == Qt.ItemDataRole.DecorationRole and self.icon_provider: return self.icon_provider(path)
+        if role == Qt.ItemDataRole.FontRole and self.favourite_provider and self.favourite_provider(path): return self._favourite_font
+        return None
+
+    def flags(self, index):
+        if index.isValid(): return super().flags(index) | Qt.ItemFlag.ItemIsDragEnabled
+        return super().flags(index) | Qt.ItemFlag.ItemIsDropEnabled
+
+    def supportedDropActions(self):
+        return Qt.DropAction.MoveAction
+
+    def moveRows(self, source_parent, source_row, count, destination_parent, destination_child):
+        if source_parent.isValid() or destination_parent.isValid() or count <= 0: return False
+        if source_row < 0 or source_row + count > len(self.paths) or not 0 <= destination_child <= len(self.paths): return False
+        if not self.beginMoveRows(source_parent, source_row, source_row + count - 1, destination_parent, destination_child): return False
+        if destination_child > source_row:
+            for _ in range(count): self.paths.move(source_row, destination_child - 1)
+        else:
+            for offset in range(count): self.paths.move(source_row + offset, destination_child + offset)
+        self.endMoveRows()
+        return True
+
+    def move_row(self, source_row, target_row):
+        return self.moveRows(QModelIndex(), source_row, 1, QModelIndex(), target_row + 1 if target_row > source_row else target_row)
+
+    def set_paths(self, paths):
+        self.beginResetModel()
+        self.paths.reset(paths)
+        self.endResetModel()
+
+    def append_paths(self, paths):
+        """Appends the paths not already in the playlist; returns how many were added."""
+        new_paths = self.paths.missing(paths)
+        if not new_paths: return 0
+        first_row = len(self.paths)
+        self.beginInsertRows(QModelIndex(), first_row, first_row + len(new_paths) - 1)
+        self.paths.extend(new_paths)
+        self.endInsertRows()
+        return len(new_paths)
+
+    def remove_rows(self, rows):
+        sorted_rows = sorted(row for row in set(rows) if 0 <= row < len(self.paths))
+        removed_count = len(sorted_rows)
+        # One signal per contiguous run, last run first so the earlier row numbers stay valid.
+        while sorted_rows:
+            last_row = first_row = sorted_rows.pop()
+            while sorted_rows and sorted_rows[-1] == first_row - 1: first_row = sorted_rows.pop()
+            self.beginRemoveRows(QModelIndex(), first_row, last_row)
+            self.paths.remove_rows(first_row, last_row)
+            self.endRemoveRows()
+        return removed_count
+
+    def remove_path(self, path):
+        row = self.row_of(path)
+        return self.remove_rows([row]) if row >= 0 else 0
+
+    def row_of(self, path):
+        try: return self.paths.index(path)
+        except ValueError: return -1
+
+    def refresh_path(self, path, role=Qt.ItemDataRole.DecorationRole):
+        row = self.row_of(path)
+        if row >= 0: self.dataChanged.emit(self.index(row), self.index(row), [role])
+
 class WallpaperPlayerWindow(QWidget):
+    LOOP_STATE_IDLE = "Idle"
+    LOOP_STATE_PREROLLING = "Prerolling"
+    LOOP_STATE_READY = "Ready"
+    LOOP_STATE_SWAPPED = "Swapped"
+    LOOP_PREROLL_LEAD_MS = 1500
+
     def __init__(self, main_app_ref):
         super().__init__(); self.main_app = main_app_ref
         self.setWindowFlags(Qt.WindowType.FramelessWindowHint | Qt.WindowType.Tool)
         self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground, False); self.setAttribute(Qt.WidgetAttribute.WA_ShowWithoutActivating)
         self.setStyleSheet("background-color: black;"); self.layout = QVBoxLayout(self); self.layout.setContentsMargins(0,0,0,0)
         
-        self.gif_label = QLabel(self); self.gif_label.setAlignment(Qt.AlignmentFlag.AlignCenter); self.gif_label.hide(); self.layout.addWidget(self.gif_label)
+        # Media objects are built on first use: a GIF window never owns decoders or audio devices,
+        # an MP4 window never owns a QLabel/QMovie, and player B only exists once dual mode prerolls.
+        self.gif_label = None
         self.movie = None
 
-        self.video_widget_a = QVideoWidget(self)
-        self.video_widget_b = QVideoWidget(self)
-        self.video_widget_a.hide(); self.video_widget_b.hide()
-        self.layout.addWidget(self.video_widget_a); self.layout.addWidget(self.video_widget_b)
-        
-        self.player_a = QMediaPlayer()
-        self.player_b = QMediaPlayer()
-        
-        self.audio_output_a = QAudioOutput()
-        self.player_a.setAudioOutput(self.audio_output_a)
-        self.audio_output_b = QAudioOutput()
-        self.player_b.setAudioOutput(self.audio_output_b)
-
-        self.player_a.setVideoOutput(self.video_widget_a)
-        self.player_b.setVideoOutput(self.video_widget_b)
-        
-        self.active_player = self.player_a; self.active_video_widget = self.video_widget_a
+        # Cached GIF engine: frames decoded once by GifFrameDecoder, replayed by a deadline-driven single-shot timer.
+        # GIFs too large for the cache stream through GifStreamDecoder's bounded window instead.
+        self._gif_engine = None
+        self._gif_decoder = None; self._gif_decoders = []
+        self._gif_stream_queue = deque(); self._gif_stream_current = None; self._gif_stream_bytes = 0
+        self._gif_stream_max_frames = 0; self._gif_stream_max_bytes = 0
+        self._gif_frames = []; self._gif_frame_durations = []
+        self._gif_frame_count = None; self._gif_frame_index = -1
+        self._gif_frame_size = None; self._gif_frame_cache_bytes = 0; self._gif_frame_cache_max_bytes = 0
+        self._gif_next_frame_deadline = None; self._gif_waiting_for_frame = False
+        self._gif_frame_timer = QTimer(self)
+        self._gif_frame_timer.setSingleShot(True)
+        self._gif_frame_timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self._gif_frame_timer.timeout.connect(self._advance_gif_frame)
+
+        self.video_widget_a = None; self.video_widget_b = None
+        self.player_a = None; self.player_b = None
+        self.audio_output_a = None; self.audio_output_b = None
+        self.active_player = None; self.active_video_widget = None
         
         self.sound_enabled_for_current_mp4 = False
         self._loop_mp4_path = None 
-        self._swap_initiated = False 
-        self._swap_retry_count = 0 
-        self.MAX_SWAP_RETRIES = 20 
-
-        self.player_a.mediaStatusChanged.connect(lambda s, p=self.player_a: self._handle_mp4_generic_status(s, p))
-        self.player_a.errorOccurred.connect(lambda err, msg, p=self.player_a: self._handle_mp4_error(err, msg, p))
-        self.player_b.mediaStatusChanged.connect(lambda s, p=self.player_b: self._handle_mp4_generic_status(s, p))
-        self.player_b.errorOccurred.connect(lambda err, msg, p=self.player_b: self._handle_mp4_error(err, msg, p))
-        
-        self.player_a.positionChanged.connect(lambda pos: self._handle_mp4_loop_position(pos, self.player_a))
-        self.player_b.positionChanged.connect(lambda pos: self._handle_mp4_loop_position(pos, self.player_b))
+        self._loop_source_url = None
+        self._loop_source_bytes = None
+        self._loop_source_buffers = {}
+        self._loop_state = self.LOOP_STATE_IDLE
+        self._loop_swap_pending = False
+
+        # One-shot wakeup at (duration - lead) replaces per-tick positionChanged inspection.
+        self._preroll_trigger_timer = QTimer(self)
+        self._preroll_trigger_timer.setSingleShot(True)
+        self._preroll_trigger_timer.timeout.connect(self._on_preroll_trigger)
+
+        self.loop_mode = LOOP_MODE_DUAL
+        self.last_seam_gap_ms = None
+        self.frame_rate_cap = 0
+        self.render_scale = 0; self.render_filter = RENDER_FILTER_SMOOTH; self.downscale_required = False
+        self.presented_fps = None
+        self._fps_window_start = None; self._fps_window_frames = 0
+        self._seam_last_frame_start_us = -1
+        self._seam_last_frame_time = None
 
         self.is_paused = False; self.current_file_path = None 
+        self.pending_probe_path = None
         screen_geometry=QApplication.primaryScreen().geometry(); self.setGeometry(screen_geometry)
         self._initial_play_setup_slot_connected_player = None
         self.content_hidden_by_focus_loss = False 
 
     def _get_player_id(self, player_instance):
+        if player_instance is None: return "Unknown"
         if player_instance == self.player_a: return "A"
         if player_instance == self.player_b: return "B"
         return "Unknown"
 
-    def play_gif(self, file_path):
+    def _ensure_video_player(self, player_id):
+        if player_id == "A" and self.player_a: return self.player_a
+        if player_id == "B" and self.player_b: return self.player_b
+
+        # Capping or downscaling needs every frame before it is composited, so those windows paint from their own sink
+        # instead of using a full-resolution QVideoWidget.
+        if self._needs_frame_renderer():
+            video_widget = VideoFrameRenderer(self, self.frame_rate_cap, self._effective_render_scale(), self.render_filter)
+            video_widget.frame_presented.connect(lambda w=video_widget: self._note_presented_frame() if w is self.active_video_widget else None)
+        else:
+            video_widget = QVideoWidget(self)
+        video_widget.hide(); self.layout.addWidget(video_widget)
+        player = QMediaPlayer()
+        player.setVideoOutput(video_widget.videoSink() if isinstance(video_widget, VideoFrameRenderer) else video_widget)
+        player.mediaStatusChanged.connect(lambda s, p=player: self._handle_mp4_generic_status(s, p))
+        player.errorOccurred.connect(lambda err, msg, p=player: self._handle_mp4_error(err, msg, p))
+        player.playbackStateChanged.connect(lambda st, p=player: self._handle_mp4_playback_state(st, p))
+        player.durationChanged.connect(lambda d, p=player: self._arm_preroll_trigger() if p == self.active_player else None)
+        video_widget.videoSink().videoFrameChanged.connect(lambda f, w=video_widget: self._on_video_frame(f, w))
+
+        if player_id == "A": self.player_a = player; self.video_widget_a = video_widget
+        else: self.player_b = player; self.video_widget_b = video_widget
+        if self.main_app: self.main_app.log_msg(f"WPW: Created video player {player_id}.")
+        return player
+
+    def _release_audio_outputs(self):
+        if self.player_a and self.audio_output_a: self.player_a.setAudioOutput(None)
+        if self.player_b and self.audio_output_b: self.player_b.setAudioOutput(None)
+        if self.audio_output_a: self.audio_output_a.deleteLater(); self.audio_output_a = None
+        if self.audio_output_b: self.audio_output_b.deleteLater(); self.audio_output_b = None
+
+    def _teardown_video_pipeline(self):
+        self._preroll_trigger_timer.stop()
+        self._release_audio_outputs()
+        for player in (self.player_a, self.player_b):
+            if not player: continue
+            player.stop(); player.setSource(QUrl()); player.setVideoOutput(None); player.deleteLater()
+        for video_widget in (self.video_widget_a, self.video_widget_b):
+            if not video_widget: continue
+            self.layout.removeWidget(video_widget); video_widget.hide(); video_widget.deleteLater()
+        self._release_loop_source_buffers()
+        self.player_a = None; self.player_b = None
+        self.video_widget_a = None; self.video_widget_b = None
+        self.active_player = None; self.active_video_widget = None
+
+    def _ensure_gif_label(self):
+        if not self.gif_label:
+            self.gif_label = QLabel(self); self.gif_label.setAlignment(Qt.AlignmentFlag.AlignCenter); self.layout.insertWidget(0, self.gif_label)
+        return self.gif_label
+
+    def _teardown_gif_pipeline(self):
+        self._stop_gif_frame_engine()
+        if self.movie: self.movie.stop(); self.movie.deleteLater(); self.movie = None
+        if self.gif_label:
+            self.layout.removeWidget(self.gif_label); self.gif_label.hide(); self.gif_label.deleteLater(); self.gif_label = None
+
+    def _effective_render_scale(self):
+        return self.render_scale or (100 if self.downscale_required else 0)
+
+    def _needs_frame_renderer(self):
+        return bool(self.frame_rate_cap or self._effective_render_scale())
+
+    def _uses_matching_video_output(self):
+        return not self.video_widget_a or isinstance(self.video_widget_a, VideoFrameRenderer) == self._needs_frame_renderer()
+
+    def set_render_options(self, render_scale, render_filter):
+        self.render_scale = render_scale; self.render_filter = render_filter
+        for video_widget in (self.video_widget_a, self.video_widget_b):
+            if isinstance(video_widget, VideoFrameRenderer): video_widget.set_render_options(self._effective_render_scale(), render_filter)
+        return self._uses_matching_video_output()
+
+    def set_frame_rate_cap(self, frame_rate_cap):
+        self.frame_rate_cap = frame_rate_cap
+        self._fps_window_start = None
+        for video_widget in (self.video_widget_a, self.video_widget_b):
+            if isinstance(video_widget, VideoFrameRenderer): video_widget.set_max_fps(frame_rate_cap)
+        return self._uses_matching_video_output()
+
+    def _note_presented_frame(self):
+        now = time.perf_counter()
+        if self._fps_window_start is None:
+            self._fps_window_start = now; self._fps_window_frames = 0
+            return
+        self._fps_window_frames += 1
+        elapsed = now - self._fps_window_start
+        if elapsed >= 2.0:
+            self.presented_fps = self._fps_window_frames / elapsed
+            self._fps_window_start = now; self._fps_window_frames = 0
+            if self.main_app: self.main_app.report_presented_fps(self, self.presented_fps)
+
+    def play_gif(self, file_path, start_paused=False, frame_cache_max_bytes=0, stream_max_frames=0, stream_max_bytes=0, frame_rate_cap=0):
         self.clear_content()
+        self.frame_rate_cap = frame_rate_cap
         self.current_file_path = file_path
         self._loop_mp4_path = None 
 
-        if not self.gif_label: self.gif_label=QLabel(self); self.gif_label.setAlignment(Qt.AlignmentFlag.AlignCenter); self.layout.insertWidget(0, self.gif_label)
-        self.video_widget_a.hide(); self.video_widget_b.hide(); self.gif_label.show()
+        self._teardown_video_pipeline()
+        self._ensure_gif_label().show()
+        self.is_paused = start_paused
+        self._gif_stream_max_frames = stream_max_frames; self._gif_stream_max_bytes = stream_max_bytes
+        if PILLOW_AVAILABLE and frame_cache_max_bytes > 0:
+            self._start_gif_frame_cache(file_path, frame_cache_max_bytes)
+        elif PILLOW_AVAILABLE and stream_max_frames > 0 and stream_max_bytes > 0:
+            self._start_gif_stream(file_path)
+        else:
+            self._start_gif_movie(file_path)
+
+    def _start_gif_movie(self, file_path):
         self.movie=QMovie(file_path);
         if not self.movie.isValid(): self.gif_label.setText(f"Error loading GIF: {os.path.basename(file_path)}"); print(f"QMovie error GIF ({file_path}): {self.movie.lastErrorString()}"); return
-        self.gif_label.setMovie(self.movie); self.movie.setScaledSize(self.size()); self.movie.start(); self.is_paused=False
-
-    def play_mp4(self, file_path, sound_enabled=False):
+        self.gif_label.setMovie(self.movie); self.movie.setScaledSize(self.size()); self.movie.start()
+        if self.is_paused: self.movie.setPaused(True)
+
+    def _start_gif_frame_cache(self, file_path, max_bytes):
+        self._gif_engine = GIF_ENGINE_CACHE
+        self._gif_frame_cache_max_bytes = max_bytes
+        self._gif_frame_size = QSize(self.size())
+        decoder = GifFrameDecoder(file_path, self._gif_frame_size, max_bytes, self)
+        decoder.frame_decoded.connect(self._on_gif_frame_decoded)
+        decoder.decode_finished.connect(self._on_gif_decode_finished)
+        decoder.budget_exceeded.connect(self._on_gif_budget_exceeded)
+        decoder.decode_failed.connect(self._on_gif_decode_failed)
+        decoder.finished.connect(lambda d=decoder: self._forget_gif_decoder(d))
+        self._gif_decoder = decoder
+        self._gif_decoders.append(decoder)
+        decoder.start(QThread.Priority.LowPriority)
+
+    def _start_gif_stream(self, file_path):
+        self._gif_engine = GIF_ENGINE_STREAM
+        self._gif_frame_size = QSize(self.size())
+        decoder = GifStreamDecoder(file_path, self._gif_frame_size, self._gif_stream_max_frames, self._gif_stream_max_bytes, self)
+        decoder.frame_decoded.connect(self._on_gif_stream_frame_decoded)
+        decoder.loop_finished.connect(self._on_gif_stream_loop_finished)
+        decoder.decode_failed.connect(self._on_gif_decode_failed)
+        decoder.finished.connect(lambda d=decoder: self._forget_gif_decoder(d))
+        self._gif_decoder = decoder
+        self._gif_decoders.append(decoder)
+        if self.main_app: self.main_app.log_msg(f"WPW: Streaming GIF {os.path.basename(file_path)} "
+                                                f"(window {self._gif_stream_max_frames} frames / {self._gif_stream_max_bytes / (1024 * 1024):.0f} MB).")
+        decoder.start(QThread.Priority.LowPriority)
+
+    def _stop_gif_frame_engine(self):
+        self._gif_frame_timer.stop()
+        # Retired decoders stop at the next frame boundary; their late signals are ignored via sender().
+        if self._gif_decoder: self._gif_decoder.requestInterruption(); self._gif_decoder = None
+        had_frames = self._gif_engine is not None
+        self._gif_engine = None
+        self._gif_frames = []; self._gif_frame_durations = []
+        self._gif_frame_count = None; self._gif_frame_index = -1
+        self._gif_frame_size = None; self._gif_frame_cache_bytes = 0
+        self._gif_stream_queue.clear(); self._gif_stream_current = None; self._gif_stream_bytes = 0
+        self._gif_next_frame_deadline = None; self._gif_waiting_for_frame = False
+        if had_frames and self.main_app: self.main_app.report_gif_frame_memory()
+
+    def gif_frame_memory_bytes(self):
+        if self._gif_engine == GIF_ENGINE_CACHE: return self._gif_frame_cache_bytes
+        if self._gif_engine == GIF_ENGINE_STREAM: return self._gif_stream_bytes
+        return 0
+
+    def _forget_gif_decoder(self, decoder):
+        if decoder in self._gif_decoders: self._gif_decoders.remove(decoder)
+        # A cache decoder that ran to completion is still current; drop the reference before the QThread is deleted.
+        if decoder is self._gif_decoder: self._gif_decoder = None
+        decoder.deleteLater()
+
+    def _fall_back_to_gif_movie(self):
+        file_path = self.current_file_path
+        self._stop_gif_frame_engine()
+        if file_path and self.gif_label: self._start_gif_movie(file_path)
+
+    def _on_gif_frame_decoded(self, index, image, duration_ms):
+        if self.sender() is not self._gif_decoder: return
+        self._gif_frames.append(QPixmap.fromImage(image))
+        self._gif_frame_durations.append(duration_ms)
+        self._gif_frame_cache_bytes += image.sizeInBytes()
+        if index == 0 or (self._gif_waiting_for_frame and not self.is_paused and index == self._gif_frame_index + 1):
+            self._gif_waiting_for_frame = False
+            self._show_gif_frame(index)
+
+    def _on_gif_decode_finished(self, frame_count):
+        if self.sender() is not self._gif_decoder: return
+        self._gif_frame_count = frame_count
+        if self.main_app:
+            self.main_app.log_msg(f"WPW: Cached {frame_count} GIF frames ({self._gif_frame_cache_bytes / (1024 * 1024):.1f} MB).")
+            self.main_app.report_gif_frame_memory()
+        if self._gif_waiting_for_frame:
+            self._gif_waiting_for_frame = False
+            self._show_gif_frame(0)
+
+    def _on_gif_budget_exceeded(self, needed_bytes):
+        if self.sender() is not self._gif_decoder: return
+        file_path = self.current_file_path
+        can_stream = self._gif_stream_max_frames > 0 and self._gif_stream_max_bytes > 0
+        if self.main_app: self.main_app.log_msg(f"WPW: GIF needs {needed_bytes / (1024 * 1024):.0f} MB of frames, over the cache limit. "
+                                                f"{'Streaming it' if can_stream else 'Using QMovie'}.")
+        if not can_stream or not file_path: self._fall_back_to_gif_movie(); return
+        self._stop_gif_frame_engine()
+        self._start_gif_stream(file_path)
+
+    def _on_gif_stream_frame_decoded(self, image, duration_ms):
+        if self.sender() is not self._gif_decoder: return
+        frame_bytes = image.sizeInBytes()
+        self._gif_stream_queue.append((QPixmap.fromImage(image), duration_ms, frame_bytes))
+        self._gif_stream_bytes += frame_bytes
+        if self._gif_stream_current is None or (self._gif_waiting_for_frame and not self.is_paused):
+            self._gif_waiting_for_frame = False
+            self._advance_gif_stream_frame()
+
+    def _on_gif_stream_loop_finished(self, frame_count):
+        if self.sender() is not self._gif_decoder: return
+        if frame_count == 1:
+            # A still image: keep the one frame on screen and let the decoder go.
+            self._gif_frame_count = 1
+            self._gif_decoder.requestInterruption(); self._gif_decoder = None
+
+    def _advance_gif_stream_frame(self):
+        if not self._gif_stream_queue:
+            self._gif_waiting_for_frame = True # Playhead caught up with the decode window.
+            return
+        next_pixmap, duration_ms, frame_bytes = self._gif_stream_queue.popleft()
+        self._release_gif_stream_frame(self._gif_stream_current)
+        # Frame-rate cap: frames shorter than the cap interval are released unseen and their time folded in.
+        min_frame_interval_ms = self._gif_min_frame_interval_ms()
+        while duration_ms < min_frame_interval_ms and self._gif_stream_queue:
+            skipped_frame = self._gif_stream_queue.popleft()
+            duration_ms += skipped_frame[1]
+            self._release_gif_stream_frame(skipped_frame)
+        self._gif_stream_current = (next_pixmap, duration_ms, frame_bytes)
+        self._present_gif_frame(next_pixmap, duration_ms)
+        if self.main_app: self.main_app.report_gif_frame_memory()
+
+    def _release_gif_stream_frame(self, stream_frame):
+        if not stream_frame: return
+        self._gif_stream_bytes -= stream_frame[2]
+        if self._gif_decoder and not self._gif_decoder.isFinished(): self._gif_decoder.release_frame(stream_frame[2])
+
+    def _gif_min_frame_interval_ms(self):
+        return 1000.0 / self.frame_rate_cap if self.frame_rate_cap else 0.0
+
+    def _on_gif_decode_failed(self, error_text):
+        if self.sender() is not self._gif_decoder: return
+        print(f"WPW ({id(self)}): GIF frame cache failed for {self.current_file_path}: {error_text}")
+        self._fall_back_to_gif_movie()
+
+    def _show_gif_frame(self, index):
+        self._gif_frame_index = index
+        self._present_gif_frame(self._gif_frames[index], self._gif_frame_durations[index])
+
+    def _present_gif_frame(self, pixmap, duration_ms):
+        if self.gif_label: self.gif_label.setPixmap(pixmap)
+        if self.is_paused or self._gif_frame_count == 1: return
+        self._note_presented_frame()
+        now = time.perf_counter()
+        # Schedule against the previous deadline so timer latency does not accumulate; resync after a long stall.
+        due = self._gif_next_frame_deadline
+        if due is None or now - due > 0.25: due = now
+        self._gif_next_frame_deadline = due + duration_ms / 1000.0
+        self._gif_frame_timer.start(max(0, round((self._gif_next_frame_deadline - now) * 1000)))
+
+    def _advance_gif_frame(self):
+        if self.is_paused: return
+        if self._gif_engine == GIF_ENGINE_STREAM: self._advance_gif_stream_frame(); return
+        if not self._gif_frames: return
+        next_index = self._next_gif_frame_index(self._gif_frame_index)
+        if next_index is None:
+            self._gif_waiting_for_frame = True # First loop outran the decoder; frame_decoded resumes playback.
+            return
+        duration_ms = self._gif_frame_durations[next_index]; last_index = next_index
+        # Frame-rate cap: skip frames shorter than the cap interval, keeping their time on the frame shown.
+        min_frame_interval_ms = self._gif_min_frame_interval_ms()
+        while duration_ms < min_frame_interval_ms:
+            following_index = self._next_gif_frame_index(last_index)
+            if following_index is None or following_index == next_index: break
+            last_index = following_index; duration_ms += self._gif_frame_durations[following_index]
+        self._gif_frame_index = last_index
+        self._present_gif_frame(self._gif_frames[next_index], duration_ms)
+
+    def _next_gif_frame_index(self, index):
+        next_index = index + 1
+        if self._gif_frame_count is not None and next_index >= self._gif_frame_count: next_index = 0
+        return next_index if next_index < len(self._gif_frames) else None
+
+    def play_mp4(self, file_path, sound_enabled=False, loop_mode=LOOP_MODE_DUAL, in_memory_max_bytes=0, start_paused=False, frame_rate_cap=0,
+                 render_scale=0, render_filter=RENDER_FILTER_SMOOTH, downscale_required=False):
         self.clear_content() 
+        self.frame_rate_cap = frame_rate_cap
+        self.render_scale = render_scale; self.render_filter = render_filter; self.downscale_required = downscale_required
+        if not self._uses_matching_video_output(): self._teardown_video_pipeline()
+        for video_widget in (self.video_widget_a, self.video_widget_b):
+            if isinstance(video_widget, VideoFrameRenderer):
+                video_widget.set_max_fps(frame_rate_cap); video_widget.set_render_options(self._effective_render_scale(), render_filter)
         self.current_file_path = os.path.normpath(file_path) if file_path else None
         self.sound_enabled_for_current_mp4 = sound_enabled
         self._loop_mp4_path = os.path.normpath(file_path) if file_path else None
+        self._loop_source_url = QUrl.fromLocalFile(self._loop_mp4_path) if self._loop_mp4_path else None
+        self.loop_mode = loop_mode if loop_mode in LOOP_MODE_LABELS else LOOP_MODE_DUAL
 
-        if self.gif_label: self.gif_label.hide()
+        self._teardown_gif_pipeline()
         
-        self.active_player = self.player_a
+        self.active_player = self._ensure_video_player("A")
         self.active_video_widget = self.video_widget_a
-        self.video_widget_b.hide()
+        if self.video_widget_b: self.video_widget_b.hide()
         self.video_widget_a.show()
 
         self._set_player_audio(self.player_a, sound_enabled)
@@ -169,14 +1821,53 @@ class WallpaperPlayerWindow(QWidget):
         
         self.player_a.mediaStatusChanged.connect(self._initial_mp4_play_setup_slot)
         self._initial_play_setup_slot_connected_player = self.player_a
+
+        # Single decoder mode: one pipeline loops itself, player B never gets a source.
+        if self.loop_mode == LOOP_MODE_SINGLE and hasattr(self.player_a, 'setLoops'):
+            self.player_a.setLoops(QMediaPlayer.Loops.Infinite.value)
         
-        if self.current_file_path:
-            self.player_a.setSource(QUrl.fromLocalFile(self.current_file_path))
+        if self._loop_source_url:
+            self._loop_source_bytes = self._read_loop_source_into_memory(self._loop_mp4_path, in_memory_max_bytes)
+            self._set_player_loop_source(self.player_a)
         else:
             print(f"WPW ({id(self)}): play_mp4 called with invalid file_path.")
             self.clear_content()
             return
-        self.is_paused = False
+        self.is_paused = start_paused
+
+    def _read_loop_source_into_memory(self, file_path, max_bytes):
+        if max_bytes <= 0: return None
+        try:
+            if os.path.getsize(file_path) > max_bytes: return None
+        except OSError: return None
+        source_file = QFile(file_path)
+        if not source_file.open(QIODevice.OpenModeFlag.ReadOnly):
+            print(f"WPW ({id(self)}): Could not open {file_path} for in-memory playback: {source_file.errorString()}")
+            return None
+        data = source_file.readAll()
+        source_file.close()
+        if self.main_app: self.main_app.log_msg(f"WPW: Buffered {os.path.basename(file_path)} in memory ({data.size() / (1024 * 1024):.1f} MB).")
+        return data
+
+    def _set_player_loop_source(self, player):
+        player_id = self._get_player_id(player)
+        old_buffer = self._loop_source_buffers.pop(player_id, None)
+        if self._loop_source_bytes is not None:
+            # One QBuffer per player over the shared (implicitly shared, not copied) QByteArray: independent read positions, no disk I/O.
+            source_buffer = QBuffer(self)
+            source_buffer.setData(self._loop_source_bytes)
+            source_buffer.open(QIODevice.OpenModeFlag.ReadOnly)
+            self._loop_source_buffers[player_id] = source_buffer
+            player.setSourceDevice(source_buffer, self._loop_source_url)
+        else:
+            player.setSource(self._loop_source_url)
+        if old_buffer: old_buffer.close(); old_buffer.deleteLater()
+
+    def _release_loop_source_buffers(self):
+        for source_buffer in self._loop_source_buffers.values():
+            source_buffer.close(); source_buffer.deleteLater()
+        self._loop_source_buffers = {}
+        self._loop_source_bytes = None
 
     def _initial_mp4_play_setup_slot(self, status: QMediaPlayer.MediaStatus):
         player_instance = self.sender()
@@ -197,7 +1888,9 @@ class WallpaperPlayerWindow(QWidget):
             except TypeError: pass
             
             player_instance.setPosition(0) 
-            player_instance.play()
+            # A pre-rolled (start_paused) window parks on frame 0 until resume_playback.
+            if self.is_paused: player_instance.pause()
+            else: player_instance.play()
 
         elif status == QMediaPlayer.MediaStatus.EndOfMedia :
              try:
@@ -221,196 +1914,176 @@ class WallpaperPlayerWindow(QWidget):
                 self.main_app.status_label.setText(f"Error loading MP4: {os.path.basename(err_file)}")
 
     def _set_player_audio(self, player, sound_on):
+        if not player: return
         audio_output = player.audioOutput()
+        if sound_on and not audio_output:
+            # Only players that actually play sound open an audio device.
+            audio_output = QAudioOutput()
+            player.setAudioOutput(audio_output)
+            if player == self.player_a: self.audio_output_a = audio_output
+            else: self.audio_output_b = audio_output
         if audio_output: 
             audio_output.setMuted(not sound_on)
             if sound_on: audio_output.setVolume(0.5)
         elif hasattr(player,'setMuted'): 
             player.setMuted(not sound_on)
 
-    def _is_player_visually_ready(self, player: QMediaPlayer) -> bool:
-        if not player: return False
-        status = player.mediaStatus()
-        state = player.playbackState()
-        has_video = player.hasVideo()
+    def _get_standby_player(self, create=False):
+        if self.player_b and self.active_player == self.player_b: return self.player_a
+        if not self.player_b and create and self.player_a: self._ensure_video_player("B")
+        return self.player_b
 
-        if state == QMediaPlayer.PlaybackState.PlayingState and has_video:
-            return True
-        
-        if (status == QMediaPlayer.MediaStatus.LoadedMedia or status == QMediaPlayer.MediaStatus.BufferedMedia) and \
-           state == QMediaPlayer.PlaybackState.PausedState and self.is_paused and has_video: 
-            return True
-            
-        if status == QMediaPlayer.MediaStatus.EndOfMedia and has_video: 
-            return True
-            
-        return False
+    def _get_standby_video_widget(self):
+        if self.video_widget_b and self.active_video_widget == self.video_widget_b: return self.video_widget_a
+        return self.video_widget_b
+
+    def _is_standby_source_current(self, standby_player: QMediaPlayer) -> bool:
+        return self._loop_source_url is not None and standby_player.source() == self._loop_source_url
 
     def _handle_mp4_generic_status(self, status: QMediaPlayer.MediaStatus, player_instance: QMediaPlayer):
         if not player_instance: return
 
-        if status == QMediaPlayer.MediaStatus.LoadedMedia:
-            normalized_loop_path = os.path.normpath(self._loop_mp4_path) if self._loop_mp4_path else ""
-            normalized_player_source = ""
-            if player_instance.source().isValid():
-                normalized_player_source = os.path.normpath(player_instance.source().toLocalFile())
-
-            if player_instance != self.active_player and \
-               self._loop_mp4_path and \
-               player_instance.source().isValid() and \
-               normalized_player_source == normalized_loop_path:
-                if player_instance.playbackState() != QMediaPlayer.PlaybackState.PlayingState and not self.is_paused :
-                    player_instance.play() 
-        
-        elif status == QMediaPlayer.MediaStatus.EndOfMedia and not self.is_paused:
-            if player_instance == self.active_player:
-                normalized_loop_path = os.path.normpath(self._loop_mp4_path) if self._loop_mp4_path else ""
-                normalized_current_path = os.path.normpath(self.current_file_path) if self.current_file_path else ""
-
-                if self._loop_mp4_path and normalized_loop_path == normalized_current_path:
-                    if not self._swap_initiated: 
-                        self._prepare_and_swap_mp4_players(force_swap=True)
-                else:
-                    if self.main_app:
-                         self.main_app.play_next_from_playlist_on_media_end()
-
-    def _handle_mp4_loop_position(self, position: int, player_instance: QMediaPlayer):
-        if self._swap_initiated: return 
-
-        normalized_loop_path = os.path.normpath(self._loop_mp4_path) if self._loop_mp4_path else ""
-        normalized_current_path = os.path.normpath(self.current_file_path) if self.current_file_path else ""
-
-        if player_instance != self.active_player or \
-           not self._loop_mp4_path or \
-           normalized_loop_path != normalized_current_path or \
-           self.is_paused:
+        if player_instance != self.active_player:
+            self._handle_standby_status(status, player_instance)
             return
-        
-        duration = player_instance.duration()
-        if duration > 1000 and position >= duration - 1000: 
-            self._prepare_and_swap_mp4_players(force_swap=False) 
 
-    def _prepare_and_swap_mp4_players(self, force_swap=False):
-        if not self._loop_mp4_path:
-            self._swap_initiated = False 
+        if status == QMediaPlayer.MediaStatus.EndOfMedia and not self.is_paused:
+            if self._loop_source_url is not None:
+                if self.loop_mode == LOOP_MODE_SINGLE:
+                    # Fallback when setLoops is unavailable: seek back, last frame stays on screen meanwhile.
+                    player_instance.setPosition(0)
+                    player_instance.play()
+                else:
+                    self._request_loop_swap()
+            else:
+                if self.main_app:
+                     self.main_app.play_next_from_playlist_on_media_end()
+
+    def _handle_standby_status(self, status: QMediaPlayer.MediaStatus, standby_player: QMediaPlayer):
+        if self.loop_mode != LOOP_MODE_DUAL or self._loop_state != self.LOOP_STATE_PREROLLING: return
+        if not self._is_standby_source_current(standby_player): return
+
+        if status in [QMediaPlayer.MediaStatus.LoadedMedia, QMediaPlayer.MediaStatus.BufferedMedia]:
+            # Pausing a loaded player decodes frame 0 into its sink; the frame signal marks it Ready.
+            if self._loop_swap_pending and not self.is_paused:
+                if standby_player.playbackState() != QMediaPlayer.PlaybackState.PlayingState: standby_player.play()
+            elif standby_player.playbackState() == QMediaPlayer.PlaybackState.StoppedState:
+                standby_player.pause()
+        elif status in [QMediaPlayer.MediaStatus.InvalidMedia, QMediaPlayer.MediaStatus.StalledMedia]:
+            print(f"WPW ({id(self)}): Standby player {self._get_player_id(standby_player)} failed to preroll ({status}).")
+            self._abort_loop_swap()
+
+    def _handle_mp4_playback_state(self, state: QMediaPlayer.PlaybackState, player_instance: QMediaPlayer):
+        if player_instance == self.active_player:
+            if state == QMediaPlayer.PlaybackState.PlayingState: self._arm_preroll_trigger()
+            else: self._preroll_trigger_timer.stop()
             return
-        if self._swap_initiated and not force_swap: 
+        if self._loop_state != self.LOOP_STATE_PREROLLING: return
+        # Stopped while prerolling means the backend dropped the standby pipeline (e.g. an error already reported).
+        if state == QMediaPlayer.PlaybackState.StoppedState and \
+           player_instance.mediaStatus() in [QMediaPlayer.MediaStatus.NoMedia, QMediaPlayer.MediaStatus.InvalidMedia]:
+            self._abort_loop_swap()
+
+    def _arm_preroll_trigger(self):
+        self._preroll_trigger_timer.stop()
+        if self.loop_mode != LOOP_MODE_DUAL or self._loop_source_url is None or self.is_paused: return
+        if self._loop_state not in (self.LOOP_STATE_IDLE, self.LOOP_STATE_SWAPPED): return
+        player = self.active_player
+        if not player or player.playbackState() != QMediaPlayer.PlaybackState.PlayingState: return
+        duration = player.duration()
+        if duration <= 0: return
+        playback_rate = player.playbackRate() or 1.0
+        remaining_ms = (duration - self.LOOP_PREROLL_LEAD_MS - player.position()) / playback_rate
+        self._preroll_trigger_timer.start(max(0, int(remaining_ms)))
+
+    def _on_preroll_trigger(self):
+        if self.is_paused or not self.active_player or \
+           self.active_player.playbackState() != QMediaPlayer.PlaybackState.PlayingState: return
+        self._begin_standby_preroll()
+
+    def _begin_standby_preroll(self):
+        if self._loop_source_url is None or self.loop_mode != LOOP_MODE_DUAL: return
+        if self._loop_state in (self.LOOP_STATE_PREROLLING, self.LOOP_STATE_READY): return
+
+        standby_player = self._get_standby_player(create=True)
+        if not standby_player: return
+        self._set_player_audio(standby_player, False)
+        self._loop_state = self.LOOP_STATE_PREROLLING
+
+        if not self._is_standby_source_current(standby_player) or \
+           standby_player.mediaStatus() in [QMediaPlayer.MediaStatus.NoMedia, QMediaPlayer.MediaStatus.InvalidMedia]:
+            self._set_player_loop_source(standby_player)
+        elif standby_player.mediaStatus() in [QMediaPlayer.MediaStatus.LoadedMedia, QMediaPlayer.MediaStatus.BufferedMedia,
+                                              QMediaPlayer.MediaStatus.EndOfMedia]:
+            standby_player.setPosition(0)
+            self._handle_standby_status(QMediaPlayer.MediaStatus.LoadedMedia, standby_player)
+
+    def _request_loop_swap(self):
+        if self._loop_state == self.LOOP_STATE_READY:
+            self._perform_loop_swap()
             return
-        
-        self._swap_initiated = True 
-        self._swap_retry_count = 0 
-
-        player_that_was_active_when_swap_initiated = self.active_player
-        standby_player = self.player_b if player_that_was_active_when_swap_initiated == self.player_a else self.player_a
-        
-        normalized_loop_path_for_prep = os.path.normpath(self._loop_mp4_path)
-        current_standby_source_path_normalized = ""
-        if standby_player.source().isValid():
-            current_standby_source_path_normalized = os.path.normpath(standby_player.source().toLocalFile())
-        
-        source_needs_setting = (current_standby_source_path_normalized != normalized_loop_path_for_prep or
-                                standby_player.mediaStatus() == QMediaPlayer.MediaStatus.NoMedia or
-                                standby_player.playbackState() == QMediaPlayer.PlaybackState.StoppedState)
-
-        if source_needs_setting:
-            if standby_player.playbackState() != QMediaPlayer.PlaybackState.StoppedState: 
-                standby_player.stop()
-            standby_player.setSource(QUrl.fromLocalFile(self._loop_mp4_path)) 
-        
-        standby_current_status = standby_player.mediaStatus()
-        can_try_play_standby = (
-            standby_current_status == QMediaPlayer.MediaStatus.LoadedMedia or
-            standby_current_status == QMediaPlayer.MediaStatus.BufferedMedia or
-            standby_current_status == QMediaPlayer.MediaStatus.EndOfMedia
-        )
+        self._loop_swap_pending = True
+        if self._loop_state in (self.LOOP_STATE_IDLE, self.LOOP_STATE_SWAPPED):
+            self._begin_standby_preroll()
+        else:
+            standby_player = self._get_standby_player()
+            if standby_player.mediaStatus() in [QMediaPlayer.MediaStatus.LoadedMedia, QMediaPlayer.MediaStatus.BufferedMedia] and \
+               standby_player.playbackState() != QMediaPlayer.PlaybackState.PlayingState and not self.is_paused:
+                standby_player.play()
 
-        if standby_player.playbackState() != QMediaPlayer.PlaybackState.PlayingState and \
-           not self.is_paused and \
-           can_try_play_standby: 
-            standby_player.play()
+    def _perform_loop_swap(self):
+        old_active_player = self.active_player
+        old_active_video_widget = self.active_video_widget
 
-        self._set_player_audio(standby_player, False) 
+        self.active_player = self._get_standby_player()
+        self.active_video_widget = self._get_standby_video_widget()
 
-        delay_for_swap = 250 if not force_swap else 150 
-        QTimer.singleShot(delay_for_swap, lambda p=player_that_was_active_when_swap_initiated: self._perform_actual_swap(p))
+        self.active_video_widget.show()
+        self.active_video_widget.raise_() 
+        old_active_video_widget.hide()
 
-    def _perform_actual_swap(self, expected_player_to_be_active_before_this_swap):
-        if not self._swap_initiated or self.active_player != expected_player_to_be_active_before_this_swap:
-            if self._swap_initiated: self._swap_initiated = False
-            return
+        self._set_player_audio(self.active_player, self.sound_enabled_for_current_mp4)
+        if self.active_player.playbackState() != QMediaPlayer.PlaybackState.PlayingState and not self.is_paused:
+            self.active_player.play()
 
-        if self._swap_retry_count >= self.MAX_SWAP_RETRIES:
-            print(f"WPW ({id(self)}): MAX_SWAP_RETRIES reached for player {self._get_player_id(expected_player_to_be_active_before_this_swap)}. Aborting swap.")
-            self._swap_initiated = False
-            if expected_player_to_be_active_before_this_swap.mediaStatus() == QMediaPlayer.MediaStatus.EndOfMedia:
-                expected_player_to_be_active_before_this_swap.setPosition(0)
-                expected_player_to_be_active_before_this_swap.play()
-            return
+        self._set_player_audio(old_active_player, False)
+        if old_active_player.playbackState() != QMediaPlayer.PlaybackState.StoppedState:
+            old_active_player.stop()
+
+        self._loop_swap_pending = False
+        self._loop_state = self.LOOP_STATE_SWAPPED
+        self._arm_preroll_trigger()
+
+    def _abort_loop_swap(self):
+        swap_was_pending = self._loop_swap_pending
+        self._loop_swap_pending = False
+        self._loop_state = self.LOOP_STATE_IDLE
+        if swap_was_pending and self.active_player and not self.is_paused and \
+           self.active_player.mediaStatus() == QMediaPlayer.MediaStatus.EndOfMedia:
+            # No usable standby: loop the visible player in place rather than freezing on the last frame.
+            self.active_player.setPosition(0)
+            self.active_player.play()
 
-        standby_player = self.player_b if self.active_player == self.player_a else self.player_a
-        standby_video_widget = self.video_widget_b if self.active_video_widget == self.video_widget_a else self.video_widget_a
-        
-        standby_source_local_file = os.path.normpath(standby_player.source().toLocalFile()) if standby_player.source().isValid() else ""
-        normalized_loop_path = os.path.normpath(self._loop_mp4_path) if self._loop_mp4_path else ""
+    def _on_video_frame(self, frame: QVideoFrame, video_widget):
+        if not frame.isValid() or not self._loop_mp4_path: return
 
-        if not standby_player.source().isValid() or standby_source_local_file != normalized_loop_path:
-            print(f"WPW ({id(self)}): Swap critical fail: Standby source incorrect.")
-            self._swap_initiated = False 
+        if video_widget is not self.active_video_widget:
+            if self.loop_mode == LOOP_MODE_DUAL and self._loop_state == self.LOOP_STATE_PREROLLING:
+                self._loop_state = self.LOOP_STATE_READY
+                if self._loop_swap_pending: self._perform_loop_swap()
             return
-
-        if self._is_player_visually_ready(standby_player):
-            old_active_player = self.active_player
-            old_active_video_widget = self.active_video_widget
-            
-            self.active_player = standby_player
-            self.active_video_widget = standby_video_widget
-            
-            old_active_video_widget.hide()
-            self.active_video_widget.show()
-            self.active_video_widget.raise_() 
-
-            self._set_player_audio(self.active_player, self.sound_enabled_for_current_mp4)
-            if self.active_player.playbackState() != QMediaPlayer.PlaybackState.PlayingState and not self.is_paused:
-                self.active_player.play()
-            
-            QTimer.singleShot(150, lambda p=old_active_player: p.stop() if p and p.playbackState() != QMediaPlayer.PlaybackState.StoppedState else None)
-            
-            self._swap_initiated = False 
-            self._swap_retry_count = 0
-            
-            QTimer.singleShot(250, self._prepare_next_loop_instance) 
-        else:
-            self._swap_retry_count += 1
-            
-            standby_current_status = standby_player.mediaStatus()
-            can_try_play_standby_poll = (
-                standby_current_status == QMediaPlayer.MediaStatus.LoadedMedia or
-                standby_current_status == QMediaPlayer.MediaStatus.BufferedMedia or
-                standby_current_status == QMediaPlayer.MediaStatus.EndOfMedia
-            )
-            if can_try_play_standby_poll and \
-                standby_player.playbackState() != QMediaPlayer.PlaybackState.PlayingState and not self.is_paused:
-                standby_player.play()
-
-            QTimer.singleShot(150, lambda p=expected_player_to_be_active_before_this_swap: self._perform_actual_swap(p))
-
-    def _prepare_next_loop_instance(self):
-        if not self._loop_mp4_path or self.is_paused: return 
-
-        standby_player = self.player_b if self.active_player == self.player_a else self.player_a 
-        
-        normalized_loop_path_for_prep = os.path.normpath(self._loop_mp4_path)
-        current_standby_source_path_normalized = os.path.normpath(standby_player.source().toLocalFile()) if standby_player.source().isValid() else ""
-
-        if current_standby_source_path_normalized != normalized_loop_path_for_prep or \
-           standby_player.mediaStatus() == QMediaPlayer.MediaStatus.NoMedia or \
-           standby_player.playbackState() == QMediaPlayer.PlaybackState.StoppedState:
-            standby_player.setSource(QUrl.fromLocalFile(self._loop_mp4_path)) 
-        
-        if standby_player.playbackState() != QMediaPlayer.PlaybackState.PlayingState and not self.is_paused:
-            standby_player.play() 
-
-        self._set_player_audio(standby_player, False)
+        if not isinstance(video_widget, VideoFrameRenderer): self._note_presented_frame()
+
+        start_us = frame.startTime()
+        if start_us < 0: return
+        now = time.perf_counter()
+        # A presentation timestamp going backwards on the visible widget means the loop wrapped.
+        if self._seam_last_frame_time is not None and start_us < self._seam_last_frame_start_us:
+            self.last_seam_gap_ms = (now - self._seam_last_frame_time) * 1000.0
+            if self.main_app and hasattr(self.main_app, 'report_loop_seam_gap'):
+                self.main_app.report_loop_seam_gap(self.last_seam_gap_ms, self.loop_mode)
+        self._seam_last_frame_start_us = start_us
+        self._seam_last_frame_time = now
 
     def _handle_mp4_error(self, error, error_string, player_instance: QMediaPlayer):
         player_id = self._get_player_id(player_instance)
@@ -419,12 +2092,15 @@ class WallpaperPlayerWindow(QWidget):
         player_instance.stop()
         if player_instance == self.active_player and self.main_app and hasattr(self.main_app, 'status_label'):
              self.main_app.status_label.setText(f"MP4 Error: {os.path.basename(src or '')}")
-        self._swap_initiated = False 
+        if player_instance != self.active_player and self._loop_state in (self.LOOP_STATE_PREROLLING, self.LOOP_STATE_READY):
+            self._abort_loop_swap()
 
     def pause_playback(self):
         if self.is_paused: return
         self.is_paused = True
         if self.movie and self.movie.state()==QMovie.MovieState.Running: self.movie.setPaused(True)
+        self._gif_frame_timer.stop(); self._gif_next_frame_deadline = None
+        self._fps_window_start = None
         
         if self.player_a and self.player_a.playbackState() == QMediaPlayer.PlaybackState.PlayingState:
             self.player_a.pause()
@@ -434,26 +2110,28 @@ class WallpaperPlayerWindow(QWidget):
     def resume_playback(self):
         if not self.is_paused: return
         self.is_paused = False
+        self._seam_last_frame_time = None
         if self.movie and self.movie.state()==QMovie.MovieState.Paused: self.movie.setPaused(False)
+        if self._gif_frames and self._gif_frame_index >= 0: self._show_gif_frame(self._gif_frame_index)
+        elif self._gif_stream_current: self._present_gif_frame(self._gif_stream_current[0], self._gif_stream_current[1])
         
         if self.active_player and self.active_player.playbackState() == QMediaPlayer.PlaybackState.PausedState:
             self.active_player.play()
 
-        standby_player = self.player_b if self.active_player == self.player_a else self.player_a
-        if standby_player and standby_player.playbackState() == QMediaPlayer.PlaybackState.PausedState:
-            normalized_loop_path = os.path.normpath(self._loop_mp4_path) if self._loop_mp4_path else ""
-            normalized_standby_source = os.path.normpath(standby_player.source().toLocalFile()) if standby_player.source().isValid() else ""
-            
-            if standby_player.source().isValid() and \
-               self._loop_mp4_path and normalized_standby_source == normalized_loop_path:
-                standby_player.play()
+        # A Ready standby stays parked on frame 0; only a standby already racing to its first frame resumes.
+        standby_player = self._get_standby_player()
+        if self._loop_swap_pending and standby_player and standby_player.playbackState() == QMediaPlayer.PlaybackState.PausedState and \
+           self._is_standby_source_current(standby_player):
+            standby_player.play()
 
     def clear_content(self):
-        self._swap_initiated = False 
-        self._swap_retry_count = 0
+        self._preroll_trigger_timer.stop()
+        self._loop_state = self.LOOP_STATE_IDLE
+        self._loop_swap_pending = False
 
         if self.movie: self.movie.stop(); self.movie.deleteLater(); self.movie=None 
-        if hasattr(self, 'gif_label'): self.gif_label.hide()
+        self._stop_gif_frame_engine()
+        if self.gif_label: self.gif_label.clear(); self.gif_label.hide()
         
         if self._initial_play_setup_slot_connected_player:
             try:
@@ -465,14 +2143,15 @@ class WallpaperPlayerWindow(QWidget):
             
             if self.player_a.mediaStatus() != QMediaPlayer.MediaStatus.NoMedia:
                 self.player_a.stop(); self.player_a.setSource(QUrl())
-            if self.audio_output_a and self.player_a.audioOutput() == self.audio_output_a:
-                self.player_a.setAudioOutput(None) 
+            if hasattr(self.player_a, 'setLoops'): self.player_a.setLoops(QMediaPlayer.Loops.Once.value)
         if self.player_b:
             
             if self.player_b.mediaStatus() != QMediaPlayer.MediaStatus.NoMedia:
                 self.player_b.stop(); self.player_b.setSource(QUrl())
-            if self.audio_output_b and self.player_b.audioOutput() == self.audio_output_b:
-                self.player_b.setAudioOutput(None) 
+        # Dropping the outputs (instead of only detaching them) releases the audio device while idle;
+        # _set_player_audio recreates one for the next MP4 that has sound enabled.
+        self._release_audio_outputs()
+        self._release_loop_source_buffers()
         
         if self.video_widget_a: self.video_widget_a.hide()
         if self.video_widget_b: self.video_widget_b.hide()
@@ -481,7 +2160,15 @@ class WallpaperPlayerWindow(QWidget):
         self.active_video_widget = self.video_widget_a
 
         self._loop_mp4_path = None
+        self._loop_source_url = None
+        self.loop_mode = LOOP_MODE_DUAL
+        self._seam_last_frame_start_us = -1
+        self._seam_last_frame_time = None
+        self._fps_window_start = None; self.presented_fps = None
+        for video_widget in (self.video_widget_a, self.video_widget_b):
+            if isinstance(video_widget, VideoFrameRenderer): video_widget.clear_frame()
         self.current_file_path = None
+        self.pending_probe_path = None
         self.is_paused = False
         self.content_hidden_by_focus_loss = False
 
@@ -509,28 +2196,50 @@ class WallpaperPlayerWindow(QWidget):
 
     def closeEvent(self, event):
         self.stop_and_clear_playback()
-        if self.player_a: self.player_a.deleteLater(); self.player_a = None
-        if self.player_b: self.player_b.deleteLater(); self.player_b = None
-        if self.audio_output_a: self.audio_output_a.deleteLater(); self.audio_output_a = None
-        if self.audio_output_b: self.audio_output_b.deleteLater(); self.audio_output_b = None
+        self._teardown_video_pipeline()
+        self._teardown_gif_pipeline()
+        for decoder in list(self._gif_decoders): decoder.requestInterruption(); decoder.wait()
         super().closeEvent(event)
 
     def resizeEvent(self, event): 
         super().resizeEvent(event)
         if self.movie and self.gif_label and self.gif_label.isVisible(): 
             self.movie.setScaledSize(self.size())
+        elif self._gif_frame_size is not None and self._gif_frame_size != self.size() and self.current_file_path:
+            # Decoded frames are pre-scaled; a new window size needs a fresh decode.
+            file_path, gif_engine, max_bytes = self.current_file_path, self._gif_engine, self._gif_frame_cache_max_bytes
+            self._stop_gif_frame_engine()
+            if gif_engine == GIF_ENGINE_STREAM: self._start_gif_stream(file_path)
+            else: self._start_gif_frame_cache(file_path, max_bytes)
 
 class LiveWallpaperApp(QMainWindow):
     DAYS_OF_WEEK = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
     MAX_RECENT_WALLPAPERS = 5
+    PLAYLIST_PREROLL_LEAD_MS = 5000
+    FAVOURITE_PICK_WEIGHT = 3.0
+    DEFAULT_RANDOM_NO_REPEAT = 5
+    PLAYER_WINDOW_POOL_SIZE = 2
+    _preview_gif_decoded = pyqtSignal(str, QImage)
 
     def __init__(self):
         super().__init__()
         self.workerw_hwnd = None
         self.current_wallpaper_path_single_mode_selection = None; self.current_audio_path = None
         self.bg_audio_player = QMediaPlayer(); self.bg_audio_output = QAudioOutput(); self.bg_audio_player.setAudioOutput(self.bg_audio_output); self.bg_audio_output.setVolume(0.5)
-        self.wallpaper_playlist = []; self.current_playlist_index = -1; self.playlist_timer = QTimer(self); self.playlist_timer.timeout.connect(self.handle_playlist_timer_tick)
+        # wallpaper_playlist is the model's own list: change it through interval_playlist_model, never rebind it.
+        self.interval_playlist_model = PlaylistModel(self._interval_playlist_icon, self._playlist_tooltip, self._is_favourite_wallpaper, self)
+        self.wallpaper_playlist = self.interval_playlist_model.paths; self.current_playlist_index = -1; self.playlist_timer = QTimer(self); self.playlist_timer.timeout.connect(self.handle_playlist_timer_tick)
+        # The schedule modes arm playlist_timer once per period/day boundary, so it must not drift by the coarse 5%.
+        self.playlist_timer.setTimerType(Qt.TimerType.PreciseTimer); self._schedule_boundary = None
+        self.playlist_preroll_timer = QTimer(self); self.playlist_preroll_timer.setSingleShot(True); self.playlist_preroll_timer.timeout.connect(self._preroll_next_playlist_wallpaper)
+        self._prerolled_next = None
         self.is_playlist_active = False; self.interval_play_order = "Manual Order"
+        # Shuffled orders walk play_order over the rows; the playlist keeps the user's order. _resume_interval_playlist
+        # makes the next apply continue from the restored current_playlist_index instead of starting a new cycle.
+        self.play_order = ShuffleOrder(); self._resume_interval_playlist = False
+        # Random Pick: favourites weigh FAVOURITE_PICK_WEIGHT, the last setting_random_no_repeat_window picks weigh 0.
+        self.favourite_wallpapers = set(); self.setting_random_no_repeat_window = self.DEFAULT_RANDOM_NO_REPEAT
+        self.random_picker = WeightedPicker(self.wallpaper_playlist, self._random_pick_weight, self.setting_random_no_repeat_window)
         self.time_of_day_wallpapers = {p:None for p in ["Morning","Afternoon","Evening","Night"]}; self.time_of_day_slots = {"Morning":dt_time(6,0),"Afternoon":dt_time(12,0),"Evening":dt_time(18,0),"Night":dt_time(22,0)}
         self.day_of_week_wallpapers = {d:[] for d in self.DAYS_OF_WEEK}; self.current_day_playlist_indices = {d:-1 for d in self.DAYS_OF_WEEK}; self.last_checked_day_int = -1
         self.recent_wallpapers = deque(maxlen=self.MAX_RECENT_WALLPAPERS); self.tray_engine_pause_resume_action = None; self.app_icon = None
@@ -539,19 +2248,59 @@ class LiveWallpaperApp(QMainWindow):
         self.setting_video_preview_quality = Qt.TransformationMode.SmoothTransformation 
         self.setting_low_spec_mode_enabled = False 
         self.setting_aggressive_gpu_reduction_on_focus_loss = False
+        self.setting_default_loop_mode = LOOP_MODE_DUAL
+        self.wallpaper_loop_modes = {}
+        self.setting_in_memory_loop_max_mb = DEFAULT_IN_MEMORY_LOOP_MAX_MB
+        self.setting_gif_frame_cache_max_mb = DEFAULT_GIF_FRAME_CACHE_MAX_MB
+        self.setting_gif_stream_max_frames = DEFAULT_GIF_STREAM_MAX_FRAMES
+        self.setting_gif_stream_max_mb = DEFAULT_GIF_STREAM_MAX_MB
+        self.setting_frame_rate_cap = 0
+        self.setting_render_scale = 0
+        self.setting_render_filter = RENDER_FILTER_SMOOTH
+        self.setting_folder_import_recursive = False
+        self.setting_folder_import_max_depth = 0
+        self.setting_folder_import_include = ""
+        self.setting_folder_import_exclude = ""
+        self.setting_folder_import_linked = False
+        self._folder_import_worker = None; self._folder_import_path = None
+        self._folder_import_reconcile = False; self._folder_import_found = {}
+        # Linked folder: watched folder -> set of its wallpaper paths we know about; only changed folders are re-listed.
+        self._linked_folder_scanner = None; self._linked_folder_files = {}
+        self._linked_folder_dirty = set(); self._linked_folder_dirty_since = None
+        self._linked_folder_lister = None; self._linked_folder_new_files = {}; self._linked_folder_removed_paths = []
+        self.linked_folder_watcher = QFileSystemWatcher(self)
+        self.linked_folder_watcher.directoryChanged.connect(self._on_linked_folder_changed)
+        self._linked_folder_timer = QTimer(self); self._linked_folder_timer.setSingleShot(True)
+        self._linked_folder_timer.timeout.connect(self._apply_linked_folder_changes)
 
         self.desktop_focus_timer = QTimer(self); self.desktop_focus_timer.timeout.connect(self.check_desktop_focus)
         self.is_desktop_focused = True; self.wallpaper_was_manually_paused = False; self.audio_was_manually_stopped = True; self.audio_was_focus_paused = False
         
-        self._preview_player = None; self._preview_sink = None; self._preview_target_label = None; self._preview_file_path_being_processed = None
+        self._preview_file_path_being_processed = None
+        # GIF previews decode on one worker thread; only the result matching _preview_gif_request is shown.
+        self._preview_gif_request = None
+        self._preview_decode_pool = QThreadPool(self); self._preview_decode_pool.setMaxThreadCount(1)
+        self._preview_gif_decoded.connect(self._on_preview_gif_decoded)
+        self.media_metadata_index = MediaMetadataIndex(os.path.join(os.path.dirname(self.settings_file_path), MEDIA_INDEX_FILE_NAME))
+        self.media_probe_service = MediaProbeService(self.media_metadata_index, self)
+        thumbnail_cache_root = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.CacheLocation) or os.path.dirname(self.settings_file_path)
+        self.thumbnail_cache = ThumbnailCache(os.path.join(thumbnail_cache_root, "thumbnails"), THUMBNAIL_CACHE_MAX_MB * 1024 * 1024)
+        self.frame_grabber = FrameGrabQueue(parent=self)
+        self.frame_grabber.grab_finished.connect(self.report_preview_latency)
+        self.thumbnail_service = ThumbnailService(self.thumbnail_cache, self.frame_grabber, self)
+        self._list_icon_refresh_timer = QTimer(self); self._list_icon_refresh_timer.setSingleShot(True)
+        self._list_icon_refresh_timer.timeout.connect(self._refresh_visible_list_icons)
+        # Icons by normalized path (None while pending or failed), so repaints neither stat files nor re-request.
+        self._interval_playlist_icons = OrderedDict()
+        self.interval_playlist_model.modelReset.connect(self._on_interval_playlist_reset)
         
+        self.player_window_pool = []
         self.active_player_window = None 
         self.transition_player_window = None
         self.opacity_effect_active = None
         self.opacity_effect_transition = None
         self.current_transition_animation = None
 
-        self.interval_playlist_ui_populated = False
         self.dow_playlists_ui_populated = False
 
         self._setup_window_properties(); self._setup_main_ui_layout_with_tabs(); self._setup_tray_icon(); self.load_settings()
@@ -598,6 +2347,7 @@ class LiveWallpaperApp(QMainWindow):
         self._apply_stylesheet() 
         
         self.main_tab_widget = QTabWidget(); self.main_application_layout.addWidget(self.main_tab_widget)
+        self.main_tab_widget.currentChanged.connect(self._schedule_list_icon_refresh)
         
         self.wallpaper_tab_widget = QWidget()
         self.wallpaper_config_tab_layout = QVBoxLayout(self.wallpaper_tab_widget)
@@ -729,11 +2479,43 @@ class LiveWallpaperApp(QMainWindow):
         optimization_layout.addWidget(self.aggressive_gpu_reduction_checkbox)
 
 
-        self.low_spec_mode_checkbox = QCheckBox("Low Spec PC Mode (Limit MP4s to 1080p)")
-        self.low_spec_mode_checkbox.setToolTip("Prevents playback of MP4 videos with height greater than 1080 pixels.")
+        self.low_spec_mode_checkbox = QCheckBox("Low Spec PC Mode (Downscale MP4s above 1080p)")
+        self.low_spec_mode_checkbox.setToolTip("MP4 videos taller than 1080 pixels are rendered at screen resolution instead of full resolution.")
         self.low_spec_mode_checkbox.toggled.connect(self.toggle_low_spec_mode)
         optimization_layout.addWidget(self.low_spec_mode_checkbox)
 
+        frame_rate_cap_layout = QHBoxLayout()
+        frame_rate_cap_label = QLabel("Frame Rate Cap:")
+        self.frame_rate_cap_combo = QComboBox()
+        for frame_rate_cap, frame_rate_cap_text in FRAME_RATE_CAP_LABELS.items():
+            self.frame_rate_cap_combo.addItem(frame_rate_cap_text, frame_rate_cap)
+        self.frame_rate_cap_combo.setCurrentIndex(self.frame_rate_cap_combo.findData(self.setting_frame_rate_cap))
+        self.frame_rate_cap_combo.setToolTip("Limits how many wallpaper frames are presented per second. Extra MP4 and GIF frames are dropped before painting.")
+        self.frame_rate_cap_combo.currentIndexChanged.connect(self.on_frame_rate_cap_changed)
+        self.presented_fps_label = QLabel("Presented FPS: N/A")
+        frame_rate_cap_layout.addWidget(frame_rate_cap_label)
+        frame_rate_cap_layout.addWidget(self.frame_rate_cap_combo)
+        frame_rate_cap_layout.addWidget(self.presented_fps_label)
+        optimization_layout.addLayout(frame_rate_cap_layout)
+
+        render_scale_layout = QHBoxLayout()
+        render_scale_label = QLabel("MP4 Render Resolution:")
+        self.render_scale_combo = QComboBox()
+        for render_scale, render_scale_text in RENDER_SCALE_LABELS.items():
+            self.render_scale_combo.addItem(render_scale_text, render_scale)
+        self.render_scale_combo.setCurrentIndex(self.render_scale_combo.findData(self.setting_render_scale))
+        self.render_scale_combo.setToolTip("Downscales each presented video frame once to the screen (or a fraction of it) instead of compositing it at full resolution.")
+        self.render_scale_combo.currentIndexChanged.connect(self.on_render_options_changed)
+        self.render_filter_combo = QComboBox()
+        for render_filter, render_filter_text in RENDER_FILTER_LABELS.items():
+            self.render_filter_combo.addItem(render_filter_text, render_filter)
+        self.render_filter_combo.setCurrentIndex(self.render_filter_combo.findData(self.setting_render_filter))
+        self.render_filter_combo.currentIndexChanged.connect(self.on_render_options_changed)
+        render_scale_layout.addWidget(render_scale_label)
+        render_scale_layout.addWidget(self.render_scale_combo)
+        render_scale_layout.addWidget(self.render_filter_combo)
+        optimization_layout.addLayout(render_scale_layout)
+
         preview_quality_layout = QHBoxLayout()
         preview_quality_label = QLabel("Video Preview Scaling Quality:")
         self.preview_quality_combo = QComboBox()
@@ -742,6 +2524,71 @@ class LiveWallpaperApp(QMainWindow):
         preview_quality_layout.addWidget(preview_quality_label)
         preview_quality_layout.addWidget(self.preview_quality_combo)
         optimization_layout.addLayout(preview_quality_layout)
+
+        loop_mode_layout = QHBoxLayout()
+        loop_mode_label = QLabel("Default MP4 Loop Engine:")
+        self.default_loop_mode_combo = QComboBox()
+        for loop_mode_key, loop_mode_text in LOOP_MODE_LABELS.items():
+            self.default_loop_mode_combo.addItem(loop_mode_text, loop_mode_key)
+        self.default_loop_mode_combo.setCurrentIndex(self.default_loop_mode_combo.findData(self.setting_default_loop_mode))
+        self.default_loop_mode_combo.setToolTip("Single Decoder keeps one video pipeline alive per wallpaper. Dual Player pre-rolls a second copy for each loop.")
+        self.default_loop_mode_combo.currentIndexChanged.connect(self.on_default_loop_mode_changed)
+        loop_mode_layout.addWidget(loop_mode_label)
+        loop_mode_layout.addWidget(self.default_loop_mode_combo)
+        optimization_layout.addLayout(loop_mode_layout)
+        self.loop_seam_gap_label = QLabel("Last loop seam gap: N/A")
+        optimization_layout.addWidget(self.loop_seam_gap_label)
+
+        in_memory_layout = QHBoxLayout()
+        in_memory_label = QLabel("Play MP4s from memory when smaller than:")
+        self.in_memory_loop_spinbox = QSpinBox()
+        self.in_memory_loop_spinbox.setRange(0, 1024)
+        self.in_memory_loop_spinbox.setSuffix(" MB")
+        self.in_memory_loop_spinbox.setSpecialValueText("Disabled")
+        self.in_memory_loop_spinbox.setValue(self.setting_in_memory_loop_max_mb)
+        self.in_memory_loop_spinbox.setToolTip("Small MP4s are read into RAM once so each loop avoids reopening the file from disk.")
+        self.in_memory_loop_spinbox.valueChanged.connect(self.on_in_memory_loop_limit_changed)
+        in_memory_layout.addWidget(in_memory_label)
+        in_memory_layout.addWidget(self.in_memory_loop_spinbox)
+        optimization_layout.addLayout(in_memory_layout)
+
+        gif_cache_layout = QHBoxLayout()
+        gif_cache_label = QLabel("Cache pre-scaled GIF frames up to:")
+        self.gif_frame_cache_spinbox = QSpinBox()
+        self.gif_frame_cache_spinbox.setRange(0, 4096)
+        self.gif_frame_cache_spinbox.setSuffix(" MB")
+        self.gif_frame_cache_spinbox.setSpecialValueText("Disabled")
+        self.gif_frame_cache_spinbox.setValue(self.setting_gif_frame_cache_max_mb)
+        self.gif_frame_cache_spinbox.setToolTip("GIF frames are decoded and scaled once in the background, then replayed from RAM. Larger GIFs are streamed.")
+        self.gif_frame_cache_spinbox.setEnabled(PILLOW_AVAILABLE)
+        self.gif_frame_cache_spinbox.valueChanged.connect(self.on_gif_frame_cache_limit_changed)
+        gif_cache_layout.addWidget(gif_cache_label)
+        gif_cache_layout.addWidget(self.gif_frame_cache_spinbox)
+        optimization_layout.addLayout(gif_cache_layout)
+
+        gif_stream_layout = QHBoxLayout()
+        gif_stream_label = QLabel("Stream larger GIFs, decoding ahead at most:")
+        self.gif_stream_frames_spinbox = QSpinBox()
+        self.gif_stream_frames_spinbox.setRange(0, 600)
+        self.gif_stream_frames_spinbox.setSuffix(" frames")
+        self.gif_stream_frames_spinbox.setSpecialValueText("Disabled")
+        self.gif_stream_frames_spinbox.setValue(self.setting_gif_stream_max_frames)
+        self.gif_stream_frames_spinbox.setEnabled(PILLOW_AVAILABLE)
+        self.gif_stream_frames_spinbox.valueChanged.connect(self.on_gif_stream_budget_changed)
+        self.gif_stream_mb_spinbox = QSpinBox()
+        self.gif_stream_mb_spinbox.setRange(1, 2048)
+        self.gif_stream_mb_spinbox.setSuffix(" MB")
+        self.gif_stream_mb_spinbox.setValue(self.setting_gif_stream_max_mb)
+        self.gif_stream_mb_spinbox.setEnabled(PILLOW_AVAILABLE)
+        self.gif_stream_mb_spinbox.valueChanged.connect(self.on_gif_stream_budget_changed)
+        gif_stream_layout.addWidget(gif_stream_label)
+        gif_stream_layout.addWidget(self.gif_stream_frames_spinbox)
+        gif_stream_layout.addWidget(self.gif_stream_mb_spinbox)
+        optimization_layout.addLayout(gif_stream_layout)
+        self.gif_frame_memory_label = QLabel("GIF frame memory: 0.0 MB")
+        optimization_layout.addWidget(self.gif_frame_memory_label)
+        self.preview_latency_label = QLabel("Preview latency: N/A")
+        optimization_layout.addWidget(self.preview_latency_label)
         
         optimization_layout.addStretch() 
         optimization_group.setLayout(optimization_layout)
@@ -766,6 +2613,9 @@ class LiveWallpaperApp(QMainWindow):
         self.setting_low_spec_mode_enabled = checked
         self.log_msg(f"Low Spec PC Mode {'enabled' if checked else 'disabled'}.")
         self.save_settings()
+        if checked:
+            # Warm the probe cache so upcoming playlist MP4s load without waiting on a probe.
+            self.media_probe_service.probe_many(p for p in self.wallpaper_playlist if p.lower().endswith(".mp4") and os.path.exists(p))
         if checked and self.active_player_window and self.active_player_window.current_file_path:
             file_ext = os.path.splitext(self.active_player_window.current_file_path)[1].lower()
             if file_ext == ".mp4":
@@ -783,6 +2633,100 @@ class LiveWallpaperApp(QMainWindow):
            self.current_wallpaper_path_single_mode_selection:
             self._update_single_mode_preview(self.current_wallpaper_path_single_mode_selection)
 
+    def on_default_loop_mode_changed(self, index):
+        loop_mode = self.default_loop_mode_combo.itemData(index)
+        if loop_mode not in LOOP_MODE_LABELS: return
+        self.setting_default_loop_mode = loop_mode
+        self.log_msg(f"Default loop engine set to: {LOOP_MODE_LABELS[loop_mode]}")
+        self.save_settings()
+
+    def on_in_memory_loop_limit_changed(self, value):
+        self.setting_in_memory_loop_max_mb = value
+        self.save_settings()
+
+    def on_gif_frame_cache_limit_changed(self, value):
+        self.setting_gif_frame_cache_max_mb = value
+        self.save_settings()
+
+    def on_frame_rate_cap_changed(self, index):
+        frame_rate_cap = self.frame_rate_cap_combo.itemData(index)
+        if frame_rate_cap not in FRAME_RATE_CAP_LABELS: return
+        self.setting_frame_rate_cap = frame_rate_cap
+        self.log_msg(f"Frame rate cap set to: {FRAME_RATE_CAP_LABELS[frame_rate_cap]}")
+        self.presented_fps_label.setText("Presented FPS: N/A")
+        applied_live = True
+        for player_window, _ in self.player_window_pool:
+            if not player_window.set_frame_rate_cap(frame_rate_cap) and player_window is self.active_player_window: applied_live = False
+        if not applied_live: self.status_label.setText("Frame rate cap will apply to the next MP4.")
+        self.save_settings()
+
+    def on_render_options_changed(self, index):
+        render_scale = self.render_scale_combo.currentData(); render_filter = self.render_filter_combo.currentData()
+        if render_scale not in RENDER_SCALE_LABELS or render_filter not in RENDER_FILTER_LABELS: return
+        self.setting_render_scale = render_scale; self.setting_render_filter = render_filter
+        self.log_msg(f"MP4 render resolution set to: {RENDER_SCALE_LABELS[render_scale]}, {RENDER_FILTER_LABELS[render_filter]}")
+        applied_live = True
+        for player_window, _ in self.player_window_pool:
+            if not player_window.set_render_options(render_scale, render_filter) and player_window is self.active_player_window: applied_live = False
+        if not applied_live: self.status_label.setText("Render resolution will apply to the next MP4.")
+        self.save_settings()
+
+    def on_gif_stream_budget_changed(self, value):
+        self.setting_gif_stream_max_frames = self.gif_stream_frames_spinbox.value()
+        self.setting_gif_stream_max_mb = self.gif_stream_mb_spinbox.value()
+        self.save_settings()
+
+    def on_single_loop_mode_changed(self, index):
+        if not self.current_wallpaper_path_single_mode_selection: return
+        normalized_path = os.path.normpath(self.current_wallpaper_path_single_mode_selection)
+        loop_mode = self.single_loop_mode_combo.itemData(index)
+        if loop_mode in LOOP_MODE_LABELS:
+            self.wallpaper_loop_modes[normalized_path] = loop_mode
+        else:
+            self.wallpaper_loop_modes.pop(normalized_path, None)
+        self.save_settings()
+
+    def _sync_single_loop_mode_combo(self):
+        if not hasattr(self, 'single_loop_mode_combo'): return
+        loop_mode = None
+        if self.current_wallpaper_path_single_mode_selection:
+            loop_mode = self.wallpaper_loop_modes.get(os.path.normpath(self.current_wallpaper_path_single_mode_selection))
+        combo_idx = self.single_loop_mode_combo.findData(loop_mode) if loop_mode else 0
+        self.single_loop_mode_combo.blockSignals(True)
+        self.single_loop_mode_combo.setCurrentIndex(max(combo_idx, 0))
+        self.single_loop_mode_combo.blockSignals(False)
+
+    def _get_loop_mode_for_path(self, file_path):
+        if file_path:
+            loop_mode = self.wallpaper_loop_modes.get(os.path.normpath(file_path))
+            if loop_mode in LOOP_MODE_LABELS: return loop_mode
+        return self.setting_default_loop_mode
+
+    def report_gif_frame_memory(self):
+        if not hasattr(self, 'gif_frame_memory_label'): return
+        used_bytes = sum(player_window.gif_frame_memory_bytes() for player_window, _ in self.player_window_pool)
+        label_text = f"GIF frame memory: {used_bytes / (1024 * 1024):.1f} MB"
+        if self.gif_frame_memory_label.text() != label_text: self.gif_frame_memory_label.setText(label_text)
+
+    def report_presented_fps(self, player_window, presented_fps):
+        if player_window is not self.active_player_window or not hasattr(self, 'presented_fps_label'): return
+        convert_ms = getattr(player_window.active_video_widget, 'frame_convert_ms', None)
+        # The per-frame conversion cost is what the capped/downscaled path pays instead of QVideoWidget's GPU path.
+        convert_text = f" ({convert_ms:.1f} ms/frame to convert)" if convert_ms is not None else ""
+        self.presented_fps_label.setText(f"Presented FPS: {presented_fps:.1f}{convert_text}")
+
+    def report_preview_latency(self, normalized_path, latency_ms):
+        latency_stats = self.frame_grabber.latency_stats()
+        self.log_msg(f"Preview frame for {os.path.basename(normalized_path)} in {latency_ms:.0f} ms")
+        if not hasattr(self, 'preview_latency_label'): return
+        self.preview_latency_label.setText(f"Preview latency: {latency_ms:.0f} ms (avg {latency_stats['avg_ms']:.0f} ms over {latency_stats['samples']}), "
+                                           f"player init {latency_stats['player_init_ms']:.1f} ms x{latency_stats['players_created']}")
+
+    def report_loop_seam_gap(self, gap_ms, loop_mode):
+        self.log_msg(f"Loop seam gap: {gap_ms:.1f} ms ({LOOP_MODE_LABELS.get(loop_mode, loop_mode)})")
+        if hasattr(self, 'loop_seam_gap_label'):
+            self.loop_seam_gap_label.setText(f"Last loop seam gap: {gap_ms:.1f} ms ({LOOP_MODE_LABELS.get(loop_mode, loop_mode)})")
+
     def _setup_tray_icon(self):
         self.tray_icon = QSystemTrayIcon(self)
         self.tray_icon.setIcon(self.app_icon) 
@@ -824,6 +2768,7 @@ class LiveWallpaperApp(QMainWindow):
             self.showNormal() 
             self.activateWindow() 
             self.raise_() 
+            self._schedule_list_icon_refresh()
 
     def _create_single_mode_ui(self):
         widget = QWidget()
@@ -861,6 +2806,14 @@ class LiveWallpaperApp(QMainWindow):
         self.sound_checkbox.setChecked(False) 
         options_layout.addWidget(self.sound_checkbox)
         options_layout.addStretch()
+        options_layout.addWidget(QLabel("MP4 Loop Engine:"))
+        self.single_loop_mode_combo = QComboBox()
+        self.single_loop_mode_combo.addItem("Use Default", None)
+        for loop_mode_key, loop_mode_label in LOOP_MODE_LABELS.items():
+            self.single_loop_mode_combo.addItem(loop_mode_label, loop_mode_key)
+        self.single_loop_mode_combo.setToolTip("Loop engine used for this wallpaper. Overrides the default from Application Settings.")
+        self.single_loop_mode_combo.currentIndexChanged.connect(self.on_single_loop_mode_changed)
+        options_layout.addWidget(self.single_loop_mode_combo)
         layout.addLayout(options_layout)
         
         layout.addStretch() 
@@ -880,10 +2833,42 @@ class LiveWallpaperApp(QMainWindow):
         select_folder_button = QPushButton("Load Folder")
         select_folder_button.setToolTip("Load all wallpapers from a folder into the list below.")
         select_folder_button.clicked.connect(self.select_playlist_folder_and_populate_list)
+        self.cancel_folder_import_button = QPushButton("Cancel Import")
+        self.cancel_folder_import_button.clicked.connect(self.cancel_folder_import)
+        self.cancel_folder_import_button.hide()
         folder_select_layout.addWidget(self.playlist_folder_label, 1)
         folder_select_layout.addWidget(select_folder_button)
+        folder_select_layout.addWidget(self.cancel_folder_import_button)
         layout.addLayout(folder_select_layout)
 
+        folder_import_layout = QHBoxLayout()
+        self.folder_import_recursive_checkbox = QCheckBox("Include Subfolders")
+        self.folder_import_recursive_checkbox.setChecked(self.setting_folder_import_recursive)
+        self.folder_import_recursive_checkbox.toggled.connect(self.on_folder_import_options_changed)
+        self.folder_import_depth_spinbox = QSpinBox()
+        self.folder_import_depth_spinbox.setRange(0, 64)
+        self.folder_import_depth_spinbox.setPrefix("Depth: ")
+        self.folder_import_depth_spinbox.setSpecialValueText("Depth: Unlimited")
+        self.folder_import_depth_spinbox.setValue(self.setting_folder_import_max_depth)
+        self.folder_import_depth_spinbox.setEnabled(self.setting_folder_import_recursive)
+        self.folder_import_depth_spinbox.valueChanged.connect(self.on_folder_import_options_changed)
+        self.folder_import_include_edit = QLineEdit(self.setting_folder_import_include)
+        self.folder_import_include_edit.setPlaceholderText("Include globs, e.g. *loop*; nature/*")
+        self.folder_import_include_edit.editingFinished.connect(self.on_folder_import_options_changed)
+        self.folder_import_exclude_edit = QLineEdit(self.setting_folder_import_exclude)
+        self.folder_import_exclude_edit.setPlaceholderText("Exclude globs, e.g. .*; *preview*")
+        self.folder_import_exclude_edit.editingFinished.connect(self.on_folder_import_options_changed)
+        folder_import_layout.addWidget(self.folder_import_recursive_checkbox)
+        folder_import_layout.addWidget(self.folder_import_depth_spinbox)
+        folder_import_layout.addWidget(self.folder_import_include_edit, 1)
+        folder_import_layout.addWidget(self.folder_import_exclude_edit, 1)
+        self.folder_import_linked_checkbox = QCheckBox("Keep Linked")
+        self.folder_import_linked_checkbox.setToolTip("Watch the loaded folder and add or drop wallpapers as files appear or disappear.")
+        self.folder_import_linked_checkbox.setChecked(self.setting_folder_import_linked)
+        self.folder_import_linked_checkbox.toggled.connect(self.on_folder_import_options_changed)
+        folder_import_layout.addWidget(self.folder_import_linked_checkbox)
+        layout.addLayout(folder_import_layout)
+
         add_remove_layout = QHBoxLayout()
         add_files_button = QPushButton("Add File(s) to List")
         add_files_button.setToolTip("Add individual wallpaper files to the list below.")
@@ -899,24 +2884,40 @@ class LiveWallpaperApp(QMainWindow):
 
 
         list_management_layout = QHBoxLayout()
-        self.interval_playlist_listwidget = QListWidget()
-        self.interval_playlist_listwidget.setDragDropMode(QAbstractItemView.DragDropMode.InternalMove)
-        self.interval_playlist_listwidget.setDefaultDropAction(Qt.DropAction.MoveAction) 
-        self.interval_playlist_listwidget.model().rowsMoved.connect(self.sync_wallpaper_playlist_from_listwidget)
-        self.interval_playlist_listwidget.itemSelectionChanged.connect(
-            lambda: self.remove_selected_button.setEnabled(bool(self.interval_playlist_listwidget.selectedItems()))
+        # A view over interval_playlist_model: only painted rows are ever asked for their text, icon or tooltip.
+        self.interval_playlist_view = QListView()
+        self.interval_playlist_view.setUniformItemSizes(True)
+        self.interval_playlist_view.setModel(self.interval_playlist_model)
+        self.interval_playlist_view.setDragDropMode(QAbstractItemView.DragDropMode.InternalMove)
+        self.interval_playlist_view.setDefaultDropAction(Qt.DropAction.MoveAction) 
+        self.interval_playlist_view.setIconSize(QSize(64, 36))
+        self.interval_playlist_model.rowsMoved.connect(self._on_interval_playlist_reordered)
+        for size_signal in (self.interval_playlist_model.rowsInserted, self.interval_playlist_model.rowsRemoved, self.interval_playlist_model.modelReset):
+            size_signal.connect(lambda *args: self.play_order.resize(len(self.wallpaper_playlist)))
+        self.interval_playlist_model.rowsInserted.connect(self.random_picker.rows_inserted)
+        for shift_signal in (self.interval_playlist_model.rowsRemoved, self.interval_playlist_model.rowsMoved, self.interval_playlist_model.modelReset):
+            shift_signal.connect(self.random_picker.invalidate)
+        for edit_signal in (self.interval_playlist_model.rowsInserted, self.interval_playlist_model.rowsRemoved,
+                            self.interval_playlist_model.rowsMoved, self.interval_playlist_model.modelReset):
+            edit_signal.connect(self._on_interval_playlist_edited)
+        self.interval_playlist_view.selectionModel().selectionChanged.connect(
+            lambda: self.remove_selected_button.setEnabled(self.interval_playlist_view.selectionModel().hasSelection())
         )
-        list_management_layout.addWidget(self.interval_playlist_listwidget, 3) 
+        list_management_layout.addWidget(self.interval_playlist_view, 3) 
 
         reorder_buttons_layout = QVBoxLayout()
         move_up_button = QPushButton("Move Up")
         move_up_button.clicked.connect(self.move_interval_playlist_item_up)
         move_down_button = QPushButton("Move Down")
         move_down_button.clicked.connect(self.move_interval_playlist_item_down)
+        favourite_button = QPushButton("Toggle Favourite")
+        favourite_button.setToolTip(f"Favourites are shown in bold and come up {self.FAVOURITE_PICK_WEIGHT:g}x as often in Random Pick.")
+        favourite_button.clicked.connect(self.toggle_favourite_interval_playlist_items)
         clear_list_button = QPushButton("Clear List")
         clear_list_button.clicked.connect(self.clear_interval_playlist)
         reorder_buttons_layout.addWidget(move_up_button)
         reorder_buttons_layout.addWidget(move_down_button)
+        reorder_buttons_layout.addWidget(favourite_button)
         reorder_buttons_layout.addSpacing(20) 
         reorder_buttons_layout.addWidget(clear_list_button)
         reorder_buttons_layout.addStretch()
@@ -944,6 +2945,13 @@ class LiveWallpaperApp(QMainWindow):
         self.interval_play_order_combo.addItems(["Manual Order", "Sequential (Initial Shuffle)", "Shuffle Each Cycle", "Random Pick Each Time"])
         self.interval_play_order_combo.currentIndexChanged.connect(self.set_interval_play_order)
         play_order_layout.addWidget(self.interval_play_order_combo)
+        play_order_layout.addWidget(QLabel("No repeat:"))
+        self.random_no_repeat_spinbox = QSpinBox()
+        self.random_no_repeat_spinbox.setRange(1, 1000)
+        self.random_no_repeat_spinbox.setValue(self.setting_random_no_repeat_window)
+        self.random_no_repeat_spinbox.setToolTip("Random Pick skips the wallpapers shown in the last N changes.")
+        self.random_no_repeat_spinbox.valueChanged.connect(self.on_random_no_repeat_changed)
+        play_order_layout.addWidget(self.random_no_repeat_spinbox)
         settings_row_layout.addWidget(play_order_group)
         layout.addLayout(settings_row_layout)
         
@@ -959,13 +2967,16 @@ class LiveWallpaperApp(QMainWindow):
         
         if self.mode_combo.currentIndex() == 1 and self.wallpaper_playlist: 
             if self.interval_play_order == "Sequential" or self.interval_play_order == "Shuffle Cycle":
-                random.shuffle(self.wallpaper_playlist) 
-            self._populate_interval_listwidget_from_playlist() 
-            self.interval_playlist_ui_populated = True 
+                self._restart_play_order()
             if self.is_playlist_active:
                 self.status_label.setText(f"Play order: {self.interval_play_order}. Restart playlist to apply.")
         self.save_settings()
 
+    def on_random_no_repeat_changed(self, value):
+        self.setting_random_no_repeat_window = value
+        self.random_picker.set_window(value)
+        self.save_settings()
+
     def _update_active_interval_timer(self):
         if self.mode_combo.currentIndex() == 1 and self.is_playlist_active : 
             current_timer_is_active = self.playlist_timer.isActive()
@@ -980,9 +2991,10 @@ class LiveWallpaperApp(QMainWindow):
             new_interval_ms = interval_value * 60 * 1000 
             
             if new_interval_ms > 0:
-                self.playlist_timer.setInterval(new_interval_ms)
                 if current_timer_is_active: 
-                    self.playlist_timer.start()
+                    self._start_playlist_timer(new_interval_ms)
+                else:
+                    self.playlist_timer.setInterval(new_interval_ms)
                 self.status_label.setText(f"Interval updated to {interval_value} {unit.lower().rstrip('s')}.")
                 self.save_settings()
             else:
@@ -1044,6 +3056,8 @@ class LiveWallpaperApp(QMainWindow):
 
             self.dow_list_widgets[day] = QListWidget()
             self.dow_list_widgets[day].setFixedHeight(80) 
+            self.dow_list_widgets[day].setIconSize(QSize(32, 18))
+            self._watch_list_icons(self.dow_list_widgets[day])
             day_layout.addWidget(self.dow_list_widgets[day])
 
             self.dow_clear_buttons[day] = QPushButton(f"Clear {day}'s Wallpapers")
@@ -1060,28 +3074,22 @@ class LiveWallpaperApp(QMainWindow):
     def update_mode_ui(self, index):
         if hasattr(self, 'wallpaper_mode_config_stack'):
             self.wallpaper_mode_config_stack.setCurrentIndex(index)
+        self._schedule_list_icon_refresh()
 
         self.is_playlist_active = (index > 0)
         self.stop_clear_wallpaper_external()
 
         if index != 0: 
-            if self._preview_player: 
-                if self._preview_player.playbackState() != QMediaPlayer.PlaybackState.StoppedState:
-                    self._preview_player.stop()
-                self._preview_player.setSource(QUrl())
-                if self._preview_sink:
-                    self._preview_player.setVideoSink(None) 
+            if hasattr(self, 'single_mode_preview_label'): self.frame_grabber.cancel(self.single_mode_preview_label)
             self._preview_file_path_being_processed = None
+            self._preview_gif_request = None
             if hasattr(self, 'single_mode_preview_label'):
                 self.single_mode_preview_label.setText("Preview N/A for this mode.")
                 self.single_mode_preview_label.setPixmap(QPixmap())
         else: 
             self._update_single_mode_preview(self.current_wallpaper_path_single_mode_selection)
         
-        if index == 1 and not self.interval_playlist_ui_populated:
-            self._populate_interval_listwidget_from_playlist()
-            self.interval_playlist_ui_populated = True
-        elif index == 3 and not self.dow_playlists_ui_populated:
+        if index == 3 and not self.dow_playlists_ui_populated:
             self._populate_dow_listwidgets_from_data()
             # self.dow_playlists_ui_populated is set by _populate_dow_listwidgets_from_data
 
@@ -1133,6 +3141,7 @@ class LiveWallpaperApp(QMainWindow):
         if file_path:
             self.current_wallpaper_path_single_mode_selection = file_path
             self.single_file_label.setText(os.path.basename(file_path))
+            self._sync_single_loop_mode_combo()
             self.apply_button.setEnabled(True)
             self.status_label.setText(f"Single selected: {os.path.basename(file_path)}")
             self._update_single_mode_preview(file_path)
@@ -1140,6 +3149,7 @@ class LiveWallpaperApp(QMainWindow):
         else: 
             self.current_wallpaper_path_single_mode_selection = None
             self.single_file_label.setText("No wallpaper selected")
+            self._sync_single_loop_mode_combo()
             self.apply_button.setEnabled(False)
             self._update_single_mode_preview(None)
             self.save_settings()
@@ -1149,272 +3159,313 @@ class LiveWallpaperApp(QMainWindow):
 
         current_mode_is_single = hasattr(self, 'mode_combo') and self.mode_combo.currentIndex() == 0
 
-        def release_preview_player_resources():
-            if self._preview_player:
-                if self._preview_player.playbackState() != QMediaPlayer.PlaybackState.StoppedState:
-                    self._preview_player.stop()
-                self._preview_player.setSource(QUrl()) 
-                if self._preview_sink:
-                    self._preview_player.setVideoSink(None) 
+        def cancel_pending_preview():
+            self.frame_grabber.cancel(self.single_mode_preview_label)
             self._preview_file_path_being_processed = None
+            self._preview_gif_request = None
 
 
         if not current_mode_is_single or not file_path or not os.path.exists(file_path):
             self.single_mode_preview_label.setText("No wallpaper selected or preview N/A.")
             self.single_mode_preview_label.setPixmap(QPixmap())
-            release_preview_player_resources()
+            cancel_pending_preview()
             return
 
         try:
             preview_width = self.single_mode_preview_label.width() - 10
             preview_height = self.single_mode_preview_label.height() - 10
 
-            if file_path.lower().endswith(".gif") and PILLOW_AVAILABLE:
-                release_preview_player_resources() 
-                pil_image = Image.open(file_path)
-                first_frame = pil_image.convert("RGBA")
-                img_data = first_frame.tobytes("raw", "RGBA")
-                q_image = QImage(img_data, first_frame.width, first_frame.height, QImage.Format.Format_RGBA8888)
-                pixmap = QPixmap.fromImage(q_image)
-                scaled_pixmap = pixmap.scaled(preview_width, preview_height,
-                                              Qt.AspectRatioMode.KeepAspectRatio,
-                                              self.setting_video_preview_quality)
-                self.single_mode_preview_label.setPixmap(scaled_pixmap)
+            thumbnail_key = self._preview_thumbnail_key(file_path, self.single_mode_preview_label)
+            cached_pixmap = self.thumbnail_cache.load(thumbnail_key) if thumbnail_key else None
+            if cached_pixmap:
+                cancel_pending_preview()
+                self.single_mode_preview_label.setPixmap(cached_pixmap)
                 self.single_mode_preview_label.setText("")
+                return
+
+            if file_path.lower().endswith(".gif") and PILLOW_AVAILABLE:
+                cancel_pending_preview() 
+                self.single_mode_preview_label.setText("Loading GIF preview...")
+                self.single_mode_preview_label.setPixmap(QPixmap())
+                request_key = thumbnail_key or os.path.normpath(file_path)
+                self._preview_gif_request = (request_key, file_path, QSize(preview_width, preview_height))
+                resample = GIF_FRAME_RESAMPLE if self.setting_video_preview_quality == Qt.TransformationMode.SmoothTransformation \
+                    else getattr(Image, 'Resampling', Image).NEAREST
+                self._preview_decode_pool.start(_GifThumbnailTask(request_key, file_path, QSize(preview_width, preview_height),
+                                                                  lambda key: self._preview_gif_request is not None and self._preview_gif_request[0] == key,
+                                                                  self._preview_gif_decoded, resample))
             elif file_path.lower().endswith(".mp4"):
                 self._grab_mp4_frame_for_preview(file_path) 
             else: 
-                release_preview_player_resources()
+                cancel_pending_preview()
                 self.single_mode_preview_label.setText("Unsupported for preview.")
                 self.single_mode_preview_label.setPixmap(QPixmap())
         except ImportError:
-            release_preview_player_resources()
+            cancel_pending_preview()
             self.single_mode_preview_label.setText("Preview: Pillow library missing for GIFs.")
             self.single_mode_preview_label.setPixmap(QPixmap())
         except Exception as e:
-            release_preview_player_resources()
+            cancel_pending_preview()
             self.single_mode_preview_label.setText(f"Preview Error:\n{str(e)[:100]}")
             self.single_mode_preview_label.setPixmap(QPixmap())
             print(f"Error previewing {file_path}: {e}")
 
+    def _on_preview_gif_decoded(self, request_key, image):
+        # A newer selection (or a mode switch) replaced the request while the worker was decoding.
+        if not self._preview_gif_request or self._preview_gif_request[0] != request_key: return
+        _, file_path, preview_size = self._preview_gif_request
+        self._preview_gif_request = None
+        if image.isNull():
+            self.single_mode_preview_label.setText("Preview Error:\nCould not decode GIF.")
+            return
+        # Decoding already shrank the frame; this only enlarges GIFs smaller than the label.
+        scaled_pixmap = QPixmap.fromImage(image).scaled(preview_size, Qt.AspectRatioMode.KeepAspectRatio, self.setting_video_preview_quality)
+        self.single_mode_preview_label.setPixmap(scaled_pixmap)
+        self.single_mode_preview_label.setText("")
+        self._store_preview_thumbnail(file_path, self.single_mode_preview_label, scaled_pixmap)
+
+    def _preview_thumbnail_key(self, file_path, target_label):
+        file_signature = media_file_signature(file_path)
+        if not file_signature: return None
+        quality = "smooth" if self.setting_video_preview_quality == Qt.TransformationMode.SmoothTransformation else "fast"
+        return ThumbnailCache.make_key(os.path.normpath(file_path), file_signature, target_label.width() - 10, target_label.height() - 10, quality)
+
+    def _store_preview_thumbnail(self, file_path, target_label, pixmap):
+        thumbnail_key = self._preview_thumbnail_key(file_path, target_label)
+        if not thumbnail_key: return
+        self.thumbnail_cache.store(thumbnail_key, pixmap.toImage())
+        self.media_metadata_index.set_thumbnail_key(os.path.normpath(file_path), media_file_signature(file_path), thumbnail_key)
+
     def _grab_mp4_frame_for_preview(self, file_path):
         if not hasattr(self, 'single_mode_preview_label'): return 
-        
-        self._preview_target_label = self.single_mode_preview_label 
-        self._preview_target_label.setText("Loading MP4 preview...")
-        self._preview_target_label.setPixmap(QPixmap()) 
+        self.single_mode_preview_label.setText("Loading MP4 preview...")
+        self.single_mode_preview_label.setPixmap(QPixmap()) 
         self._preview_file_path_being_processed = file_path 
+        # latest_only: a newer selection replaces this one, even if its file is already loading.
+        self.frame_grabber.request(file_path, self._handle_preview_frame, owner=self.single_mode_preview_label, latest_only=True)
 
-        if not self._preview_player: 
-            self._preview_player = QMediaPlayer()
-            self._preview_sink = QVideoSink()
-            self._preview_player.errorOccurred.connect(self._handle_preview_player_error)
-            self._preview_player.mediaStatusChanged.connect(
-                lambda status, player=self._preview_player: self._handle_preview_media_status_changed_for_player(status, player)
-            )
-        
-        try: self._preview_sink.videoFrameChanged.disconnect(self._handle_preview_frame)
-        except TypeError: pass 
-        self._preview_sink.videoFrameChanged.connect(self._handle_preview_frame)
-        
-        if self._preview_player.videoSink() != self._preview_sink: 
-            self._preview_player.setVideoSink(self._preview_sink)
-
-        if self._preview_player.playbackState() != QMediaPlayer.PlaybackState.StoppedState:
-            self._preview_player.stop() 
-        self._preview_player.setSource(QUrl.fromLocalFile(file_path))
-
-    def _handle_preview_media_status_changed_for_player(self, status, player_instance=None): 
-        if player_instance != self._preview_player or not self._preview_player or \
-           not self._preview_player.source().isValid() or \
-           self._preview_player.source().toLocalFile() != self._preview_file_path_being_processed:
-            return
-
-        if status == QMediaPlayer.MediaStatus.LoadedMedia:
-            self._preview_player.setPosition(1) 
-            self._preview_player.pause() 
-        elif status in [QMediaPlayer.MediaStatus.EndOfMedia, QMediaPlayer.MediaStatus.InvalidMedia, 
-                        QMediaPlayer.MediaStatus.NoMedia, QMediaPlayer.MediaStatus.StalledMedia]:
-            if self._preview_target_label and self._preview_file_path_being_processed: 
-                self._preview_target_label.setText(f"MP4 Preview Error:\nCould not load video frame.")
-            if self._preview_player: self._preview_player.stop()
-            self._preview_file_path_being_processed = None 
-
-    def _handle_preview_frame(self, frame: QVideoFrame):
-        if not self._preview_target_label or not self._preview_player or \
-           (hasattr(self, 'wallpaper_mode_config_stack') and self.wallpaper_mode_config_stack.currentIndex() != 0) or \
-           not (self._preview_player.source().isValid() and self._preview_player.source().toLocalFile() == self._preview_file_path_being_processed):
-            
-            if self._preview_player and self._preview_player.playbackState() != QMediaPlayer.PlaybackState.StoppedState:
-                self._preview_player.stop()
-            try: 
-                if self._preview_sink: self._preview_sink.videoFrameChanged.disconnect(self._handle_preview_frame)
-            except TypeError: pass 
-            return
-
-        if not frame.isValid(): return
-
-        video_image = frame.toImage()
-        if not video_image.isNull():
-            pixmap = QPixmap.fromImage(video_image)
-            preview_width = self._preview_target_label.width() - 10 
-            preview_height = self._preview_target_label.height() - 10
-            scaled_pixmap = pixmap.scaled(preview_width, preview_height, 
-                                          Qt.AspectRatioMode.KeepAspectRatio, 
-                                          self.setting_video_preview_quality)
-            self._preview_target_label.setPixmap(scaled_pixmap)
-            self._preview_target_label.setText("") 
-        
-        if self._preview_player and self._preview_player.playbackState() != QMediaPlayer.PlaybackState.StoppedState:
-            self._preview_player.stop()
-        try: 
-            if self._preview_sink: self._preview_sink.videoFrameChanged.disconnect(self._handle_preview_frame)
-        except TypeError: pass
+    def _handle_preview_frame(self, normalized_path, image):
+        file_path = self._preview_file_path_being_processed
+        if not file_path or os.path.normpath(file_path) != normalized_path: return
         self._preview_file_path_being_processed = None
-
-    def _handle_preview_player_error(self, error, error_string=""):
-        current_preview_path = self._preview_file_path_being_processed 
-        print(f"Preview Player Error: {error} - {error_string} for {current_preview_path}")
-        if self._preview_target_label and current_preview_path: 
-            err_msg = error_string if error_string else QMediaPlayer.Error(error).name 
-            self._preview_target_label.setText(f"MP4 Preview Error:\n{err_msg[:100]}")
-        if self._preview_player: self._preview_player.stop() 
-        self._preview_file_path_being_processed = None 
-
-    def _is_mp4_resolution_acceptable(self, file_path):
-        self.log_msg(f"Low Spec Mode: Checking resolution for {os.path.basename(file_path)}")
-        resolution = QSize() 
-        loop = QEventLoop()
-
-        check_player = QMediaPlayer()
-        temp_sink = QVideoSink() 
-        check_player.setVideoSink(temp_sink)
-
-        connection_status_changed = None
-        connection_error_occurred = None
-
-        def on_status_changed(status):
-            nonlocal resolution 
-            if status == QMediaPlayer.MediaStatus.LoadedMedia:
-                meta_res = check_player.metaData().value(QMediaMetaData.Key.Resolution)
-                if isinstance(meta_res, QSize) and meta_res.isValid():
-                    resolution = meta_res
-                    self.log_msg(f"Low Spec Mode (MetaData): Resolution {resolution.width()}x{resolution.height()}")
-                    loop.quit()
-                    return
-
-                if hasattr(check_player, 'videoTracks') and callable(check_player.videoTracks):
-                    video_track_list = check_player.videoTracks()
-                    if video_track_list:
-                        frame_size = video_track_list[0].frameSize()
-                        if frame_size.isValid():
-                            resolution = frame_size
-                            self.log_msg(f"Low Spec Mode (videoTracks): Resolution {resolution.width()}x{resolution.height()}")
-                            loop.quit()
-                            return
-                
-                self.log_msg(f"Low Spec Mode: Resolution not found via MetaData/videoTracks for {os.path.basename(file_path)} on LoadedMedia.")
-                loop.quit() 
-
-            elif status in [QMediaPlayer.MediaStatus.InvalidMedia, QMediaPlayer.MediaStatus.NoMedia, QMediaPlayer.MediaStatus.StalledMedia]:
-                self.log_msg(f"Low Spec Mode: Media problem ({status}) for {os.path.basename(file_path)} during check.")
-                loop.quit()
-
-        def on_error(error_code, error_string): 
-            self.log_msg(f"Low Spec Mode: Player error ({error_string}) during check for {os.path.basename(file_path)}.")
-            loop.quit()
-
-        connection_status_changed = check_player.mediaStatusChanged.connect(on_status_changed)
-        connection_error_occurred = check_player.errorOccurred.connect(on_error)
-        check_player.setSource(QUrl.fromLocalFile(file_path))
-
-        timeout_timer = QTimer()
-        timeout_timer.setSingleShot(True)
-        timeout_timer.timeout.connect(loop.quit) 
-        timeout_timer.start(3000) 
-
-        loop.exec() 
-        timeout_timer.stop() 
-        
-        if connection_status_changed:
-            try: check_player.mediaStatusChanged.disconnect(connection_status_changed)
-            except TypeError: pass 
-        if connection_error_occurred:
-            try: check_player.errorOccurred.disconnect(connection_error_occurred)
-            except TypeError: pass
-        
-        check_player.stop() 
-        check_player.setVideoSink(None) 
-        check_player.setSource(QUrl())   
-        check_player.deleteLater()
-        temp_sink.deleteLater()
-
-        if not resolution.isValid(): 
-            self.log_msg(f"Low Spec Mode: Failed to determine resolution for {os.path.basename(file_path)}. Allowing playback.")
-            return True 
-
-        if resolution.height() > 1080: 
-            self.log_msg(f"Low Spec Mode: Video {os.path.basename(file_path)} resolution ({resolution.width()}x{resolution.height()}) exceeds 1080p height. Blocking.")
+        if hasattr(self, 'wallpaper_mode_config_stack') and self.wallpaper_mode_config_stack.currentIndex() != 0: return
+        if image.isNull():
+            self.single_mode_preview_label.setText("MP4 Preview Error:\nCould not load video frame.")
+            return
+        preview_width = self.single_mode_preview_label.width() - 10 
+        preview_height = self.single_mode_preview_label.height() - 10
+        scaled_pixmap = QPixmap.fromImage(image).scaled(preview_width, preview_height, 
+                                                        Qt.AspectRatioMode.KeepAspectRatio, 
+                                                        self.setting_video_preview_quality)
+        self.single_mode_preview_label.setPixmap(scaled_pixmap)
+        self.single_mode_preview_label.setText("") 
+        self._store_preview_thumbnail(file_path, self.single_mode_preview_label, scaled_pixmap)
+
+    def _mp4_needs_downscale(self, file_path, media_info):
+        height = media_info.get("height", 0)
+        if not height:
+            self.log_msg(f"Low Spec Mode: Failed to determine resolution for {os.path.basename(file_path)}. Playing at full resolution.")
             return False
-        
-        self.log_msg(f"Low Spec Mode: Video {os.path.basename(file_path)} resolution OK ({resolution.width()}x{resolution.height()}).")
-        return True
+        if height > 1080:
+            self.log_msg(f"Low Spec Mode: Video {os.path.basename(file_path)} resolution ({media_info.get('width', 0)}x{height}) exceeds 1080p height. Downscaling.")
+            return True
+        return False
+
+    def _on_load_probe_finished(self, player_window, file_path, media_info):
+        # Superseded if the window was cleared or handed another file while the probe ran.
+        if player_window.pending_probe_path != file_path: return
+        self._load_content_into_player(player_window, file_path, start_paused=player_window.is_paused)
 
     def select_playlist_folder_and_populate_list(self):
         folder_path = QFileDialog.getExistingDirectory(self, "Select Wallpaper Folder", os.path.expanduser("~"))
-        if folder_path:
-            self.wallpaper_playlist = [] 
-            valid_extensions = ('.gif', '.mp4') 
-            
-            try: file_list = sorted(os.listdir(folder_path)) 
-            except OSError: self.status_label.setText("Error reading folder contents."); return
+        if folder_path: self._start_folder_import(folder_path)
+
+    @staticmethod
+    def _split_globs(glob_text):
+        return [glob.strip() for glob in glob_text.replace(",", ";").split(";") if glob.strip()]
+
+    def on_folder_import_options_changed(self, *args):
+        self.setting_folder_import_recursive = self.folder_import_recursive_checkbox.isChecked()
+        self.setting_folder_import_max_depth = self.folder_import_depth_spinbox.value()
+        self.setting_folder_import_include = self.folder_import_include_edit.text().strip()
+        self.setting_folder_import_exclude = self.folder_import_exclude_edit.text().strip()
+        self.setting_folder_import_linked = self.folder_import_linked_checkbox.isChecked()
+        self.folder_import_depth_spinbox.setEnabled(self.setting_folder_import_recursive)
+        if not self.setting_folder_import_linked: self._unlink_playlist_folder()
+        elif not self._linked_folder_scanner and not self._folder_import_worker and self._folder_import_path and os.path.isdir(self._folder_import_path):
+            self._start_folder_import(self._folder_import_path, reconcile=True)
+        self.save_settings()
 
-            for item in file_list:
-                if item.lower().endswith(valid_extensions):
-                    self.wallpaper_playlist.append(os.path.join(folder_path, item))
-            
-            if self.wallpaper_playlist: 
-                if self.interval_play_order == "Sequential" or self.interval_play_order == "Shuffle Cycle":
-                    random.shuffle(self.wallpaper_playlist) 
-            
-            self._populate_interval_listwidget_from_playlist()
-            self.interval_playlist_ui_populated = True 
-            self.playlist_folder_label.setText(os.path.basename(folder_path) if folder_path else "No folder selected")
-            self.apply_button.setEnabled(len(self.wallpaper_playlist) > 0)
-            self.status_label.setText(f"Loaded {len(self.wallpaper_playlist)} items. Order: {self.interval_play_order}")
-            self.save_settings()
+    def _start_folder_import(self, folder_path, reconcile=False):
+        """Imports folder_path into the interval playlist; reconcile=True instead diffs the folder against the current list."""
+        # A running import is superseded: it stops at its next entry and its late signals are ignored via sender().
+        if self._folder_import_worker: self._folder_import_worker.requestInterruption()
+        self._unlink_playlist_folder()
+        self._folder_import_reconcile = reconcile; self._folder_import_found = {}
+        if not reconcile: self.interval_playlist_model.set_paths([])
+        scanner = FolderScanner(folder_path, ('.gif', '.mp4'), self.setting_folder_import_recursive, self.setting_folder_import_max_depth,
+                                self._split_globs(self.setting_folder_import_include), self._split_globs(self.setting_folder_import_exclude))
+        worker = FolderImportWorker(scanner, self)
+        worker.batch_found.connect(self._on_folder_import_batch)
+        worker.progress.connect(self._on_folder_import_progress)
+        worker.import_finished.connect(self._on_folder_import_finished)
+        worker.finished.connect(worker.deleteLater)
+        self._folder_import_worker = worker
+        self._folder_import_path = folder_path
+        self.playlist_folder_label.setText(os.path.basename(folder_path) if folder_path else "No folder selected")
+        self.cancel_folder_import_button.show()
+        self.status_label.setText(f"Importing {os.path.basename(folder_path)}...")
+        worker.start(QThread.Priority.LowPriority)
+
+    def cancel_folder_import(self):
+        if self._folder_import_worker: self._folder_import_worker.requestInterruption()
+
+    def _on_folder_import_batch(self, batch):
+        if self.sender() is not self._folder_import_worker: return
+        if self._folder_import_reconcile:
+            self._folder_import_found.update((os.path.normpath(path), file_signature) for path, file_signature in batch)
+            return
+        self.interval_playlist_model.append_paths(path for path, _ in batch)
+        for path, file_signature in batch: self.media_probe_service.probe(path, file_signature=file_signature)
+        self.apply_button.setEnabled(True)
+
+    def _on_folder_import_progress(self, scanned_folders, matched_count):
+        if self.sender() is not self._folder_import_worker: return
+        self.status_label.setText(f"Importing {os.path.basename(self._folder_import_path)}: {matched_count} file(s) in {scanned_folders} folder(s)...")
+
+    def _on_folder_import_finished(self, matched_count, cancelled):
+        worker = self.sender()
+        if worker is not self._folder_import_worker: return
+        self._folder_import_worker = None
+        self.cancel_folder_import_button.hide()
+        if self._folder_import_reconcile:
+            if cancelled: self.status_label.setText("Linked folder check cancelled."); return
+            # Changes made while the app was closed: one scan at startup, then only watcher-driven updates.
+            root_prefix = os.path.join(worker.scanner.root_path, "")
+            stale_paths = [path for path in self.wallpaper_playlist
+                           if os.path.normpath(path).startswith(root_prefix) and os.path.normpath(path) not in self._folder_import_found]
+            new_files = {path: file_signature for path, file_signature in self._folder_import_found.items() if path not in self.wallpaper_playlist}
+            self._apply_linked_folder_diff(new_files, stale_paths)
+        elif self.interval_play_order == "Sequential" or self.interval_play_order == "Shuffle Cycle":
+            self._restart_play_order()
+        self._folder_import_found = {}
+        if self.setting_folder_import_linked and not cancelled: self._link_playlist_folder(worker.scanner, worker.scanned_folders)
+        self.apply_button.setEnabled(len(self.wallpaper_playlist) > 0)
+        if not self._folder_import_reconcile:
+            if cancelled: self.status_label.setText(f"Import cancelled. Kept {len(self.wallpaper_playlist)} items. Order: {self.interval_play_order}")
+            else: self.status_label.setText(f"Loaded {len(self.wallpaper_playlist)} items. Order: {self.interval_play_order}")
+        self.save_settings()
+
+    def _link_playlist_folder(self, scanner, scanned_folders):
+        self._linked_folder_scanner = scanner
+        self._linked_folder_files = {os.path.normpath(folder_path): set() for folder_path in scanned_folders}
+        for path in self.wallpaper_playlist:
+            folder_files = self._linked_folder_files.get(os.path.dirname(os.path.normpath(path)))
+            if folder_files is not None: folder_files.add(os.path.normpath(path))
+        failed_paths = self.linked_folder_watcher.addPaths(list(self._linked_folder_files))
+        if failed_paths: self.log_msg(f"Linked folder: could not watch {len(failed_paths)} of {len(self._linked_folder_files)} folders.")
+        self.log_msg(f"Linked folder: watching {scanner.root_path} ({len(self._linked_folder_files)} folders).")
+
+    def _unlink_playlist_folder(self):
+        watched_paths = self.linked_folder_watcher.directories()
+        if watched_paths: self.linked_folder_watcher.removePaths(watched_paths)
+        self._linked_folder_scanner = None; self._linked_folder_files = {}
+        self._linked_folder_dirty = set(); self._linked_folder_dirty_since = None
+        self._linked_folder_timer.stop()
+        if self._linked_folder_lister: self._linked_folder_lister.requestInterruption(); self._linked_folder_lister = None
+
+    def _on_linked_folder_changed(self, folder_path):
+        self._linked_folder_dirty.add(os.path.normpath(folder_path))
+        # Debounced: a burst of events (a copy of many files) becomes one update, but a steady stream still lands every 5 s.
+        now = time.monotonic()
+        if self._linked_folder_dirty_since is None: self._linked_folder_dirty_since = now
+        if now - self._linked_folder_dirty_since < 5.0: self._linked_folder_timer.start(500)
+
+    def _forget_linked_folder_tree(self, folder_path):
+        folder_prefix = os.path.join(folder_path, "")
+        gone_folders = [path for path in self._linked_folder_files if path == folder_path or path.startswith(folder_prefix)]
+        gone_files = []
+        for gone_folder in gone_folders: gone_files.extend(self._linked_folder_files.pop(gone_folder))
+        watched_paths = set(self.linked_folder_watcher.directories())
+        still_watched = [path for path in gone_folders if path in watched_paths]
+        if still_watched: self.linked_folder_watcher.removePaths(still_watched)
+        return gone_files
+
+    def _apply_linked_folder_changes(self):
+        if not self._linked_folder_scanner: self._linked_folder_dirty = set(); self._linked_folder_dirty_since = None; return
+        # One listing at a time: folders that change meanwhile stay dirty and go out when it finishes.
+        if self._linked_folder_lister: return
+        dirty_folders = [path for path in sorted(self._linked_folder_dirty) if path in self._linked_folder_files]
+        self._linked_folder_dirty = set(); self._linked_folder_dirty_since = None
+        if not dirty_folders: return
+        lister = LinkedFolderLister(self._linked_folder_scanner, dirty_folders, self)
+        lister.folder_listed.connect(self._on_linked_folder_listed)
+        lister.folder_unreadable.connect(self._on_linked_folder_unreadable)
+        lister.finished.connect(lambda l=lister: self._on_linked_folder_lister_finished(l))
+        self._linked_folder_lister = lister
+        self._linked_folder_new_files = {}; self._linked_folder_removed_paths = []
+        lister.start(QThread.Priority.LowPriority)
+
+    def _on_linked_folder_listed(self, folder_path, current_files, current_subfolders):
+        if self.sender() is not self._linked_folder_lister: return
+        known_files = self._linked_folder_files.get(folder_path)
+        if known_files is None: return
+        self._linked_folder_removed_paths.extend(path for path in known_files if path not in current_files)
+        self._linked_folder_new_files.update((path, file_signature) for path, file_signature in current_files.items() if path not in known_files)
+        self._linked_folder_files[folder_path] = set(current_files)
+        tracked_subfolders = [path for path in self._linked_folder_files if os.path.dirname(path) == folder_path]
+        for subfolder_path in tracked_subfolders:
+            if subfolder_path not in current_subfolders: self._linked_folder_removed_paths.extend(self._forget_linked_folder_tree(subfolder_path))
+        for subfolder_path in current_subfolders:
+            if subfolder_path in self._linked_folder_files: continue
+            # A new subfolder starts out empty, so listing it next adds everything already copied into it.
+            self._linked_folder_files[subfolder_path] = set()
+            self.linked_folder_watcher.addPath(subfolder_path)
+            self._linked_folder_dirty.add(subfolder_path)
+
+    def _on_linked_folder_unreadable(self, folder_path):
+        if self.sender() is not self._linked_folder_lister: return
+        if folder_path in self._linked_folder_files: self._linked_folder_removed_paths.extend(self._forget_linked_folder_tree(folder_path))
+
+    def _on_linked_folder_lister_finished(self, lister):
+        lister.deleteLater()
+        if lister is not self._linked_folder_lister: return
+        self._linked_folder_lister = None
+        new_files, removed_paths = self._linked_folder_new_files, self._linked_folder_removed_paths
+        self._linked_folder_new_files = {}; self._linked_folder_removed_paths = []
+        if new_files or removed_paths: self._apply_linked_folder_diff(new_files, removed_paths)
+        if self._linked_folder_dirty: self._linked_folder_timer.start(0)
+
+    def _apply_linked_folder_diff(self, new_files, removed_paths):
+        removed_rows = [row for row in map(self.interval_playlist_model.row_of, removed_paths) if row >= 0]
+        if self.current_playlist_index >= 0:
+            self.current_playlist_index -= sum(1 for row in removed_rows if row < self.current_playlist_index)
+        self.interval_playlist_model.remove_rows(removed_rows)
+        self.interval_playlist_model.append_paths(new_files)
+        for path, file_signature in new_files.items(): self.media_probe_service.probe(path, file_signature=file_signature)
+        self.apply_button.setEnabled(len(self.wallpaper_playlist) > 0)
+        self.log_msg(f"Linked folder: {len(new_files)} added, {len(removed_rows)} removed.")
+        self.status_label.setText(f"Linked folder updated: +{len(new_files)} / -{len(removed_rows)} ({len(self.wallpaper_playlist)} items).")
+        self.save_settings()
 
     def add_files_to_interval_playlist(self):
         files, _ = QFileDialog.getOpenFileNames(self, "Add Wallpaper(s) to Interval Playlist", 
                                                 os.path.expanduser("~"), 
                                                 "Media Files (*.gif *.mp4);;All Files (*)")
         if files:
-            added_count = 0
-            for f_path in files:
-                if f_path not in self.wallpaper_playlist: 
-                    self.wallpaper_playlist.append(f_path)
-                    item = QListWidgetItem(os.path.basename(f_path))
-                    item.setData(Qt.ItemDataRole.UserRole, f_path) 
-                    self.interval_playlist_listwidget.addItem(item)
-                    added_count +=1
+            new_files = self.wallpaper_playlist.missing(files)
+            added_count = self.interval_playlist_model.append_paths(new_files)
             if added_count > 0:
+                self.media_probe_service.probe_many(new_files)
                 self.apply_button.setEnabled(True) 
                 self.status_label.setText(f"{added_count} file(s) added.")
-                self.interval_playlist_ui_populated = True 
                 self.save_settings()
 
     def remove_selected_from_interval_playlist(self):
-        selected_items_widgets = self.interval_playlist_listwidget.selectedItems()
-        if not selected_items_widgets: return
+        selected_indexes = self.interval_playlist_view.selectionModel().selectedRows()
+        if not selected_indexes: return
 
-        rows_to_remove = sorted([self.interval_playlist_listwidget.row(item) for item in selected_items_widgets], reverse=True)
-        
-        removed_count = 0
-        for row in rows_to_remove:
-            if 0 <= row < len(self.wallpaper_playlist): 
-                removed_path = self.wallpaper_playlist.pop(row) 
-                self.interval_playlist_listwidget.takeItem(row) 
-                removed_count +=1
+        removed_count = self.interval_playlist_model.remove_rows(index.row() for index in selected_indexes)
         
         if removed_count > 0:
             self.status_label.setText(f"Removed {removed_count} item(s).")
@@ -1424,65 +3475,143 @@ class LiveWallpaperApp(QMainWindow):
             self.save_settings()
 
     def move_interval_playlist_item_up(self):
-        current_row = self.interval_playlist_listwidget.currentRow()
+        current_row = self.interval_playlist_view.currentIndex().row()
         if current_row > 0: 
-            item_widget = self.interval_playlist_listwidget.takeItem(current_row)
-            self.interval_playlist_listwidget.insertItem(current_row - 1, item_widget)
-            self.interval_playlist_listwidget.setCurrentRow(current_row - 1) 
-            self.sync_wallpaper_playlist_from_listwidget() 
+            # moveRows keeps the current index on the moved row; rowsMoved triggers _on_interval_playlist_reordered.
+            self.interval_playlist_model.move_row(current_row, current_row - 1)
 
     def move_interval_playlist_item_down(self):
-        current_row = self.interval_playlist_listwidget.currentRow()
-        if 0 <= current_row < self.interval_playlist_listwidget.count() - 1: 
-            item_widget = self.interval_playlist_listwidget.takeItem(current_row)
-            self.interval_playlist_listwidget.insertItem(current_row + 1, item_widget)
-            self.interval_playlist_listwidget.setCurrentRow(current_row + 1) 
-            self.sync_wallpaper_playlist_from_listwidget() 
+        current_row = self.interval_playlist_view.currentIndex().row()
+        if 0 <= current_row < self.interval_playlist_model.rowCount() - 1: 
+            self.interval_playlist_model.move_row(current_row, current_row + 1)
             
     def clear_interval_playlist(self):
-        self.wallpaper_playlist.clear()
-        self.interval_playlist_listwidget.clear()
+        self._unlink_playlist_folder()
+        self.interval_playlist_model.set_paths([])
         self.current_playlist_index = -1 
         self.apply_button.setEnabled(False)
         if self.is_playlist_active and self.mode_combo.currentIndex() == 1: 
             self.stop_clear_wallpaper_external()
         self.status_label.setText("Interval playlist cleared.")
-        self.interval_playlist_ui_populated = True 
         self.save_settings()
 
-    def sync_wallpaper_playlist_from_listwidget(self):
-        updated_playlist = []
-        for i in range(self.interval_playlist_listwidget.count()):
-            item = self.interval_playlist_listwidget.item(i)
-            full_path = item.data(Qt.ItemDataRole.UserRole) 
-            if full_path and os.path.exists(full_path):
-                updated_playlist.append(full_path)
-            elif full_path: 
-                print(f"Warning: File '{full_path}' in list no longer exists during sync.")
-            else: 
-                print(f"Warning: List item '{item.text()}' missing full path data during sync.")
+    def toggle_favourite_interval_playlist_items(self):
+        selected_indexes = self.interval_playlist_view.selectionModel().selectedRows()
+        if not selected_indexes: return
+        for index in selected_indexes:
+            path = self.wallpaper_playlist[index.row()]
+            self.favourite_wallpapers ^= {IndexedPlaylist.key(path)}
+            self.random_picker.refresh(path)
+            self.interval_playlist_model.refresh_path(path, Qt.ItemDataRole.FontRole)
+        self.status_label.setText(f"Toggled favourite on {len(selected_indexes)} item(s).")
+        self.save_settings()
+
+    def _is_favourite_wallpaper(self, file_path):
+        return IndexedPlaylist.key(file_path) in self.favourite_wallpapers
+
+    def _random_pick_weight(self, file_path):
+        return self.FAVOURITE_PICK_WEIGHT if self._is_favourite_wallpaper(file_path) else 1.0
 
-        self.wallpaper_playlist = updated_playlist
+    def _restart_play_order(self):
+        self.play_order = ShuffleOrder(len(self.wallpaper_playlist))
+
+    def _on_interval_playlist_reordered(self, *args):
         self.current_playlist_index = -1 
         self.status_label.setText("Playlist order updated from UI.")
-        self.interval_playlist_ui_populated = True 
         self.save_settings() 
 
-    def _populate_interval_listwidget_from_playlist(self):
-        if not hasattr(self, 'interval_playlist_listwidget'): return 
-        self.log_msg("Populating interval playlist UI.")
-        self.interval_playlist_listwidget.clear()
-        temp_valid_playlist = [] 
-        for path in self.wallpaper_playlist:
-            if os.path.exists(path):
-                item = QListWidgetItem(os.path.basename(path))
-                item.setData(Qt.ItemDataRole.UserRole, path) 
-                self.interval_playlist_listwidget.addItem(item)
-                temp_valid_playlist.append(path)
-            else:
-                print(f"Warning: File '{path}' from saved playlist not found. Skipping from UI list.")
-        self.wallpaper_playlist = temp_valid_playlist 
-        
+    def _on_interval_playlist_edited(self, *args):
+        # A pre-rolled interval wallpaper was chosen from the old rows; pick again from the edited playlist.
+        if not self._prerolled_next or self._prerolled_next["mode_index"] != 1: return
+        self._discard_prerolled_next_wallpaper()
+        self._arm_playlist_preroll()
+
+    def _interval_playlist_icon(self, file_path):
+        if not hasattr(self, 'interval_playlist_view'): return None
+        path_key = os.path.normpath(file_path)
+        if path_key in self._interval_playlist_icons:
+            self._interval_playlist_icons.move_to_end(path_key)
+            return self._interval_playlist_icons[path_key]
+        pixmap = self.thumbnail_service.request(file_path, self.interval_playlist_view.iconSize(), self.interval_playlist_model,
+                                                self._on_interval_playlist_icon_ready)
+        self._remember_interval_playlist_icon(path_key, pixmap)
+        return pixmap
+
+    def _on_interval_playlist_icon_ready(self, normalized_path, pixmap):
+        self._remember_interval_playlist_icon(normalized_path, pixmap)
+        self.interval_playlist_model.refresh_path(normalized_path)
+
+    def _remember_interval_playlist_icon(self, path_key, pixmap):
+        self._interval_playlist_icons[path_key] = pixmap
+        self._interval_playlist_icons.move_to_end(path_key)
+        while len(self._interval_playlist_icons) > ThumbnailService.MEMORY_CACHE_ENTRIES: self._interval_playlist_icons.popitem(last=False)
+
+    def _on_interval_playlist_reset(self):
+        self.thumbnail_service.cancel(self.interval_playlist_model)
+        self._interval_playlist_icons.clear()
+        # New contents: a row restored from the last session no longer means anything (load_settings restores after this).
+        self._resume_interval_playlist = False; self.current_playlist_index = -1
+
+    def _playlist_tooltip(self, file_path):
+        media_description = self._describe_media(self.media_probe_service.cached_info(file_path))
+        tooltip = f"{file_path}\n{media_description}" if media_description else file_path
+        return f"{tooltip}\nFavourite" if self._is_favourite_wallpaper(file_path) else tooltip
+
+    def _make_playlist_item(self, file_path):
+        item = QListWidgetItem(os.path.basename(file_path))
+        item.setData(Qt.ItemDataRole.UserRole, file_path)
+        self._apply_media_tooltip(item, file_path)
+        return item
+
+    def _watch_list_icons(self, list_widget):
+        # Icons are requested only for rows in view; clearing the list drops whatever it still had queued.
+        list_widget.verticalScrollBar().valueChanged.connect(self._schedule_list_icon_refresh)
+        list_widget.model().rowsInserted.connect(self._schedule_list_icon_refresh)
+        list_widget.model().rowsMoved.connect(self._schedule_list_icon_refresh)
+        list_widget.model().modelReset.connect(lambda w=list_widget: self.thumbnail_service.cancel(w))
+
+    def _schedule_list_icon_refresh(self, *args):
+        if not self._list_icon_refresh_timer.isActive(): self._list_icon_refresh_timer.start(60)
+
+    def _visible_list_rows(self, list_widget, prefetch_rows=10):
+        row_count = list_widget.count()
+        if not row_count: return range(0)
+        first_row = list_widget.indexAt(QPoint(0, 0)).row()
+        last_row = list_widget.indexAt(QPoint(0, list_widget.viewport().height() - 1)).row()
+        if first_row < 0: first_row = 0
+        if last_row < 0: last_row = row_count - 1
+        return range(first_row, min(row_count, last_row + 1 + prefetch_rows))
+
+    def _refresh_visible_list_icons(self):
+        for list_widget in getattr(self, 'dow_list_widgets', {}).values():
+            if not list_widget.isVisible(): continue
+            for row in self._visible_list_rows(list_widget):
+                item = list_widget.item(row)
+                item_path = item.data(Qt.ItemDataRole.UserRole)
+                if not item_path or not item.icon().isNull(): continue
+                pixmap = self.thumbnail_service.request(item_path, list_widget.iconSize(), list_widget,
+                                                        lambda path, pixmap, w=list_widget: self._apply_list_icon(w, path, pixmap))
+                if pixmap is not None: item.setIcon(QIcon(pixmap))
+
+    def _apply_list_icon(self, list_widget, normalized_path, pixmap):
+        # Rows may have moved or scrolled away since the request; anything off-screen picks the icon up from the cache later.
+        for row in self._visible_list_rows(list_widget):
+            item = list_widget.item(row)
+            item_path = item.data(Qt.ItemDataRole.UserRole)
+            if item_path and os.path.normpath(item_path) == normalized_path: item.setIcon(QIcon(pixmap))
+
+    def _describe_media(self, media_info):
+        if not media_info: return ""
+        details = []
+        if media_info.get("width") and media_info.get("height"): details.append(f"{media_info['width']}x{media_info['height']}")
+        if media_info.get("duration_ms"): details.append(f"{media_info['duration_ms'] / 1000:.1f} s")
+        if media_info.get("frame_rate"): details.append(f"{media_info['frame_rate']:.0f} fps")
+        if media_info.get("video_codec"): details.append(media_info["video_codec"])
+        return " | ".join(details)
+
+    def _apply_media_tooltip(self, item, file_path):
+        item.setToolTip(self._playlist_tooltip(file_path))
+
     def set_time_of_day_wallpaper(self, period):
         file_path, _ = QFileDialog.getOpenFileName(self, f"Select Wallpaper for {period}", 
                                                  os.path.expanduser("~"), 
@@ -1506,7 +3635,7 @@ class LiveWallpaperApp(QMainWindow):
             if day_name in self.dow_list_widgets and self.dow_playlists_ui_populated : 
                 self.dow_list_widgets[day_name].clear() 
                 for file_path_item in self.day_of_week_wallpapers[day_name]:
-                    self.dow_list_widgets[day_name].addItem(os.path.basename(file_path_item))
+                    self.dow_list_widgets[day_name].addItem(self._make_playlist_item(file_path_item))
             
             self.apply_button.setEnabled(True) 
             self.status_label.setText(f"{len(files)} WP(s) added to {day_name}.")
@@ -1532,7 +3661,7 @@ class LiveWallpaperApp(QMainWindow):
                 valid_paths_for_ui = []
                 for p in paths:
                     if os.path.exists(p):
-                        self.dow_list_widgets[day].addItem(os.path.basename(p))
+                        self.dow_list_widgets[day].addItem(self._make_playlist_item(p))
                         valid_paths_for_ui.append(p)
                     else:
                         print(f"Warning: File '{p}' for DOW '{day}' not found. Skipping from UI.")
@@ -1599,13 +3728,13 @@ class LiveWallpaperApp(QMainWindow):
         if self.current_transition_animation and self.current_transition_animation.state() == QPropertyAnimation.State.Running:
             self.current_transition_animation.stop() 
             if self.transition_player_window: 
-                self.transition_player_window.close()
-                self.transition_player_window.deleteLater()
+                self._release_player_window(self.transition_player_window)
                 self.transition_player_window = None
             if self.active_player_window and self.opacity_effect_active : 
                 self.opacity_effect_active.setOpacity(1.0)
 
         self.playlist_timer.stop() 
+        self._discard_prerolled_next_wallpaper()
         self.status_label.setText("Applying wallpaper...")
         QApplication.processEvents() 
 
@@ -1619,17 +3748,18 @@ class LiveWallpaperApp(QMainWindow):
         if mode_index == 0: 
             new_wallpaper_path = path_to_play_if_single
         elif mode_index == 1: 
-            if not self.interval_playlist_ui_populated: 
-                self._populate_interval_listwidget_from_playlist()
-                self.interval_playlist_ui_populated = True
             if self.wallpaper_playlist:
-                if self.interval_play_order == "Sequential" or self.interval_play_order == "Shuffle Each Cycle":
-                    random.shuffle(self.wallpaper_playlist) 
-                    self._populate_interval_listwidget_from_playlist() 
-                self.current_playlist_index = 0 
-                if self.wallpaper_playlist: 
-                    new_wallpaper_path = self.wallpaper_playlist[0]
-                else: self.status_label.setText("Interval playlist is empty."); return
+                resume_row = self.current_playlist_index if self._resume_interval_playlist else -1
+                self._resume_interval_playlist = False
+                if not 0 <= resume_row < len(self.wallpaper_playlist):
+                    if self.interval_play_order == "Sequential" or self.interval_play_order == "Shuffle Cycle":
+                        self._restart_play_order()
+                        resume_row = self.play_order.advance()
+                    elif self.interval_play_order == "Random Pick": resume_row = self.random_picker.pick()
+                    else: resume_row = 0
+                    self.current_playlist_index = resume_row
+                new_wallpaper_path = self.wallpaper_playlist[resume_row]
+                if self.interval_play_order == "Random Pick": self.random_picker.record(new_wallpaper_path)
             else: self.status_label.setText("Interval playlist is empty."); return
         elif mode_index == 2: 
             new_wallpaper_path = self._get_current_time_of_day_wallpaper_path()
@@ -1654,46 +3784,79 @@ class LiveWallpaperApp(QMainWindow):
         player.setWindowOpacity(0.0) 
         return player, opacity_effect
 
-    def _transition_to_wallpaper(self, new_path, mode_index_for_timer_restart):
-        if self.current_transition_animation and self.current_transition_animation.state() == QPropertyAnimation.State.Running:
-            self.current_transition_animation.stop()
-            if self.transition_player_window:
-                self.transition_player_window.close() 
-                self.transition_player_window.deleteLater()
-                self.transition_player_window = None
-
-
-        if self.transition_player_window: 
-            self.transition_player_window.stop_and_clear_playback()
-            self.transition_player_window.close()
-            self.transition_player_window.deleteLater()
-        
-        self.transition_player_window, self.opacity_effect_transition = self._create_and_setup_player_window()
-        
-        self.transition_player_window.setWindowOpacity(0.0) 
-        self.transition_player_window.show() 
+    def _create_parented_player_window(self, show_window=True):
+        player_window, opacity_effect = self._create_and_setup_player_window()
+        player_window.setWindowOpacity(0.0) 
+        if show_window: player_window.show() 
 
-        player_hwnd_int_trans = self.transition_player_window.winId()
-        if not player_hwnd_int_trans: 
+        player_hwnd_int = player_window.winId()
+        if not player_hwnd_int: 
             self.status_label.setText("Error: New WP window has no ID.")
-            if self.transition_player_window:
-                self.transition_player_window.close(); self.transition_player_window.deleteLater()
-            self.transition_player_window = None; return
+            player_window.close(); player_window.deleteLater()
+            return None, None
             
-        player_hwnd_trans = wintypes.HWND(int(player_hwnd_int_trans))
+        player_hwnd = wintypes.HWND(int(player_hwnd_int))
         
-        if not set_wallpaper_parent(player_hwnd_trans, self.workerw_hwnd):
+        if not set_wallpaper_parent(player_hwnd, self.workerw_hwnd):
             self.status_label.setText("Error parenting new WP window.")
-            if self.transition_player_window:
-                self.transition_player_window.close(); self.transition_player_window.deleteLater()
-            self.transition_player_window = None; return
-
-        content_loaded = self._load_content_into_player(self.transition_player_window, new_path)
-        if not content_loaded: 
-            if self.transition_player_window:
-                self.transition_player_window.close(); self.transition_player_window.deleteLater()
-            self.transition_player_window = None
+            player_window.close(); player_window.deleteLater()
+            return None, None
+        return player_window, opacity_effect
+
+    def _ensure_player_window_pool(self):
+        # Both windows are created and parented to WorkerW once, then swap active/standby roles forever.
+        while len(self.player_window_pool) < self.PLAYER_WINDOW_POOL_SIZE:
+            player_window, opacity_effect = self._create_parented_player_window(show_window=False)
+            if not player_window: return False
+            self.player_window_pool.append((player_window, opacity_effect))
+        return True
+
+    def _get_standby_pool_window(self):
+        if not self._ensure_player_window_pool(): return None, None
+        for player_window, opacity_effect in self.player_window_pool:
+            if player_window is not self.active_player_window:
+                return player_window, opacity_effect
+        return None, None
+
+    def _release_player_window(self, player_window):
+        player_window.stop_and_clear_playback()
+        player_window.hide()
+
+    def _destroy_player_window_pool(self):
+        for player_window, _ in self.player_window_pool:
+            player_window.stop_and_clear_playback()
+            player_window.hide(); player_window.close(); player_window.deleteLater()
+        self.player_window_pool = []
+
+    def _transition_to_wallpaper(self, new_path, mode_index_for_timer_restart, prerolled_window=None):
+        if self.current_transition_animation and self.current_transition_animation.state() == QPropertyAnimation.State.Running:
+            self.current_transition_animation.stop()
+            if self.opacity_effect_active: self.opacity_effect_active.setOpacity(1.0)
+
+        if self.transition_player_window and self.transition_player_window is not prerolled_window: 
+            self._release_player_window(self.transition_player_window)
+        self.transition_player_window = None; self.opacity_effect_transition = None
+
+        standby_window, standby_opacity_effect = self._get_standby_pool_window()
+        if not standby_window:
+            self.status_label.setText("Error: Could not prepare wallpaper window.")
             return
+        self.transition_player_window, self.opacity_effect_transition = standby_window, standby_opacity_effect
+        self.opacity_effect_transition.setOpacity(0.0)
+        
+        if prerolled_window is standby_window:
+            # Content is already decoded and parked on its first frame; only the fade is left to do.
+            self.transition_player_window.show()
+            self.transition_player_window.resume_playback()
+            self._add_to_recent_wallpapers(new_path)
+            self.status_label.setText(f"Preparing: {os.path.basename(new_path)}")
+        else:
+            content_loaded = self._load_content_into_player(self.transition_player_window, new_path)
+            if not content_loaded: 
+                self._release_player_window(self.transition_player_window)
+                self.transition_player_window = None; self.opacity_effect_transition = None
+                return
+            self.transition_player_window.show()
 
         fade_duration = 500 
         self.current_transition_animation = QParallelAnimationGroup(self)
@@ -1718,7 +3881,7 @@ class LiveWallpaperApp(QMainWindow):
         )
         self.current_transition_animation.start(QPropertyAnimation.DeletionPolicy.DeleteWhenStopped)
 
-    def _load_content_into_player(self, player_window, file_path):
+    def _load_content_into_player(self, player_window, file_path, start_paused=False):
         if not player_window: return False
         if not file_path or not os.path.exists(file_path): 
             player_window.stop_and_clear_playback() 
@@ -1726,27 +3889,44 @@ class LiveWallpaperApp(QMainWindow):
 
         file_extension = os.path.splitext(file_path)[1].lower()
 
+        downscale_required = False
         if file_extension == ".mp4" and self.setting_low_spec_mode_enabled:
-            if not self._is_mp4_resolution_acceptable(file_path):
-                self.status_label.setText(f"Skipped (Low Spec): {os.path.basename(file_path)} >1080p")
-                player_window.stop_and_clear_playback() 
-                return False 
+            media_info = self.media_probe_service.cached_info(file_path)
+            if media_info is None:
+                # Resolution unknown: load once the async probe reports back instead of spinning a nested event loop.
+                player_window.stop_and_clear_playback()
+                player_window.pending_probe_path = os.path.normpath(file_path)
+                player_window.is_paused = start_paused
+                self.media_probe_service.probe(file_path, lambda path, info, w=player_window: self._on_load_probe_finished(w, path, info))
+                return True
+            # Too large for full-resolution playback: render it at screen size rather than skipping it.
+            downscale_required = self._mp4_needs_downscale(file_path, media_info)
 
 
         if file_extension == ".gif":
-            player_window.play_gif(file_path)
+            player_window.play_gif(file_path, start_paused=start_paused,
+                                   frame_cache_max_bytes=self.setting_gif_frame_cache_max_mb * 1024 * 1024,
+                                   stream_max_frames=self.setting_gif_stream_max_frames,
+                                   stream_max_bytes=self.setting_gif_stream_max_mb * 1024 * 1024,
+                                   frame_rate_cap=self.setting_frame_rate_cap)
         elif file_extension == ".mp4":
             is_sound_enabled_for_new_active = False 
             if self.mode_combo.currentIndex() == 0: 
                  is_sound_enabled_for_new_active = self.sound_checkbox.isChecked()
-            player_window.play_mp4(file_path, sound_enabled=is_sound_enabled_for_new_active) 
+            player_window.play_mp4(file_path, sound_enabled=is_sound_enabled_for_new_active,
+                                   loop_mode=self._get_loop_mode_for_path(file_path),
+                                   in_memory_max_bytes=self.setting_in_memory_loop_max_mb * 1024 * 1024,
+                                   start_paused=start_paused, frame_rate_cap=self.setting_frame_rate_cap,
+                                   render_scale=self.setting_render_scale, render_filter=self.setting_render_filter,
+                                   downscale_required=downscale_required) 
         else:
             self.status_label.setText(f"Unsupported type: {os.path.basename(file_path)}.")
             player_window.stop_and_clear_playback()
             return False
         
-        self._add_to_recent_wallpapers(file_path) 
-        self.status_label.setText(f"Preparing: {os.path.basename(file_path)}") 
+        if not start_paused:
+            self._add_to_recent_wallpapers(file_path) 
+            self.status_label.setText(f"Preparing: {os.path.basename(file_path)}") 
         return True
 
     def _finish_transition(self, new_path_that_became_active, mode_index_of_new_path):
@@ -1758,11 +3938,8 @@ class LiveWallpaperApp(QMainWindow):
         self.transition_player_window = None 
         self.opacity_effect_transition = None
 
-        if old_active_player_window:
-            old_active_player_window.stop_and_clear_playback()
-            old_active_player_window.hide() 
-            old_active_player_window.close() 
-            old_active_player_window.deleteLater() 
+        if old_active_player_window and old_active_player_window is not self.active_player_window:
+            self._release_player_window(old_active_player_window)
 
         self.stop_button.setEnabled(True)
         self.pause_resume_button.setEnabled(True)
@@ -1776,20 +3953,7 @@ class LiveWallpaperApp(QMainWindow):
         self.wallpaper_was_manually_paused = False 
 
         if self.is_playlist_active:
-            timer_interval_ms = 0
-            if mode_index_of_new_path == 1: 
-                interval = self.interval_spinbox.value()
-                unit = self.interval_unit_combo.currentText()
-                if unit == "Hours": interval *= 60
-                timer_interval_ms = interval * 60 * 1000
-            elif mode_index_of_new_path == 2: 
-                timer_interval_ms = 60 * 1000 
-            elif mode_index_of_new_path == 3: 
-                timer_interval_ms = 5 * 60 * 1000 
-            
-            if timer_interval_ms > 0:
-                self.playlist_timer.setInterval(timer_interval_ms)
-                self.playlist_timer.start()
+            self._arm_playlist_timer_for_mode(mode_index_of_new_path)
         
         self.current_transition_animation = None 
 
@@ -1815,10 +3979,7 @@ class LiveWallpaperApp(QMainWindow):
 
     def _cleanup_after_fade_out_active(self):
         if self.active_player_window and self.active_player_window != self.transition_player_window: 
-            self.active_player_window.stop_and_clear_playback()
-            self.active_player_window.hide()
-            self.active_player_window.close()
-            self.active_player_window.deleteLater() 
+            self._release_player_window(self.active_player_window)
             self.active_player_window = None 
             self.opacity_effect_active = None 
 
@@ -1829,8 +3990,8 @@ class LiveWallpaperApp(QMainWindow):
                  self.tray_engine_pause_resume_action.setEnabled(False)
                  self.tray_engine_pause_resume_action.setText("Pause Engine")
 
-    def _get_current_time_of_day_wallpaper_path(self):
-        now = datetime.now().time()
+    def _get_current_time_of_day_wallpaper_path(self, at_time=None):
+        now = (at_time or datetime.now()).time()
         selected_wp = None
 
         if self.time_of_day_slots["Night"] <= now or now < self.time_of_day_slots["Morning"]:
@@ -1849,8 +4010,8 @@ class LiveWallpaperApp(QMainWindow):
                     break 
         return selected_wp
 
-    def _get_current_day_of_week_wallpaper_path(self, reset_sub_index=False):
-        today_int = datetime.today().weekday() 
+    def _get_current_day_of_week_wallpaper_path(self, reset_sub_index=False, at_time=None):
+        today_int = (at_time or datetime.now()).weekday() 
         today_name = self.DAYS_OF_WEEK[today_int]
         
         wallpapers_for_today = self.day_of_week_wallpapers[today_name]
@@ -1871,59 +4032,179 @@ class LiveWallpaperApp(QMainWindow):
 
         return wallpapers_for_today[idx]
 
+    def _resolve_next_playlist_wallpaper(self, mode_index, at_time=None):
+        # Returns (path, commit). Resolution itself leaves playlist state untouched so it can run ahead
+        # of the timer for pre-rolling; commit() applies the index/shuffle advance when the tick happens.
+        if mode_index == 1: 
+            if not self.wallpaper_playlist: return None, None
+            playlist_len = len(self.wallpaper_playlist)
+            
+            if self.interval_play_order == "Manual Order":
+                next_index = (self.current_playlist_index + 1) % playlist_len
+                def commit(): self.current_playlist_index = next_index
+                return self.wallpaper_playlist[next_index], commit
+            elif self.interval_play_order == "Sequential" or self.interval_play_order == "Shuffle Cycle":
+                play_order = self.play_order
+                next_index = play_order.peek()
+                if next_index < 0:
+                    # Cycle done: Sequential replays the same permutation, Shuffle Cycle draws a new one.
+                    play_order = ShuffleOrder(playlist_len, play_order.seed if self.interval_play_order == "Sequential" else None)
+                    next_index = play_order.peek()
+                def commit():
+                    self.play_order = play_order; play_order.advance()
+                    self.current_playlist_index = next_index
+                return self.wallpaper_playlist[next_index], commit
+            elif self.interval_play_order == "Random Pick":
+                next_index = self.random_picker.pick()
+                next_path = self.wallpaper_playlist[next_index]
+                def commit():
+                    self.random_picker.record(next_path)
+                    self.current_playlist_index = next_index
+                return next_path, commit
+        
+        elif mode_index == 2: 
+            return self._get_current_time_of_day_wallpaper_path(at_time), None
+        
+        elif mode_index == 3: 
+            day_int = (at_time or datetime.now()).weekday()
+            if day_int != self.last_checked_day_int: 
+                wallpapers_for_day = self.day_of_week_wallpapers[self.DAYS_OF_WEEK[day_int]]
+                def commit(): self._get_current_day_of_week_wallpaper_path(reset_sub_index=True, at_time=at_time)
+                return (wallpapers_for_day[0] if wallpapers_for_day else None), commit
+        return None, None
+
+    def _next_schedule_boundary(self, mode_index, now):
+        """Next local time the time-of-day period (mode 2) or the weekday (mode 3) changes, as an aware datetime."""
+        local_now = now.replace(tzinfo=None)
+        if mode_index == 2:
+            candidates = (datetime.combine(local_now.date() + timedelta(days=day_offset), slot) for day_offset in (0, 1) for slot in self.time_of_day_slots.values())
+            boundary = min(candidate for candidate in candidates if candidate > local_now)
+        else: boundary = datetime.combine(local_now.date() + timedelta(days=1), dt_time(0, 0))
+        # astimezone() resolves the naive wall-clock boundary with that day's UTC offset, so DST days get the real length.
+        return boundary.astimezone()
+
+    def _arm_playlist_timer_for_mode(self, mode_index):
+        # Interval mode ticks every interval; the schedules tick once, exactly at their next boundary.
+        self._schedule_boundary = None
+        if mode_index == 1:
+            interval = self.interval_spinbox.value()
+            if self.interval_unit_combo.currentText() == "Hours": interval *= 60
+            self._start_playlist_timer(interval * 60 * 1000)
+        elif mode_index == 2 or mode_index == 3:
+            now = datetime.now().astimezone()
+            self._schedule_boundary = self._next_schedule_boundary(mode_index, now)
+            self._start_playlist_timer(int((self._schedule_boundary - now).total_seconds() * 1000) + 1)
+
+    def _schedule_evaluation_time(self):
+        # Even a precise timer may fire a few ms early; that close to the boundary the new period is the one to show.
+        now = datetime.now().astimezone()
+        if self._schedule_boundary and now < self._schedule_boundary <= now + timedelta(seconds=2): now = self._schedule_boundary
+        return now.replace(tzinfo=None)
+
+    def _reevaluate_schedule(self):
+        # The wall clock moved under the timer (clock change, time zone change, resume from sleep): re-check right now.
+        if not self.is_playlist_active or not self.playlist_timer.isActive(): return
+        if self.mode_combo.currentIndex() not in (2, 3): return
+        self.log_msg("System clock or power state changed; re-evaluating the schedule.")
+        self._discard_prerolled_next_wallpaper()
+        self.handle_playlist_timer_tick()
+
+    def nativeEvent(self, event_type, message):
+        if event_type == b"windows_generic_MSG":
+            msg = wintypes.MSG.from_address(int(message))
+            if msg.message == WM_TIMECHANGE or \
+               (msg.message == WM_POWERBROADCAST and msg.wParam in (PBT_APMRESUMESUSPEND, PBT_APMRESUMEAUTOMATIC)):
+                QTimer.singleShot(0, self._reevaluate_schedule)
+        return super().nativeEvent(event_type, message)
+
+    def _start_playlist_timer(self, interval_ms):
+        self.playlist_timer.setInterval(interval_ms)
+        self.playlist_timer.start()
+        self._arm_playlist_preroll()
+
+    def _arm_playlist_preroll(self):
+        self.playlist_preroll_timer.stop()
+        if not self.playlist_timer.isActive(): return
+        remaining_ms = self.playlist_timer.remainingTime()
+        if remaining_ms > self.PLAYLIST_PREROLL_LEAD_MS:
+            self.playlist_preroll_timer.start(remaining_ms - self.PLAYLIST_PREROLL_LEAD_MS)
+
+    def _preroll_next_playlist_wallpaper(self):
+        if not self.is_playlist_active or not self.playlist_timer.isActive() or not self.workerw_hwnd: return
+        if self.transition_player_window: return
+        if self.active_player_window and self.active_player_window.is_paused: return
+
+        mode_index = self.mode_combo.currentIndex()
+        if self._schedule_boundary: fire_time = self._schedule_boundary.replace(tzinfo=None)
+        else: fire_time = datetime.now() + timedelta(milliseconds=max(0, self.playlist_timer.remainingTime()))
+        next_path, commit = self._resolve_next_playlist_wallpaper(mode_index, at_time=fire_time)
+        current_playing_file = self.active_player_window.current_file_path if self.active_player_window else None
+        if not next_path or not os.path.exists(next_path) or \
+           (current_playing_file and os.path.normpath(current_playing_file) == os.path.normpath(next_path)):
+            return
+
+        self._discard_prerolled_next_wallpaper()
+        preroll_window, _ = self._get_standby_pool_window()
+        if not preroll_window: return
+        if not self._load_content_into_player(preroll_window, next_path, start_paused=True):
+            self._release_player_window(preroll_window)
+            return
+        self._prerolled_next = {"path": next_path, "mode_index": mode_index, "commit": commit, "window": preroll_window}
+        self.log_msg(f"Pre-rolled next wallpaper: {os.path.basename(next_path)}")
+
+    def _take_prerolled_next_wallpaper(self, mode_index):
+        prerolled = self._prerolled_next
+        self._prerolled_next = None
+        if not prerolled: return None
+        still_valid = prerolled["mode_index"] == mode_index and \
+                      (mode_index != 1 or prerolled["path"] in self.wallpaper_playlist)
+        if not still_valid:
+            self._release_player_window(prerolled["window"])
+            return None
+        return prerolled
+
+    def _discard_prerolled_next_wallpaper(self):
+        self.playlist_preroll_timer.stop()
+        if self._prerolled_next:
+            self._release_player_window(self._prerolled_next["window"])
+            self._prerolled_next = None
+
     def handle_playlist_timer_tick(self):
         if self.active_player_window and self.active_player_window.is_paused:
             if self.playlist_timer.isActive(): 
-                current_interval = self.playlist_timer.interval()
                 self.playlist_timer.stop() 
-                self.playlist_timer.start(current_interval) 
+                self._arm_playlist_timer_for_mode(self.mode_combo.currentIndex())
             return
 
         mode_index = self.mode_combo.currentIndex()
-        next_wallpaper_path = None
+        if mode_index == 1 and not self.wallpaper_playlist:
+            self._discard_prerolled_next_wallpaper()
+            self.playlist_timer.stop(); return 
 
-        if mode_index == 1: 
-            if not self.wallpaper_playlist: self.playlist_timer.stop(); return 
-            
-            if self.interval_play_order == "Manual Order" or self.interval_play_order == "Sequential":
-                self.current_playlist_index = (self.current_playlist_index + 1) % len(self.wallpaper_playlist)
-                next_wallpaper_path = self.wallpaper_playlist[self.current_playlist_index]
-            elif self.interval_play_order == "Shuffle Each Cycle":
-                self.current_playlist_index += 1
-                if self.current_playlist_index >= len(self.wallpaper_playlist) or self.current_playlist_index < 0: 
-                    if not self.wallpaper_playlist: self.playlist_timer.stop(); return 
-                    random.shuffle(self.wallpaper_playlist)
-                    self._populate_interval_listwidget_from_playlist() 
-                    self.interval_playlist_ui_populated = True
-                    self.current_playlist_index = 0
-                if self.wallpaper_playlist: 
-                    next_wallpaper_path = self.wallpaper_playlist[self.current_playlist_index]
-            elif self.interval_play_order == "Random Pick":
-                if self.wallpaper_playlist:
-                    next_wallpaper_path = random.choice(self.wallpaper_playlist)
-        
-        elif mode_index == 2: 
-            next_wallpaper_path = self._get_current_time_of_day_wallpaper_path()
-        
-        elif mode_index == 3: 
-            today_int = datetime.today().weekday()
-            if today_int != self.last_checked_day_int: 
-                next_wallpaper_path = self._get_current_day_of_week_wallpaper_path(reset_sub_index=True)
-            else: 
-                return 
+        prerolled = self._take_prerolled_next_wallpaper(mode_index)
+        if prerolled:
+            next_wallpaper_path, commit = prerolled["path"], prerolled["commit"]
+        else:
+            at_time = self._schedule_evaluation_time() if mode_index == 2 or mode_index == 3 else None
+            next_wallpaper_path, commit = self._resolve_next_playlist_wallpaper(mode_index, at_time=at_time)
+        if commit: commit()
+        if mode_index == 2 or mode_index == 3: self._arm_playlist_timer_for_mode(mode_index)
+        else: self._arm_playlist_preroll()
         
         current_playing_file = self.active_player_window.current_file_path if self.active_player_window else None
         
         if next_wallpaper_path and os.path.exists(next_wallpaper_path) and \
            (not current_playing_file or os.path.normpath(current_playing_file) != os.path.normpath(next_wallpaper_path)):
-            self._transition_to_wallpaper(next_wallpaper_path, mode_index)
+            if prerolled:
+                self._transition_to_wallpaper(next_wallpaper_path, mode_index, prerolled_window=prerolled["window"])
+                prerolled = None
+            else:
+                self._transition_to_wallpaper(next_wallpaper_path, mode_index)
         elif next_wallpaper_path and not os.path.exists(next_wallpaper_path):
             self.status_label.setText(f"Playlist file missing: {os.path.basename(next_wallpaper_path)}. Skipping.")
             if mode_index == 1 and next_wallpaper_path in self.wallpaper_playlist:
                 try:
-                    self.wallpaper_playlist.remove(next_wallpaper_path)
-                    self._populate_interval_listwidget_from_playlist() 
-                    self.interval_playlist_ui_populated = True
+                    self.interval_playlist_model.remove_path(next_wallpaper_path)
                     if self.wallpaper_playlist: 
                         QTimer.singleShot(0, self.handle_playlist_timer_tick) 
                     else: 
@@ -1934,6 +4215,8 @@ class LiveWallpaperApp(QMainWindow):
              self.playlist_timer.stop()
              self.status_label.setText("Interval playlist is empty.")
 
+        if prerolled: self._release_player_window(prerolled["window"])
+
     def play_next_from_playlist_on_media_end(self):
         mode_index = self.mode_combo.currentIndex()
         if not self.is_playlist_active: return 
@@ -1968,6 +4251,7 @@ class LiveWallpaperApp(QMainWindow):
     def update_recent_wallpapers_tray_menu(self):
         if not hasattr(self, 'recent_wallpapers_menu') or not self.recent_wallpapers_menu: return
 
+        self.thumbnail_service.cancel(self.recent_wallpapers_menu)
         self.recent_wallpapers_menu.clear()
         if not self.recent_wallpapers:
             no_recent_action = QAction("No recent wallpapers", self)
@@ -1991,6 +4275,9 @@ class LiveWallpaperApp(QMainWindow):
                         
                         recent_action = QAction(action_text, self)
                         recent_action.triggered.connect(lambda checked=False, path=normalized_path: self.play_recent_wallpaper(path))
+                        recent_icon = self.thumbnail_service.request(normalized_path, QSize(32, 18), self.recent_wallpapers_menu,
+                                                                     lambda path, pixmap, action=recent_action: action.setIcon(QIcon(pixmap)))
+                        if recent_icon is not None: recent_action.setIcon(QIcon(recent_icon))
                         self.recent_wallpapers_menu.addAction(recent_action)
             
             self.recent_wallpapers = temp_valid_recents
@@ -2007,6 +4294,7 @@ class LiveWallpaperApp(QMainWindow):
         
         self.current_wallpaper_path_single_mode_selection = file_path
         if hasattr(self, 'single_file_label'): self.single_file_label.setText(os.path.basename(file_path))
+        self._sync_single_loop_mode_combo()
 
         if self.mode_combo.currentIndex() != 0:
             self.mode_combo.setCurrentIndex(0) 
@@ -2116,41 +4404,22 @@ class LiveWallpaperApp(QMainWindow):
 
     def _restart_playlist_timer_if_applicable(self):
         if self.is_playlist_active and not self.playlist_timer.isActive():
-            mode_index = self.mode_combo.currentIndex()
-            timer_interval_ms = 0
-            if mode_index == 1: 
-                interval = self.interval_spinbox.value()
-                unit = self.interval_unit_combo.currentText()
-                if unit == "Hours": interval *= 60
-                timer_interval_ms = interval * 60 * 1000
-            elif mode_index == 2: 
-                timer_interval_ms = 60 * 1000 
-            elif mode_index == 3: 
-                timer_interval_ms = 5 * 60 * 1000 
-            
-            if timer_interval_ms > 0:
-                self.playlist_timer.setInterval(timer_interval_ms)
-                self.playlist_timer.start()
+            self._arm_playlist_timer_for_mode(self.mode_combo.currentIndex())
 
     def stop_clear_wallpaper_internal(self): 
         self.playlist_timer.stop()
+        self._discard_prerolled_next_wallpaper()
 
         if self.current_transition_animation and self.current_transition_animation.state() == QPropertyAnimation.State.Running:
             self.current_transition_animation.stop()
         
         if self.active_player_window:
-            self.active_player_window.stop_and_clear_playback()
-            self.active_player_window.hide()
-            self.active_player_window.close()
-            self.active_player_window.deleteLater()
+            self._release_player_window(self.active_player_window)
             self.active_player_window = None
             self.opacity_effect_active = None
         
         if self.transition_player_window: 
-            self.transition_player_window.stop_and_clear_playback()
-            self.transition_player_window.hide()
-            self.transition_player_window.close()
-            self.transition_player_window.deleteLater()
+            self._release_player_window(self.transition_player_window)
             self.transition_player_window = None
             self.opacity_effect_transition = None
 
@@ -2215,10 +4484,17 @@ class LiveWallpaperApp(QMainWindow):
             "single_wallpaper_path": self.current_wallpaper_path_single_mode_selection,
             "single_sound_enabled": single_sound,
             "interval_playlist_folder_display": playlist_folder_display_text,
-            "interval_playlist_files": self.wallpaper_playlist,
+            "interval_playlist_files": list(self.wallpaper_playlist),
             "interval_value": interval_val,
             "interval_unit_index": interval_unit_idx,
             "interval_play_order": current_interval_play_order,
+            "interval_playlist_index": self.current_playlist_index,
+            "interval_shuffle_seed": self.play_order.seed,
+            "interval_shuffle_cycle_size": self.play_order.cycle_size,
+            "interval_shuffle_position": self.play_order.position,
+            "favourite_wallpapers": sorted(self.favourite_wallpapers),
+            "setting_random_no_repeat_window": self.setting_random_no_repeat_window,
+            "random_pick_recent": list(self.random_picker.recent),
             "time_of_day_wallpapers": self.time_of_day_wallpapers,
             "day_of_week_wallpapers": self.day_of_week_wallpapers,
             "background_audio_path": self.current_audio_path,
@@ -2234,7 +4510,22 @@ class LiveWallpaperApp(QMainWindow):
             "setting_pause_on_focus_loss": pause_focus,
             "setting_video_preview_quality_index": preview_quality_idx,
             "setting_low_spec_mode_enabled": low_spec_mode,
-            "setting_aggressive_gpu_reduction_on_focus_loss": agg_gpu_reduction 
+            "setting_aggressive_gpu_reduction_on_focus_loss": agg_gpu_reduction,
+            "setting_default_loop_mode": self.setting_default_loop_mode,
+            "wallpaper_loop_modes": self.wallpaper_loop_modes,
+            "setting_in_memory_loop_max_mb": self.setting_in_memory_loop_max_mb,
+            "setting_gif_frame_cache_max_mb": self.setting_gif_frame_cache_max_mb,
+            "setting_gif_stream_max_frames": self.setting_gif_stream_max_frames,
+            "setting_gif_stream_max_mb": self.setting_gif_stream_max_mb,
+            "setting_frame_rate_cap": self.setting_frame_rate_cap,
+            "setting_render_scale": self.setting_render_scale,
+            "setting_render_filter": self.setting_render_filter,
+            "setting_folder_import_recursive": self.setting_folder_import_recursive,
+            "setting_folder_import_max_depth": self.setting_folder_import_max_depth,
+            "setting_folder_import_include": self.setting_folder_import_include,
+            "setting_folder_import_exclude": self.setting_folder_import_exclude,
+            "setting_folder_import_linked": self.setting_folder_import_linked,
+            "interval_linked_folder": self._linked_folder_scanner.root_path if self._linked_folder_scanner else None
         }
         try:
             with open(self.settings_file_path, 'w') as f:
@@ -2244,7 +4535,6 @@ class LiveWallpaperApp(QMainWindow):
             if hasattr(self, 'status_label'): self.status_label.setText(f"Error saving settings: {e}")
 
     def load_settings(self):
-        self.interval_playlist_ui_populated = False
         self.dow_playlists_ui_populated = False
 
         if not os.path.exists(self.settings_file_path):
@@ -2282,13 +4572,31 @@ class LiveWallpaperApp(QMainWindow):
                 folder_display = settings_data.get("interval_playlist_folder_display", "No folder selected")
                 self.playlist_folder_label.setText(folder_display if folder_display else "No folder selected")
 
-            self.wallpaper_playlist = [p for p in settings_data.get("interval_playlist_files", []) if os.path.exists(p)]
+            self.interval_playlist_model.set_paths([p for p in settings_data.get("interval_playlist_files", []) if os.path.exists(p)])
+            queued_count = self.media_probe_service.probe_many(self.wallpaper_playlist)
+            if queued_count: self.log_msg(f"Probing {queued_count} playlist file(s) missing from the media index.")
             
             if hasattr(self,'interval_spinbox'): self.interval_spinbox.setValue(settings_data.get("interval_value", 30))
             if hasattr(self,'interval_unit_combo'): self.interval_unit_combo.setCurrentIndex(settings_data.get("interval_unit_index", 0))
             
             loaded_play_order_text = settings_data.get("interval_play_order", "Manual Order")
             self.set_interval_play_order_from_text(loaded_play_order_text) 
+            shuffle_seed = settings_data.get("interval_shuffle_seed")
+            if shuffle_seed is not None:
+                self.play_order = ShuffleOrder(settings_data.get("interval_shuffle_cycle_size", 0), shuffle_seed)
+                self.play_order.seek(settings_data.get("interval_shuffle_position", 0))
+                self.play_order.resize(len(self.wallpaper_playlist))
+            self.current_playlist_index = settings_data.get("interval_playlist_index", -1)
+            self.favourite_wallpapers = {IndexedPlaylist.key(p) for p in settings_data.get("favourite_wallpapers", [])}
+            self.random_picker.recent = deque(IndexedPlaylist.key(p) for p in settings_data.get("random_pick_recent", []))
+            self.random_picker.invalidate()
+            self.setting_random_no_repeat_window = max(1, min(1000, int(settings_data.get("setting_random_no_repeat_window", self.DEFAULT_RANDOM_NO_REPEAT))))
+            self.random_picker.set_window(self.setting_random_no_repeat_window)
+            if hasattr(self, 'random_no_repeat_spinbox'):
+                self.random_no_repeat_spinbox.blockSignals(True)
+                self.random_no_repeat_spinbox.setValue(self.setting_random_no_repeat_window)
+                self.random_no_repeat_spinbox.blockSignals(False)
+            self._resume_interval_playlist = True
 
             loaded_tod = settings_data.get("time_of_day_wallpapers", {})
             for period, path in loaded_tod.items():
@@ -2344,6 +4652,80 @@ class LiveWallpaperApp(QMainWindow):
             if hasattr(self, 'low_spec_mode_checkbox'):
                 self.low_spec_mode_checkbox.setChecked(self.setting_low_spec_mode_enabled)
 
+            loaded_loop_modes = settings_data.get("wallpaper_loop_modes", {})
+            self.wallpaper_loop_modes = {os.path.normpath(p): m for p, m in loaded_loop_modes.items() if m in LOOP_MODE_LABELS}
+            default_loop_mode = settings_data.get("setting_default_loop_mode", LOOP_MODE_DUAL)
+            if default_loop_mode not in LOOP_MODE_LABELS: default_loop_mode = LOOP_MODE_DUAL
+            if hasattr(self, 'default_loop_mode_combo'):
+                self.default_loop_mode_combo.blockSignals(True)
+                self.default_loop_mode_combo.setCurrentIndex(self.default_loop_mode_combo.findData(default_loop_mode))
+                self.default_loop_mode_combo.blockSignals(False)
+            self.setting_default_loop_mode = default_loop_mode
+            self._sync_single_loop_mode_combo()
+
+            in_memory_max_mb = settings_data.get("setting_in_memory_loop_max_mb", DEFAULT_IN_MEMORY_LOOP_MAX_MB)
+            if hasattr(self, 'in_memory_loop_spinbox'):
+                self.in_memory_loop_spinbox.blockSignals(True)
+                self.in_memory_loop_spinbox.setValue(in_memory_max_mb)
+                self.in_memory_loop_spinbox.blockSignals(False)
+                in_memory_max_mb = self.in_memory_loop_spinbox.value()
+            self.setting_in_memory_loop_max_mb = in_memory_max_mb
+
+            gif_cache_max_mb = settings_data.get("setting_gif_frame_cache_max_mb", DEFAULT_GIF_FRAME_CACHE_MAX_MB)
+            if hasattr(self, 'gif_frame_cache_spinbox'):
+                self.gif_frame_cache_spinbox.blockSignals(True)
+                self.gif_frame_cache_spinbox.setValue(gif_cache_max_mb)
+                self.gif_frame_cache_spinbox.blockSignals(False)
+                gif_cache_max_mb = self.gif_frame_cache_spinbox.value()
+            self.setting_gif_frame_cache_max_mb = gif_cache_max_mb
+
+            gif_stream_max_frames = settings_data.get("setting_gif_stream_max_frames", DEFAULT_GIF_STREAM_MAX_FRAMES)
+            gif_stream_max_mb = settings_data.get("setting_gif_stream_max_mb", DEFAULT_GIF_STREAM_MAX_MB)
+            if hasattr(self, 'gif_stream_frames_spinbox'):
+                for spinbox, value in ((self.gif_stream_frames_spinbox, gif_stream_max_frames), (self.gif_stream_mb_spinbox, gif_stream_max_mb)):
+                    spinbox.blockSignals(True); spinbox.setValue(value); spinbox.blockSignals(False)
+                gif_stream_max_frames = self.gif_stream_frames_spinbox.value(); gif_stream_max_mb = self.gif_stream_mb_spinbox.value()
+            self.setting_gif_stream_max_frames = gif_stream_max_frames
+            self.setting_gif_stream_max_mb = gif_stream_max_mb
+
+            frame_rate_cap = settings_data.get("setting_frame_rate_cap", 0)
+            if frame_rate_cap not in FRAME_RATE_CAP_LABELS: frame_rate_cap = 0
+            if hasattr(self, 'frame_rate_cap_combo'):
+                self.frame_rate_cap_combo.blockSignals(True)
+                self.frame_rate_cap_combo.setCurrentIndex(self.frame_rate_cap_combo.findData(frame_rate_cap))
+                self.frame_rate_cap_combo.blockSignals(False)
+            self.setting_frame_rate_cap = frame_rate_cap
+
+            render_scale = settings_data.get("setting_render_scale", 0)
+            if render_scale not in RENDER_SCALE_LABELS: render_scale = 0
+            render_filter = settings_data.get("setting_render_filter", RENDER_FILTER_SMOOTH)
+            if render_filter not in RENDER_FILTER_LABELS: render_filter = RENDER_FILTER_SMOOTH
+            if hasattr(self, 'render_scale_combo'):
+                for combo, value in ((self.render_scale_combo, render_scale), (self.render_filter_combo, render_filter)):
+                    combo.blockSignals(True); combo.setCurrentIndex(combo.findData(value)); combo.blockSignals(False)
+            self.setting_render_scale = render_scale
+            self.setting_render_filter = render_filter
+
+            self.setting_folder_import_recursive = bool(settings_data.get("setting_folder_import_recursive", False))
+            self.setting_folder_import_max_depth = max(0, min(64, int(settings_data.get("setting_folder_import_max_depth", 0))))
+            self.setting_folder_import_include = str(settings_data.get("setting_folder_import_include", ""))
+            self.setting_folder_import_exclude = str(settings_data.get("setting_folder_import_exclude", ""))
+            self.setting_folder_import_linked = bool(settings_data.get("setting_folder_import_linked", False))
+            folder_import_widgets = (self.folder_import_recursive_checkbox, self.folder_import_depth_spinbox, self.folder_import_include_edit,
+                                     self.folder_import_exclude_edit, self.folder_import_linked_checkbox) if hasattr(self, 'folder_import_recursive_checkbox') else ()
+            if folder_import_widgets:
+                for widget in folder_import_widgets: widget.blockSignals(True)
+                self.folder_import_recursive_checkbox.setChecked(self.setting_folder_import_recursive)
+                self.folder_import_depth_spinbox.setValue(self.setting_folder_import_max_depth)
+                self.folder_import_depth_spinbox.setEnabled(self.setting_folder_import_recursive)
+                self.folder_import_include_edit.setText(self.setting_folder_import_include)
+                self.folder_import_exclude_edit.setText(self.setting_folder_import_exclude)
+                self.folder_import_linked_checkbox.setChecked(self.setting_folder_import_linked)
+                for widget in folder_import_widgets: widget.blockSignals(False)
+            linked_folder = settings_data.get("interval_linked_folder")
+            if self.setting_folder_import_linked and linked_folder and os.path.isdir(linked_folder):
+                QTimer.singleShot(0, lambda: self._start_folder_import(linked_folder, reconcile=True))
+
             auto_play_enabled = settings_data.get("auto_play_on_startup", True)
             last_active_wp_on_exit = settings_data.get("last_active_wallpaper_path")
             was_paused_on_exit = settings_data.get("is_last_active_paused", False)
@@ -2357,11 +4739,11 @@ class LiveWallpaperApp(QMainWindow):
                     if last_active_wp_on_exit and os.path.exists(last_active_wp_on_exit):
                         self.current_wallpaper_path_single_mode_selection = last_active_wp_on_exit
                         if hasattr(self,'single_file_label'): self.single_file_label.setText(os.path.basename(last_active_wp_on_exit))
+                        self._sync_single_loop_mode_combo()
                         self._update_single_mode_preview(last_active_wp_on_exit) 
                         self.apply_button.setEnabled(True)
                         visual_to_start = True
                 elif current_mode_now == 1:
-                    if not self.interval_playlist_ui_populated: self._populate_interval_listwidget_from_playlist(); self.interval_playlist_ui_populated = True
                     if self.wallpaper_playlist: visual_to_start = True
                 elif current_mode_now == 2 and any(self.time_of_day_wallpapers.values()): visual_to_start = True
                 elif current_mode_now == 3:
@@ -2586,6 +4968,11 @@ class LiveWallpaperApp(QMainWindow):
         if hasattr(self, 'status_label'): self.status_label.setText(f"Quitting {APP_NAME} Engine...") 
         
         self.stop_clear_wallpaper_internal() 
+        self._destroy_player_window_pool()
+        if self._folder_import_worker: self._folder_import_worker.requestInterruption(); self._folder_import_worker.wait(2000)
+        if self._linked_folder_lister: self._linked_folder_lister.requestInterruption(); self._linked_folder_lister.wait(2000)
+        self.thumbnail_service.shutdown()
+        self.media_metadata_index.close()
 
         if self.bg_audio_player:
             self.bg_audio_player.stop()
@@ -2599,20 +4986,9 @@ class LiveWallpaperApp(QMainWindow):
 
         self.desktop_focus_timer.stop()      
 
-        if self._preview_player:
-            if self._preview_player.playbackState() != QMediaPlayer.PlaybackState.StoppedState:
-                self._preview_player.stop()
-            self._preview_player.setSource(QUrl())
-            if self._preview_sink:
-                try: self._preview_sink.videoFrameChanged.disconnect(self._handle_preview_frame)
-                except TypeError: pass
-                self._preview_player.setVideoSink(None)
-                self._preview_sink.deleteLater() 
-                self._preview_sink = None
-            self._preview_player.deleteLater() 
-            self._preview_player = None
-        
-        if hasattr(self, 'wallpaper_playlist'): self.wallpaper_playlist.clear()
+        self.frame_grabber.shutdown()
+        
+        if hasattr(self, 'interval_playlist_model'): self.interval_playlist_model.set_paths([])
         if hasattr(self, 'time_of_day_wallpapers'): self.time_of_day_wallpapers.clear()
         if hasattr(self, 'day_of_week_wallpapers'):
             for day_list in self.day_of_week_wallpapers.values(): day_list.clear()
@@ -2627,6 +5003,7 @@ if __name__ == "__main__":
     QApplication.setQuitOnLastWindowClosed(False) 
 
     app = QApplication(sys.argv)
+    app.setApplicationName(APP_NAME)
     main_window = LiveWallpaperApp()
     main_window.show()
     sys.exit(app.exec())
\ No newline at end of file
@@ -0,0 +1,134 @@
+"""Tests for the moov-only MP4 header parser, run against synthetic ftyp/moov/trak files.
+
+live_wallpaper_qt6 imports PyQt6 and the Win32 DLLs at module level, so the parser's plain-Python functions are
+loaded from the source file on their own; they only need struct, os and MP4_MAX_MOOV_BYTES.
+"""
+import ast
+import os
+import struct
+
+import pytest
+
+SOURCE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "live_wallpaper_qt6.py")
+PARSER_NAMES = {"MP4_MAX_MOOV_BYTES", "_iter_mp4_boxes", "_read_mp4_moov", "_read_mp4_timescale_duration", "_read_mp4_track",
+                "read_mp4_header_info"}
+
+
+def _load_parser():
+    with open(SOURCE_PATH, encoding="utf-8") as source_file: source = source_file.read()
+    nodes = [node for node in ast.parse(source).body
+             if (isinstance(node, ast.FunctionDef) and node.name in PARSER_NAMES)
+             or (isinstance(node, ast.Assign) and any(getattr(target, "id", None) in PARSER_NAMES for target in node.targets))]
+    namespace = {"os": os, "struct": struct}
+    exec(compile(ast.Module(body=nodes, type_ignores=[]), SOURCE_PATH, "exec"), namespace)
+    return namespace["read_mp4_header_info"]
+
+
+read_mp4_header_info = _load_parser()
+
+
+def box(box_type, payload, large_size=False):
+    if large_size: return struct.pack(">I4sQ", 1, box_type, 16 + len(payload)) + payload
+    return struct.pack(">I4s", 8 + len(payload), box_type) + payload
+
+
+def full_box(box_type, version, payload):
+    return box(box_type, bytes([version, 0, 0, 0]) + payload)
+
+
+def tkhd(width, height, version=0):
+    times = struct.pack(">QQIIQ", 0, 0, 1, 0, 0) if version else struct.pack(">IIIII", 0, 0, 1, 0, 0)
+    # reserved(8) layer/alternate_group/volume/reserved(8) matrix(36), then 16.16 width and height.
+    return full_box(b"tkhd", version, times + bytes(8) + bytes(8) + bytes(36) + struct.pack(">II", width << 16, height << 16))
+
+
+def mdhd(timescale, duration, version=0):
+    times = struct.pack(">QQIQ", 0, 0, timescale, duration) if version else struct.pack(">IIII", 0, 0, timescale, duration)
+    return full_box(b"mdhd", version, times + bytes(4))
+
+
+def mvhd(timescale, duration):
+    return full_box(b"mvhd", 0, struct.pack(">IIII", 0, 0, timescale, duration) + bytes(80))
+
+
+def hdlr(handler_type):
+    return full_box(b"hdlr", 0, struct.pack(">I4s", 0, handler_type) + bytes(12) + b"\0")
+
+
+def stsd(codec, width, height):
+    visual_entry = bytes(6) + struct.pack(">H", 1) + bytes(16) + struct.pack(">HH", width, height) + bytes(50)
+    return full_box(b"stsd", 0, struct.pack(">I", 1) + box(codec, visual_entry))
+
+
+def stsz(sample_count):
+    return full_box(b"stsz", 0, struct.pack(">II", 0, sample_count))
+
+
+def trak(handler_type, timescale, duration, sample_count, width=0, height=0, codec=b"avc1", version=0, large_size=False):
+    sample_table = box(b"stbl", stsd(codec, width, height) + stsz(sample_count))
+    media = box(b"mdia", mdhd(timescale, duration, version) + hdlr(handler_type) + box(b"minf", sample_table))
+    return box(b"trak", tkhd(width, height, version) + media, large_size=large_size)
+
+
+def ftyp():
+    return box(b"ftyp", b"isom" + struct.pack(">I", 512) + b"isomavc1")
+
+
+def write_mp4(tmp_path, *boxes):
+    mp4_path = tmp_path / "wallpaper.mp4"
+    mp4_path.write_bytes(b"".join(boxes))
+    return str(mp4_path)
+
+
+def test_faststart_file_with_audio(tmp_path):
+    moov = box(b"moov", mvhd(1000, 10000) + trak(b"vide", 30000, 300000, 300, 1920, 1080) + trak(b"soun", 48000, 480000, 470))
+    media_info = read_mp4_header_info(write_mp4(tmp_path, ftyp(), moov, box(b"mdat", bytes(4096))))
+    assert media_info["width"] == 1920 and media_info["height"] == 1080
+    assert media_info["duration_us"] == 10_000_000 and media_info["duration_ms"] == 10_000
+    assert media_info["sample_count"] == 300
+    assert media_info["frame_rate"] == pytest.approx(30.0)
+    assert media_info["video_codec"] == "avc1"
+    assert media_info["has_audio"] is True
+
+
+def test_moov_after_large_size_mdat_with_version1_mdhd(tmp_path):
+    # A 64-bit mdhd duration (over 2**32 ticks) and an mdat written with a 64-bit largesize header.
+    timescale = 90000; duration = 2 ** 32 + 90000 * 5
+    moov = box(b"moov", mvhd(1000, 1) + trak(b"vide", timescale, duration, 1234, 3840, 2160, codec=b"hvc1", version=1))
+    media_info = read_mp4_header_info(write_mp4(tmp_path, ftyp(), box(b"mdat", bytes(100_000), large_size=True), moov))
+    assert media_info["width"] == 3840 and media_info["height"] == 2160
+    assert media_info["timescale"] == timescale
+    assert media_info["duration_us"] == duration * 1_000_000 // timescale
+    assert media_info["sample_count"] == 1234
+    assert media_info["video_codec"] == "hvc1"
+    assert media_info["has_audio"] is False
+
+
+def test_large_size_trak_inside_moov(tmp_path):
+    moov = box(b"moov", mvhd(600, 6000) + trak(b"vide", 600, 6000, 250, 1280, 720, large_size=True))
+    media_info = read_mp4_header_info(write_mp4(tmp_path, ftyp(), moov))
+    assert (media_info["width"], media_info["height"], media_info["sample_count"]) == (1280, 720, 250)
+    assert media_info["duration_ms"] == 10_000
+
+
+def test_coded_size_used_when_tkhd_has_none(tmp_path):
+    video_track = trak(b"vide", 1000, 2000, 48, 0, 0)
+    # Put the coded size into the sample entry only; tkhd stays 0x0.
+    video_track = video_track.replace(stsd(b"avc1", 0, 0), stsd(b"avc1", 640, 360))
+    media_info = read_mp4_header_info(write_mp4(tmp_path, ftyp(), box(b"moov", mvhd(1000, 2000) + video_track)))
+    assert (media_info["width"], media_info["height"]) == (640, 360)
+
+
+def test_movie_duration_used_when_mdhd_has_none(tmp_path):
+    moov = box(b"moov", mvhd(1000, 4000) + trak(b"vide", 0, 0, 100, 800, 600))
+    media_info = read_mp4_header_info(write_mp4(tmp_path, ftyp(), moov))
+    assert media_info["duration_ms"] == 4000 and "frame_rate" in media_info
+
+
+def test_audio_only_file_has_no_video_info(tmp_path):
+    moov = box(b"moov", mvhd(1000, 1000) + trak(b"soun", 48000, 48000, 47))
+    assert read_mp4_header_info(write_mp4(tmp_path, ftyp(), moov)) is None
+
+
+def test_file_without_moov(tmp_path):
+    assert read_mp4_header_info(write_mp4(tmp_path, ftyp(), box(b"mdat", bytes(1024)))) is None